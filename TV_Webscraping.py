@@ -1,17 +1,33 @@
 import argparse
 import json
 import os
+import re
+import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
-from src.DirecTV import scrape_directv
-from src.DirecTV_Stream import scrape_directv_stream
-from src.FuboTV import scrape_fubo_tv
-from src.HuluTV import scrape_hulu_tv
-from src.SlingTV import scrape_sling_tv
-from src.YoutubeTV import scrape_youtube_tv
-from src.DishTV import scrape_dishtv
-from src.WebDriverUtils import OUTPUT_DIR, LOGGER, parallel_scrape, write_to_excel, write_to_csv
+from src.DirecTV import parse_directv, scrape_directv
+from src.DirecTV_Stream import parse_directv_stream, scrape_directv_stream
+from src.FuboTV import parse_fubo_tv, scrape_fubo_tv
+from src.HuluTV import parse_hulu_tv, scrape_hulu_tv
+from src.SlingTV import parse_sling_tv, scrape_sling_tv
+from src.YoutubeTV import parse_youtube_tv, scrape_youtube_tv
+from src.DishTV import parse_dishtv, scrape_dishtv
+from src.AliasIndex import AliasIndex, load_alias_index
+from src.ChannelMatcher import get_channel_matcher
+from src.LineupHistory import LineupHistory
+from src.LineupResult import CHECK_MARK, typed_numbers
+from src.ResultCache import ResultCache
+from src.WebDriverUtils import (ZIPCODE, OUTPUT_DIR, EXECUTOR, CACHE_MAX_AGE_HOURS, JOB_TIMEOUT,
+                                LOGGER, ensure_driver_pool_size, get_provider_pool, load_snapshot,
+                                parallel_scrape, resolve_max_workers)
+from src import CommandProfiler, Tracing
+from src.Tracing import traced
+from src.OutputWriter import OUTPUT_FORMATS, TYPED_FORMATS, OutputWriter, parquet_available
 
 DATA_FILE = "./data/channels.csv"
+SUMMARY_FILE = os.path.join(OUTPUT_DIR, "Summary_TV_Channels")
+SWEEP_SUMMARY_FILE = os.path.join(OUTPUT_DIR, "Summary_TV_Channels_By_ZIP")
 
 # Map of scraper names to their functions
 SCRAPERS = {
@@ -24,17 +40,32 @@ SCRAPERS = {
     'youtube': scrape_youtube_tv
 }
 
-def get_channel_alias(input_file):
-    """Load alias mapping from CSV, ensuring that the first column is the canonical name."""
-    alias_df = pd.read_csv(input_file)
-    channel_aliases = {}
+# Map of scraper names to the functions parsing their saved snapshots (see SNAPSHOT_DIR)
+PARSERS = {
+    'directv': parse_directv,
+    'directvstream': parse_directv_stream,
+    'dish': parse_dishtv,
+    'fubo': parse_fubo_tv,
+    'sling': parse_sling_tv,
+    'hulu': parse_hulu_tv,
+    'youtube': parse_youtube_tv
+}
 
-    for _, row in alias_df.iterrows():
-        canonical_name = row.iloc[0].strip().lower()  # Use first column as canonical name
-        aliases = [alias.strip().lower() for alias in row.dropna() if alias.strip()]  # Remove empty strings
-        for alias in aliases:
-            channel_aliases[alias] = canonical_name  # Map alias to canonical name
+# Column labels used for each provider in the summaries
+PROVIDER_NAMES = {
+    'directv': 'DirecTV',
+    'directvstream': 'DirecTV Stream',
+    'dish': 'Dish',
+    'fubo': 'Fubo',
+    'sling': 'Sling',
+    'hulu': 'Hulu',
+    'youtube': 'Youtube'
+}
 
+def get_channel_alias(input_file):
+    """Load the alias index for the alias CSV, where the first column of each row is the
+    canonical name."""
+    channel_aliases = load_alias_index(input_file)
     LOGGER.info(f"Loaded {len(channel_aliases)} channel aliases")
     return channel_aliases
 
@@ -42,168 +73,537 @@ def normalize_channel_name(channel_name, channel_aliases):
     """Normalize and map channel names using alias mapping."""
     if isinstance(channel_name, dict):
         channel_name = list(channel_name.keys())[0]  # Get the first key if it's a dict
+    if isinstance(channel_aliases, AliasIndex):
+        return channel_aliases.normalize(str(channel_name))  # Memoized
     channel_name = str(channel_name).strip().lower()
     normalized = channel_aliases.get(channel_name, channel_name)
     return normalized
 
-def generate_summary_excel(results, output_format="excel"):
+def canonical_names(channels, channel_aliases):
     """
-    Generates a summary file consolidating TV channels across different providers.
+    Normalize a sequence of channel names with normalize_channel_name.
 
     Parameters:
-        results: Dictionary containing results from each scraper
-        output_format: Output format, either 'excel' or 'csv'
+        channels: Sequence of raw channel names
+        channel_aliases: Dictionary of alias -> canonical name
+
+    Returns:
+        List of canonical names
     """
-    LOGGER.info("Generating consolidated channel list...")
-    channel_aliases = get_channel_alias(DATA_FILE)
-    
-    # Collect all unique channel names
-    all_channels = set()
-    
-    # Process each provider's results
-    for provider, result in results.items():
-        if not result:
-            continue
-            
-        try:
-            if provider in ['directv', 'directvstream']:
-                if isinstance(result, tuple) and len(result) == 2:
-                    channels, _ = result
-                    for ch in channels:
-                        if isinstance(ch, (list, tuple)) and len(ch) > 0:
-                            all_channels.add(normalize_channel_name(ch[0], channel_aliases))
-                        else:
-                            LOGGER.warning(f"Invalid channel format for {provider}: {ch}")
-                else:
-                    LOGGER.warning(f"Invalid result format for {provider}: {result}")
-                    
-            elif provider in ['dish', 'fubo', 'sling']:
-                if isinstance(result, tuple) and len(result) == 2:
-                    channels, _ = result
-                    if isinstance(channels, dict):
-                        all_channels.update({normalize_channel_name(ch, channel_aliases) for ch in channels.keys()})
-                    else:
-                        LOGGER.warning(f"Invalid channels format for {provider}: {channels}")
-                else:
-                    LOGGER.warning(f"Invalid result format for {provider}: {result}")
-                    
-            else:  # hulu, youtube
-                if isinstance(result, (list, set)):
-                    all_channels.update({normalize_channel_name(ch, channel_aliases) for ch in result})
-                else:
-                    LOGGER.warning(f"Invalid channels format for {provider}: {result}")
-                    
-        except Exception as e:
-            LOGGER.error(f"Error processing {provider} results: {str(e)}")
-            continue
+    return [normalize_channel_name(channel, channel_aliases) for channel in channels]
 
-    LOGGER.info(f"Found {len(all_channels)} unique channels")
-    
-    # Initialize DataFrame with channels as rows
-    summary_df = pd.DataFrame({"Channel": sorted(all_channels)})
-    
-    # Process each provider's data
+def canonical_lineup_frame(lineup, canonical, label):
+    """
+    Index a provider's lineup by canonical channel name, merging rows that share one.
+
+    Parameters:
+        lineup: LineupResult to convert
+        canonical: Canonical name of each of the lineup's rows
+        label: Provider label used to name the columns
+
+    Returns:
+        DataFrame indexed by canonical name, with an optional '<label> Channel Number' column and
+        one boolean column per plan, or a single boolean '<label>' column for providers without
+        plans. Rows of numbered lineups (DirecTV, DirecTV Stream) that share a name are replaced
+        by the last one, number and plans alike; other providers' rows are merged, a channel
+        being in a plan if any of its rows is.
+    """
+    columns = {}
+    if lineup.has_numbers:
+        columns[f"{label} Channel Number"] = pd.array(lineup.numbers, dtype=object)
+    for i, plan in enumerate(lineup.plans):
+        columns[f"{label} - {plan}"] = [mask >> i & 1 == 1 for mask in lineup.masks]
+    if not lineup.plans:
+        columns[label] = [True] * len(lineup.masks)
+
+    frame = pd.DataFrame(columns, index=pd.Index(canonical, dtype=object, name="Channel"))
+    if not frame.index.has_duplicates:
+        return frame
+    if lineup.has_numbers:
+        return frame[~frame.index.duplicated(keep="last")]
+    return frame.groupby(level=0, sort=False).any()
+
+@traced()
+def build_summary_frame(results, channel_aliases, matcher=None, mark=CHECK_MARK):
+    """
+    Join every provider's canonical lineup into the summary table.
+
+    Parameters:
+        results: Dictionary of provider name -> LineupResult
+        channel_aliases: Dictionary of alias -> canonical name
+        matcher: Optional ChannelMatcher resolving names the aliases don't cover
+        mark: Text marking plan availability, or None for boolean plan columns and typed channel
+            numbers
+
+    Returns:
+        DataFrame with a 'Channel' column sorted by canonical name, then each provider's columns
+        with check marks (or booleans) for plan availability
+    """
+    lineups = {}
     for provider, result in results.items():
         if not result:
+            LOGGER.warning(f"No {provider} results, leaving it out of the summary")
             continue
-            
-        if provider == 'directv':
-            channels, plans = result
-            # Add channel numbers
-            number_map = {normalize_channel_name(ch[0], channel_aliases): ch[1] for ch in channels}
-            summary_df["DirecTV Channel Number"] = summary_df["Channel"].map(number_map)
-            # Add plan availability
-            for i, plan in enumerate(plans):
-                plan_map = {normalize_channel_name(ch[0], channel_aliases): ch[i+2] for ch in channels}
-                summary_df[f"DirecTV - {plan}"] = summary_df["Channel"].map(plan_map)
-                
-        elif provider == 'directvstream':
-            channels, plans = result
-            # Add channel numbers
-            number_map = {normalize_channel_name(ch[0], channel_aliases): ch[1] for ch in channels}
-            summary_df["DirecTV Stream Channel Number"] = summary_df["Channel"].map(number_map)
-            # Add plan availability
-            for i, plan in enumerate(plans):
-                plan_map = {normalize_channel_name(ch[0], channel_aliases): ch[i+2] for ch in channels}
-                summary_df[f"DirecTV Stream - {plan}"] = summary_df["Channel"].map(plan_map)
-                
-        elif provider in ['dish', 'fubo', 'sling']:
-            channels, plans = result
-            for plan in plans:
-                summary_df[f"{provider.title()} - {plan}"] = summary_df["Channel"].map(
-                    lambda x: "✔️" if any(
-                        normalize_channel_name(alias, channel_aliases) in channels and 
-                        channels[normalize_channel_name(alias, channel_aliases)].get(plan) == "✔️"
-                        for alias in [x] + [k for k, v in channel_aliases.items() if v == x]
-                    ) else ""
-                )
-                
-        else:  # hulu, youtube
-            channels = result
-            summary_df[provider.title()] = summary_df["Channel"].map(
-                lambda x: "✔️" if any(
-                    normalize_channel_name(alias, channel_aliases) in channels
-                    for alias in [x] + [k for k, v in channel_aliases.items() if v == x]
-                ) else ""
-            )
-
-    # Fill missing values with empty strings
-    summary_df.fillna("", inplace=True)
-
-    # Save to Excel or CSV
-    output_path = os.path.join(OUTPUT_DIR, "Summary_TV_Channels")
-    if output_format == "excel":
-        if write_to_excel(summary_df, output_path, sheet_name="TV Channels Summary", index=False):
-            LOGGER.info(f"Summary Excel file generated: {output_path}.xlsx")
+        lineups[provider] = result
+    if not lineups:
+        return pd.DataFrame({"Channel": []})
+
+    # Normalize every provider's names in one pass, then split them back per provider
+    channels = [channel for lineup in lineups.values() for channel in lineup.channels]
+    canonical = canonical_names(channels, channel_aliases)
+    frames, offset = [], 0
+    for provider, lineup in lineups.items():
+        label = PROVIDER_NAMES.get(provider, provider.title())
+        names = canonical[offset:offset + len(lineup)]
+        if matcher:
+            names = [matcher.resolve(name, label) for name in names]
+        frames.append(canonical_lineup_frame(lineup, names, label))
+        offset += len(lineup)
+
+    # Outer join on the canonical name: every channel any provider has gets a row
+    summary = pd.concat(frames, axis=1, join="outer", sort=True)
+    LOGGER.info(f"Found {len(summary)} unique channels")
+
+    # Booleans only become check marks here, when rendering
+    for column in summary.columns:
+        if column.endswith(" Channel Number"):
+            if mark is None:
+                summary[column] = typed_numbers(summary[column]).array
+            else:
+                summary[column] = summary[column].fillna("").astype(object)
         else:
-            LOGGER.error("Failed to generate Excel summary file")
+            available = summary[column].fillna(False).astype(bool)
+            summary[column] = available if mark is None else available.map({True: mark, False: ""})
+    return summary.rename_axis("Channel").reset_index()
+
+def report_unmatched_channels(matcher):
+    """Save the run's channel matches and list the names that couldn't be resolved, for
+    curating channels.csv."""
+    matcher.save()
+    matcher.write_unresolved_report()
+
+def lineup_sheet_name(provider, zipcode, sweep=False):
+    """Name a provider's lineup sheet: '<label> Channels', or '<label> <ZIP>' in a ZIP sweep."""
+    label = PROVIDER_NAMES.get(provider, provider.title())
+    return f"{label} {zipcode}" if sweep else f"{label} Channels"
+
+@traced()
+def generate_summary_excel(results, output_format="excel", writer=None):
+    """
+    Generates a summary file consolidating TV channels across different providers.
+
+    Channels are matched across providers by their canonical name from the alias file.
+
+    Parameters:
+        results: Dictionary of provider name -> LineupResult
+        output_format: Output format: 'excel', 'csv', 'parquet' or 'jsonl'
+        writer: OutputWriter the lineups were already handed to while scraping, or None to write
+            them here.
+            The summary is added last and the writer is closed.
+    """
+    LOGGER.info("Generating consolidated channel list...")
+    if writer is None:
+        writer = OutputWriter(SUMMARY_FILE, output_format)
+        for provider, result in results.items():
+            writer.write_lineup(lineup_sheet_name(provider, ZIPCODE), result)
+    channel_aliases = get_channel_alias(DATA_FILE)
+    matcher = get_channel_matcher(channel_aliases)
+    summary_df = build_summary_frame(results, channel_aliases, matcher,
+                                     mark=None if output_format in TYPED_FORMATS else CHECK_MARK)
+    report_unmatched_channels(matcher)
+
+    # The summary goes after the lineups, in the same workbook (or next to their CSV files)
+    writer.write_sheet("TV Channels Summary", summary_df, active=True,
+                       file_name=os.path.basename(SUMMARY_FILE))
+    if writer.close():
+        LOGGER.info(f"Summary Excel file generated: {SUMMARY_FILE}.xlsx" if output_format == "excel"
+                    else f"Summary CSV files generated in {OUTPUT_DIR}")
     else:
-        write_to_csv(summary_df, output_path + ".csv", index=False)
-        LOGGER.info(f"Summary CSV file generated: {output_path}.csv")
+        LOGGER.error("Failed to generate summary file")
+
+@traced()
+def generate_sweep_summary(results_by_zip, output_format="excel", writer=None):
+    """
+    Generates one summary across all swept ZIP codes.
+
+    For each provider, channels offered in every ZIP code it was scraped for are national;
+    the others are regional and listed with the ZIP codes they were found in.
+
+    Parameters:
+        results_by_zip: Dictionary of ZIP code -> {provider: LineupResult}
+        output_format: Output format: 'excel', 'csv', 'parquet' or 'jsonl'
+        writer: OutputWriter the lineups were already handed to while scraping, or None to write
+            them here.
+            The summary sheets are added last and the writer is closed.
+    """
+    LOGGER.info(f"Generating cross-ZIP summary for {len(results_by_zip)} ZIP codes...")
+    if writer is None:
+        writer = OutputWriter(SWEEP_SUMMARY_FILE, output_format)
+        for zipcode, results in results_by_zip.items():
+            for provider, result in results.items():
+                writer.write_lineup(lineup_sheet_name(provider, zipcode, sweep=True), result)
+    channel_aliases = get_channel_alias(DATA_FILE)
+    matcher = get_channel_matcher(channel_aliases)
+
+    # provider -> ZIP code -> normalized channel names
+    coverage = {}
+    for zipcode, results in results_by_zip.items():
+        for provider, result in results.items():
+            if not result:
+                LOGGER.warning(f"No {provider} results for ZIP {zipcode}, "
+                               f"leaving it out of the summary")
+                continue
+            label = PROVIDER_NAMES.get(provider, provider.title())
+            coverage.setdefault(provider, {})[zipcode] = {
+                matcher.resolve(normalize_channel_name(name, channel_aliases), label)
+                for name in result
+            }
+    report_unmatched_channels(matcher)
+
+    national_rows, regional_rows, coverage_rows = {}, [], []
+    for provider, by_zip in coverage.items():
+        label = PROVIDER_NAMES.get(provider, provider.title())
+        national = set.intersection(*by_zip.values())
+        for channel in national:
+            national_rows.setdefault(channel, {})[label] = True
+
+        regional = {}
+        for zipcode, channels in by_zip.items():
+            for channel in channels - national:
+                regional.setdefault(channel, []).append(zipcode)
+        for channel, zipcodes in regional.items():
+            regional_rows.append({"Channel": channel, "Provider": label, "ZIP Count": len(zipcodes),
+                                  "ZIP Codes": ", ".join(sorted(zipcodes))})
+        coverage_rows.append({"Provider": label, "ZIP Codes Scraped": len(by_zip),
+                              "National Channels": len(national),
+                              "Regional Channels": len(regional)})
+
+    labels = [PROVIDER_NAMES.get(provider, provider.title()) for provider in coverage]
+    national_df = pd.DataFrame([{"Channel": channel, **marks}
+                                for channel, marks in sorted(national_rows.items())],
+                               columns=["Channel"] + labels)
+    for label in labels:
+        available = national_df[label].notna()
+        if output_format not in TYPED_FORMATS:
+            available = available.map({True: CHECK_MARK, False: ""})
+        national_df[label] = available
+    regional_df = pd.DataFrame(regional_rows,
+                               columns=["Channel", "Provider", "ZIP Count", "ZIP Codes"])
+    regional_df = regional_df.sort_values(by=["Channel", "Provider"])
+    coverage_df = pd.DataFrame(coverage_rows, columns=["Provider", "ZIP Codes Scraped",
+                                                       "National Channels", "Regional Channels"])
+
+    # e.g. Summary_TV_Channels_By_ZIP_National.csv
+    base_name = os.path.basename(SWEEP_SUMMARY_FILE)
+    writer.write_sheet("National Channels", national_df, active=True,
+                       file_name=f"{base_name}_National")
+    writer.write_sheet("Regional Channels", regional_df, file_name=f"{base_name}_Regional")
+    writer.write_sheet("Coverage", coverage_df, file_name=f"{base_name}_Coverage")
+    if writer.close():
+        LOGGER.info(f"Cross-ZIP summary Excel file generated: {SWEEP_SUMMARY_FILE}.xlsx"
+                    if output_format == "excel"
+                    else f"Cross-ZIP summary CSV files generated in {OUTPUT_DIR}")
+    else:
+        LOGGER.error("Failed to generate cross-ZIP summary file")
+
+@traced()
+def record_history(results_by_zip):
+    """
+    Append a run's results to the lineup history, with channel names normalized as in the summaries.
 
-def run_scrapers(mode, providers=None):
+    Parameters:
+        results_by_zip: Dictionary of ZIP code -> {provider: LineupResult}
+    """
+    channel_aliases = get_channel_alias(DATA_FILE)
+    matcher = get_channel_matcher(channel_aliases)
+
+    def normalize(name, provider):
+        label = PROVIDER_NAMES.get(provider, provider.title())
+        return matcher.resolve(normalize_channel_name(name, channel_aliases), label)
+
+    try:
+        with LineupHistory() as history:
+            history.record_run(results_by_zip, normalize)
+    except Exception as e:
+        LOGGER.error(f"Error recording lineup history: {e}")
+
+def load_zipcodes(zipcodes=None, zip_file=None):
+    """
+    Collect the ZIP codes to sweep from the command line and/or a file.
+
+    The file may list ZIP codes one per line or comma separated; '#' starts a comment.
+    Duplicates are dropped, keeping the first occurrence.
+
+    Raises:
+        ValueError: If a ZIP code is not five digits.
+    """
+    collected = list(zipcodes or [])
+    if zip_file:
+        with open(zip_file, 'r', encoding="utf-8") as f:
+            for line in f:
+                collected.extend(line.split("#", 1)[0].replace(",", " ").split())
+    collected = list(dict.fromkeys(zipcode.strip() for zipcode in collected))
+    invalid = [zipcode for zipcode in collected if not re.fullmatch(r"\d{5}", zipcode)]
+    if invalid:
+        raise ValueError(f"Invalid ZIP codes: {', '.join(invalid)}")
+    return collected
+
+def reparse_snapshots(paths):
+    """
+    Parse snapshots saved by the scrapers again, without starting a browser.
+
+    Parameters:
+        paths: Snapshot files named <provider>_<zipcode>.json, as written to SNAPSHOT_DIR
+
+    Returns:
+        Dictionary of ZIP code -> {provider: LineupResult}
+
+    Raises:
+        ValueError: If a file name doesn't start with a known provider
+    """
+    results_by_zip = {}
+    for path in paths:
+        provider, _, zipcode = os.path.splitext(os.path.basename(path))[0].rpartition("_")
+        if provider not in PARSERS:
+            raise ValueError(f"Not a provider snapshot: {path}")
+        lineup = PARSERS[provider](load_snapshot(path))
+        LOGGER.info(f"Parsed {len(lineup)} {provider} channels for {zipcode} from {path}")
+        results_by_zip.setdefault(zipcode, {})[provider] = lineup
+    return results_by_zip
+
+def prewarm_drivers(mode, providers, executor, max_workers):
+    """Start browsers up front so thread-mode scrapers lease warm drivers instead of
+    cold-starting Chrome.
+
+    One browser is started for each of the first max_workers providers, in the pool that
+    provider's scraper leases from (see get_provider_pool), so the scrapers that start first
+    find a warm driver with their own lean and API capture settings.
+    """
+    if executor != "thread":
+        return
+    ensure_driver_pool_size(max_workers)
+    wanted = Counter(get_provider_pool(mode, provider) for provider in providers[:max_workers])
+    with ThreadPoolExecutor(len(wanted)) as warmers:
+        for pool, count in wanted.items():
+            warmers.submit(pool.prewarm, count)
+
+def scraper_version(provider):
+    """Return the SCRAPER_VERSION of the module a provider's scraper lives in."""
+    return getattr(sys.modules[SCRAPERS[provider].__module__], "SCRAPER_VERSION", 0)
+
+def scrape_or_load(mode, pairs, max_workers=None, executor=EXECUTOR, max_age=CACHE_MAX_AGE_HOURS,
+                   refresh=False, cached_only=False, on_result=None, timeout=JOB_TIMEOUT):
+    """
+    Get results for (provider, ZIP) pairs, from the result cache when fresh enough, scraping the
+    rest.
+
+    Parameters:
+        mode: WebDriver mode ('headless' or 'gui')
+        pairs: List of (provider, zipcode) tuples
+        max_workers: Maximum number of scrapers running at the same time, or None for the default
+        executor: 'thread' or 'process'
+        max_age: Maximum age in hours of a cached result, or None to accept any age
+        refresh: Ignore the cache and scrape every pair
+        cached_only: Never start a browser; pairs without a cached result get None
+        on_result: Optional function called with ((provider, zipcode), result) as soon as each
+            result is in,
+            e.g. to hand it to an OutputWriter
+        timeout: Wall-clock seconds each scraper may run before its browsers are killed, or None
+            for no deadline
+
+    Returns:
+        Dictionary of (provider, zipcode) -> LineupResult (empty, or None if the scraper crashed)
+    """
+    results, jobs = {}, {}
+    with ResultCache() as cache:
+        for provider, zipcode in pairs:
+            cached = None
+            if not refresh:
+                cached = cache.get(provider, zipcode, scraper_version(provider),
+                                   None if (cached_only or max_age is None) else max_age * 3600)
+            if cached is not None:
+                results[(provider, zipcode)] = cached
+                if on_result:
+                    on_result((provider, zipcode), cached)
+            elif cached_only:
+                LOGGER.warning(f"No cached {provider} result for {zipcode}")
+                results[(provider, zipcode)] = None
+            else:
+                jobs[(provider, zipcode)] = (SCRAPERS[provider], mode, zipcode)
+
+        def finished(pair, result):
+            # Cache each result as soon as it is in, so an interrupted sweep resumes with the ZIP
+            # codes it hadn't finished. Failed and partial scrapes are kept out so the next run
+            # tries them again.
+            if result and result.complete:
+                cache.put(*pair, scraper_version(pair[0]), result)
+            if on_result:
+                on_result(pair, result)
+
+        LOGGER.info(f"{len(pairs) - len(jobs)} results from cache, {len(jobs)} to scrape")
+        if jobs:
+            max_workers = resolve_max_workers(max_workers)
+            prewarm_drivers(mode, [provider for provider, _ in jobs], executor, max_workers)
+            results.update(parallel_scrape(jobs, max_workers=max_workers, executor=executor,
+                                           on_result=finished,
+                                           timeout=timeout))
+    return {pair: results[pair] for pair in pairs}
+
+def run_sweep(mode, zipcodes, providers=None, **options):
+    """
+    Run the selected scrapers for every ZIP code, sharding (provider, ZIP) jobs over a bounded pool.
+
+    Parameters:
+        mode: WebDriver mode ('headless' or 'gui')
+        zipcodes: List of ZIP codes to scrape
+        providers: List of provider names to scrape, or None for all providers
+        options: Passed on to scrape_or_load (max_workers, executor, max_age, refresh,
+            cached_only, on_result, timeout)
+
+    Returns:
+        Dictionary of ZIP code -> {provider: LineupResult}
+    """
+    names = [provider for provider in (providers or SCRAPERS.keys()) if provider in SCRAPERS]
+    pairs = [(provider, zipcode) for zipcode in zipcodes for provider in names]
+    LOGGER.info(f"Sweeping {len(names)} providers across {len(zipcodes)} ZIP codes "
+                f"({len(pairs)} jobs)...")
+
+    results_by_zip = {zipcode: {} for zipcode in zipcodes}
+    for (provider, zipcode), result in scrape_or_load(mode, pairs, **options).items():
+        results_by_zip[zipcode][provider] = result
+    return results_by_zip
+
+def run_scrapers(mode, providers=None, **options):
     """
     Run specified scrapers or all scrapers if none specified.
     
     Parameters:
         mode: WebDriver mode ('headless' or 'gui')
         providers: List of provider names to scrape, or None for all providers
+        options: Passed on to scrape_or_load (max_workers, executor, max_age, refresh,
+            cached_only, on_result, timeout)
+
+    Returns:
+        Dictionary of provider name -> LineupResult (empty, or None if the scraper crashed)
     """
-    if providers:
-        # Run only specified scrapers
-        scrapers = [(SCRAPERS[provider], mode) for provider in providers if provider in SCRAPERS]
-    else:
-        # Run all scrapers
-        scrapers = [(scraper, mode) for scraper in SCRAPERS.values()]
+    names = [provider for provider in (providers or SCRAPERS.keys()) if provider in SCRAPERS]
+    results = {provider: result for (provider, _), result in
+               scrape_or_load(mode, [(provider, ZIPCODE) for provider in names], **options).items()}
     
-    # Run scrapers in parallel and collect results
-    results = parallel_scrape(scrapers, max_workers=2)
-    
-    LOGGER.info(f"{len(results)} TV Providers Results returned.")
-    # Create results dictionary
-    results_dict = {}
-    for i, (provider, _) in enumerate(scrapers):
-        results_dict[provider.__name__.replace('scrape_', '').replace('_tv', '')] = results[i]
-    LOGGER.info(f"Results Dictionary generated.")
-    return results_dict
+    returned = sum(result is not None for result in results.values())
+    LOGGER.info(f"{returned} of {len(results)} TV Providers Results returned.")
+    return results
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="TV Channel Web Scraper")
     parser.add_argument('--mode', choices=['headless', 'gui'], default='gui', 
-                      help='WebDriver mode: headless or gui (default: gui)')
-    parser.add_argument('--output', choices=['excel', 'csv'], default='excel',
-                      help='Output format: excel or csv (default: excel)')
+                        help='WebDriver mode: headless or gui (default: gui)')
+    parser.add_argument('--output', choices=list(OUTPUT_FORMATS), default='excel',
+                        help='Output format: excel, csv, or typed parquet/jsonl files '
+                             '(default: excel)')
     parser.add_argument('--providers', nargs='+', choices=list(SCRAPERS.keys()),
-                      help='Specific providers to scrape (default: all providers)')
+                        help='Specific providers to scrape (default: all providers)')
+    parser.add_argument('--zipcodes', nargs='+',
+                        help='Sweep these ZIP codes instead of the configured one')
+    parser.add_argument('--zip-file',
+                        help='File with ZIP codes to sweep (one per line or comma separated)')
+    parser.add_argument('--workers', type=int,
+                        help='Maximum number of scrapers running at once '
+                             '(default: MAX_WORKERS or CPU/memory headroom)')
+    parser.add_argument('--executor', choices=['thread', 'process'], default=EXECUTOR,
+                        help='Run scrapers in threads or in separate processes '
+                             f'(default: {EXECUTOR})')
+    parser.add_argument('--max-age', type=float, default=CACHE_MAX_AGE_HOURS,
+                        help='Reuse cached results up to this many hours old '
+                             f'(default: {CACHE_MAX_AGE_HOURS})')
+    parser.add_argument('--timeout', type=float, default=JOB_TIMEOUT, metavar='SECONDS',
+                        help='Stop a scraper (and only its browsers) after this many seconds '
+                             'and continue without it '
+                             f'(default: {JOB_TIMEOUT}; 0 for no deadline)')
+    parser.add_argument('--refresh', action='store_true',
+                        help='Ignore cached results and scrape every provider')
+    parser.add_argument('--cached-only', action='store_true',
+                        help='Build the summary from cached results of any age '
+                             'without starting a browser')
+    parser.add_argument('--reparse', nargs='+', metavar='SNAPSHOT',
+                        help='Build the output from snapshots saved to SNAPSHOT_DIR '
+                             '(e.g. output/snapshots/sling_79423.json) without starting a browser')
+    parser.add_argument('--no-history', action='store_true',
+                        help="Don't append this run's results to the lineup history")
+    parser.add_argument('--trace', nargs='?', const=Tracing.TRACE_FILE, metavar='FILE',
+                        help='Record timing spans and write a Chrome trace '
+                             f'(default file: {Tracing.TRACE_FILE})')
+    parser.add_argument('--profile-commands', nargs='?', type=int,
+                        const=CommandProfiler.PROFILE_TOP, metavar='N',
+                        help='Count and time every WebDriver command by calling line '
+                             'and log the N hottest lines at exit '
+                             f'(default: {CommandProfiler.PROFILE_TOP})')
     args = parser.parse_args()
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.refresh and args.cached_only:
+        parser.error("--refresh and --cached-only can't be used together")
+    if args.output == "parquet" and not parquet_available():
+        parser.error("--output parquet needs pyarrow (pip install pyarrow)")
+    options = {"max_workers": args.workers, "executor": args.executor, "max_age": args.max_age,
+               "refresh": args.refresh, "cached_only": args.cached_only,
+               "timeout": args.timeout or None}
+
+    if args.reparse and (args.zipcodes or args.zip_file or args.providers):
+        parser.error("--reparse takes the providers and ZIP codes from the snapshot files")
 
     try:
-        # Run scrapers
-        results = run_scrapers(args.mode, args.providers)
-        
+        zipcodes = (load_zipcodes(args.zipcodes, args.zip_file)
+                    if (args.zipcodes or args.zip_file) else None)
+        snapshots = reparse_snapshots(args.reparse) if args.reparse else None
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    if snapshots and len(snapshots) > 1:
+        zipcodes = list(snapshots)
+
+    if args.trace:
+        Tracing.enable()
+    if args.profile_commands:
+        CommandProfiler.enable(top=args.profile_commands)
+
+    # Lineups are written in the background as each scrape finishes
+    writer = OutputWriter(SWEEP_SUMMARY_FILE if zipcodes else SUMMARY_FILE, args.output)
+    options["on_result"] = lambda pair, result: writer.write_lineup(
+        lineup_sheet_name(*pair, sweep=bool(zipcodes)), result)
+
+    try:
+        if snapshots:
+            results_by_zip = snapshots
+            for zipcode, lineups in snapshots.items():
+                for provider, lineup in lineups.items():
+                    options["on_result"]((provider, zipcode), lineup)
+            results = next(iter(snapshots.values()))
+        elif zipcodes:
+            # Scrape every provider for every ZIP code and summarize across them
+            results_by_zip = run_sweep(args.mode, zipcodes, args.providers, **options)
+        else:
+            # Run scrapers
+            results = run_scrapers(args.mode, args.providers, **options)
+            results_by_zip = {ZIPCODE: results}
+
+        # Every lineup must be on disk before the summary is added
+        if not writer.flush():
+            LOGGER.error("Some provider lineups could not be written")
+
         # Generate summary file
-        generate_summary_excel(results, args.output)
+        if zipcodes:
+            generate_sweep_summary(results_by_zip, args.output, writer)
+        else:
+            generate_summary_excel(results, args.output, writer)
+
+        # Keep this run's lineups so later runs can be compared against it
+        if not (args.no_history or args.cached_only or snapshots):
+            record_history(results_by_zip)
         
     except Exception as e:
         LOGGER.error(f"Error running scrapers: {e}")
-        raise
\ No newline at end of file
+        raise
+    finally:
+        writer.close()
+        if args.trace:
+            Tracing.export(args.trace)
@@ -0,0 +1,317 @@
+"""End-to-end scraper benchmark against local fixture pages.
+
+Serves benchmarks/fixtures with http.server, points every scraper's URL at it and runs the
+scrapers one at a time in a real Chrome, each starting from a cold browser (or, with
+--prewarm, from a browser started before the clock runs). For every scraper it reports the
+wall time, the time until its first driver.get (browser startup plus lease), the number of
+WebDriver commands sent (each one an HTTP round trip to chromedriver) and the peak RSS of this
+process plus its Chrome/chromedriver children, and checks the lineup against the fixture's
+channel list.
+
+With --driver-resolution it also times two full run_scrapers passes (all scrapers at once, as
+TV_Webscraping.py runs them): one resolving chromedriver with ChromeDriverManager().install() for
+every browser, as before the manifest existed, and one with the cached resolution. For each pass
+it reports the time until the first and, on average, each browser's first driver.get.
+
+Results are saved as JSON (benchmarks/results/<commit>.json by default) so runs on different
+commits can be compared:
+
+    python benchmarks/bench_scrapers.py
+    python benchmarks/bench_scrapers.py --providers directv sling \
+        --compare benchmarks/results/abc1234.json
+    python benchmarks/bench_scrapers.py --prewarm --compare benchmarks/results/abc1234.json
+    python benchmarks/bench_scrapers.py --driver-resolution
+"""
+import argparse
+import collections
+import contextlib
+import functools
+import http.server
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import psutil
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+from webdriver_manager.chrome import ChromeDriverManager
+import TV_Webscraping
+from src import DirecTV, DirecTV_Stream, DishTV, FuboTV, HuluTV, SlingTV, YoutubeTV, WebDriverUtils
+from src.ResultCache import ResultCache
+from TV_Webscraping import SCRAPERS, ZIPCODE, prewarm_drivers, run_scrapers
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_DIR = os.path.join(BENCHMARK_DIR, "fixtures")
+RESULTS_DIR = os.path.join(BENCHMARK_DIR, "results")
+RSS_INTERVAL = 0.05  # Seconds between memory samples
+
+# Provider -> (scraper module, URL constant, fixture path)
+FIXTURE_URLS = {
+    "directv": (DirecTV, "DIRECTV_URL", "directv/index.html"),
+    "directvstream": (DirecTV_Stream, "DIRECTV_STREAM_URL", "directvstream/index.html"),
+    "dish": (DishTV, "DISH_URL", "dish/index.html"),
+    "fubo": (FuboTV, "FUBO_URL", "fubo/index.html"),
+    "sling": (SlingTV, "SLING_URL", "sling/index.html"),
+    "hulu": (HuluTV, "HULU_URL", "hulu/index.html"),
+    "youtube": (YoutubeTV, "YOUTUBE_TV_URL", "youtube/index.html?zipcode={zipcode}"),
+}
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+@contextlib.contextmanager
+def serve_fixtures(directory=FIXTURE_DIR):
+    """Serve the fixture pages on a free local port; yields the base URL."""
+    handler = functools.partial(QuietHandler, directory=directory)
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+class CommandLog:
+    """WebDriver commands sent to chromedriver, by command name, and when each browser sent its
+    first page load."""
+
+    def __init__(self):
+        self.counts = collections.Counter()
+        self.first_gets = {}  # Session id -> perf_counter() when it sent its first "get"
+
+    @property
+    def first_get(self):
+        """perf_counter() when the first "get" command was sent, or None."""
+        return min(self.first_gets.values(), default=None)
+
+@contextlib.contextmanager
+def count_commands():
+    """Count the WebDriver commands sent to chromedriver and note when the first driver.get
+    went out."""
+    log = CommandLog()
+    lock = threading.Lock()
+    execute = RemoteConnection.execute
+
+    def counting_execute(connection, command, params):
+        with lock:
+            log.counts[command] += 1
+            if command == "get":
+                log.first_gets.setdefault((params or {}).get("sessionId"), time.perf_counter())
+        return execute(connection, command, params)
+
+    with mock.patch.object(RemoteConnection, "execute", counting_execute):
+        yield log
+
+class PeakRss:
+    """Samples the RSS of this process and all its children (Chrome, chromedriver) in the
+    background."""
+
+    def __init__(self, interval=RSS_INTERVAL):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        process = psutil.Process()
+        while not self._stop.is_set():
+            total = 0
+            for member in [process] + process.children(recursive=True):
+                try:
+                    total += member.memory_info().rss
+                except psutil.Error:
+                    pass  # Exited between listing and reading
+            self.peak = max(self.peak, total)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+
+def load_expected_channels():
+    with open(os.path.join(FIXTURE_DIR, "channels.json"), "r", encoding="utf-8") as f:
+        return {channel["name"] for channel in json.load(f)}
+
+def run_scraper(provider, base_url, mode, zipcode, expected, prewarm=False):
+    """Run one scraper against its fixture page and measure it."""
+    module, attribute, path = FIXTURE_URLS[provider]
+    if prewarm:
+        # Browser startup happens before the clock starts
+        prewarm_drivers(mode, [provider], "thread", 1)
+    with mock.patch.object(module, attribute, f"{base_url}/{path}"):
+        with count_commands() as commands, PeakRss() as rss:
+            started = time.perf_counter()
+            lineup = SCRAPERS[provider](mode, zipcode)
+            wall = time.perf_counter() - started
+            # Quit this scraper's browsers so the next one starts cold too
+            WebDriverUtils._quit_owned_drivers()
+
+    channels = set(lineup.channels) if lineup else set()
+    first_get = commands.first_get - started if commands.first_get is not None else None
+    return {
+        "wall_s": round(wall, 3),
+        "first_get_s": round(first_get, 3) if first_get is not None else None,
+        "commands": sum(commands.counts.values()),
+        "top_commands": dict(commands.counts.most_common(5)),
+        "peak_rss_mb": round(rss.peak / 2 ** 20, 1),
+        "channels": len(channels),
+        "missing_channels": len(expected - channels),
+        "ok": channels == expected,
+    }
+
+@contextlib.contextmanager
+def fixture_urls(base_url):
+    """Point every scraper's URL at its fixture page."""
+    with contextlib.ExitStack() as stack:
+        for module, attribute, path in FIXTURE_URLS.values():
+            stack.enter_context(mock.patch.object(module, attribute, f"{base_url}/{path}"))
+        yield
+
+def run_pass(providers, base_url, mode, expected, driver_cache, max_workers=None):
+    """Run the scrapers in one run_scrapers pass and measure each browser's first driver.get.
+
+    Without driver_cache every browser start calls ChromeDriverManager().install(), as
+    run_webdriver did before the manifest; with it, the pass starts like a new process, with no
+    resolved path in memory and the manifest on disk.
+    """
+    if driver_cache:
+        WebDriverUtils.resolve_chromedriver()  # The manifest exists before the pass
+        resolution = mock.patch.object(WebDriverUtils, "_chromedriver_path", None)
+    else:
+        resolution = mock.patch.object(WebDriverUtils, "resolve_chromedriver",
+                                       lambda: ChromeDriverManager().install())
+    # Start from cold browsers, and keep fixture lineups out of the real result cache
+    WebDriverUtils._quit_owned_drivers()
+    with tempfile.TemporaryDirectory() as tmp, fixture_urls(base_url), resolution, \
+            mock.patch.object(TV_Webscraping, "ResultCache",
+                              lambda: ResultCache(os.path.join(tmp, "cache.sqlite"))):
+        with count_commands() as commands:
+            started = time.perf_counter()
+            results = run_scrapers(mode, providers, refresh=True, max_workers=max_workers,
+                                   executor="thread")
+            wall = time.perf_counter() - started
+        WebDriverUtils._quit_owned_drivers()
+
+    first_gets = sorted(first_get - started for first_get in commands.first_gets.values())
+    return {
+        "wall_s": round(wall, 3),
+        "first_get_s": round(first_gets[0], 3) if first_gets else None,
+        "mean_first_get_s": round(statistics.mean(first_gets), 3) if first_gets else None,
+        "browsers": len(first_gets),
+        "ok": all(lineup is not None and set(lineup.channels) == expected
+                  for lineup in results.values()),
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCHMARK_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def format_seconds(seconds):
+    return "-" if seconds is None else f"{seconds:.2f}"
+
+def print_results(results, baseline=None):
+    print(f"{'Scraper':<14} {'Wall s':>8} {'1st get s':>10} {'Commands':>9} {'Peak RSS MB':>12} "
+          f"{'Channels':>9}  OK")
+    for provider, result in results.items():
+        first_get = format_seconds(result.get("first_get_s"))
+        line = (f"{provider:<14} {result['wall_s']:>8.2f} {first_get:>10} "
+                f"{result['commands']:>9} {result['peak_rss_mb']:>12.1f} {result['channels']:>9}  "
+                f"{'yes' if result['ok'] else 'NO'}")
+        old = (baseline or {}).get(provider)
+        if old:
+            change = (result["wall_s"] / old["wall_s"] - 1) * 100
+            line += (f"   vs {old['wall_s']:.2f}s ({change:+.0f}%), "
+                     f"first get {format_seconds(old.get('first_get_s'))}, "
+                     f"{old['commands']} commands ({result['commands'] - old['commands']:+d}), "
+                     f"{old['peak_rss_mb']:.0f} MB "
+                     f"({result['peak_rss_mb'] - old['peak_rss_mb']:+.0f})")
+        print(line)
+
+def print_passes(passes):
+    print(f"{'run_scrapers pass':<22} {'Wall s':>8} {'1st get s':>10} {'Mean 1st get s':>15} "
+          f"{'Browsers':>9}  OK")
+    for name, result in passes.items():
+        print(f"{name:<22} {result['wall_s']:>8.2f} {format_seconds(result['first_get_s']):>10} "
+              f"{format_seconds(result['mean_first_get_s']):>15} {result['browsers']:>9}  "
+              f"{'yes' if result['ok'] else 'NO'}")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark every scraper against local fixture pages")
+    parser.add_argument("--providers", nargs="+", choices=list(FIXTURE_URLS),
+                        help="Scrapers to run (default: all)")
+    parser.add_argument("--mode", choices=["headless", "gui"], default="headless",
+                        help="WebDriver mode (default: headless)")
+    parser.add_argument("--zipcode", default=ZIPCODE,
+                        help=f"ZIP code to enter (default: {ZIPCODE})")
+    parser.add_argument("--output",
+                        help="Results JSON file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    parser.add_argument("--prewarm", action="store_true",
+                        help="Start each scraper's browser before timing it, "
+                             "as TV_Webscraping.py does")
+    parser.add_argument("--driver-resolution", action="store_true",
+                        help="Also time a full run_scrapers pass with chromedriver installed "
+                             "for every browser and one with the cached resolution")
+    parser.add_argument("--workers", type=int,
+                        help="Scrapers running at once in the --driver-resolution passes "
+                             "(default: as TV_Webscraping.py)")
+    args = parser.parse_args()
+
+    expected = load_expected_channels()
+    providers = args.providers or list(FIXTURE_URLS)
+    results = {}
+    with serve_fixtures() as base_url:
+        print(f"Serving fixtures at {base_url}, {len(expected)} channels per lineup")
+        for provider in providers:
+            results[provider] = run_scraper(provider, base_url, args.mode, args.zipcode, expected,
+                                            args.prewarm)
+        passes = None
+        if args.driver_resolution:
+            passes = {
+                "install per browser": run_pass(providers, base_url, args.mode, expected,
+                                                driver_cache=False, max_workers=args.workers),
+                "cached resolution": run_pass(providers, base_url, args.mode, expected,
+                                              driver_cache=True, max_workers=args.workers),
+            }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["scrapers"]
+    print_results(results, baseline)
+    if passes:
+        print_passes(passes)
+
+    commit = git_commit()
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit or 'unknown'}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        created = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        json.dump({"commit": commit, "created": created,
+                   "python": platform.python_version(), "mode": args.mode,
+                   "prewarm": args.prewarm, "scrapers": results, "passes": passes}, f, indent=2)
+    print(f"Results saved to {output}")
+    checks = list(results.values()) + list((passes or {}).values())
+    return 0 if all(result["ok"] for result in checks) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""Micro-benchmark of the summary builder on synthetic lineups.
+
+Times build_summary_frame on the full-size input, and checks it against the summary builder of
+generate_summary_excel before the rewrite (copied below as baseline_summary) on a smaller input:
+both must render the same CSV, byte for byte. The baseline scans every alias for every row, so
+it is too slow to run at full size.
+
+    python benchmarks/bench_summary.py --channels 10000 --aliases 50000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from TV_Webscraping import build_summary_frame, normalize_channel_name
+from src.LineupResult import LineupResult
+
+PROVIDER_PLANS = {
+    "directv": ["Entertainment", "Choice", "Ultimate", "Premier"],
+    "directvstream": ["Entertainment", "Choice", "Ultimate"],
+    "dish": ["America's Top 120", "America's Top 200", "America's Top 250"],
+    "fubo": ["Pro", "Elite", "Deluxe"],
+    "sling": ["Orange", "Blue", "Both"],
+    "hulu": [],
+    "youtube": [],
+}
+NUMBERED_PROVIDERS = {"directv", "directvstream"}
+
+def make_inputs(channel_count, alias_count, coverage=0.6, seed=7):
+    """Build an alias map and one LineupResult per provider.
+
+    DirecTV and DirecTV Stream spell channels with random aliases. The other providers use the
+    canonical names: the baseline looked their scraped names up by canonical name, so it missed
+    any channel listed under an alias or in other capitals, which build_summary_frame finds.
+    """
+    rng = random.Random(seed)
+    canonical = [f"channel {i:05d}" for i in range(channel_count)]
+    aliases = {name: name for name in canonical}
+    spellings = {name: [name] for name in canonical}
+    while len(aliases) < alias_count:
+        name = rng.choice(canonical)
+        alias = f"{name} alt {len(spellings[name])}"
+        aliases[alias] = name
+        spellings[name].append(alias)
+
+    results = {}
+    for provider, plans in PROVIDER_PLANS.items():
+        lineup = LineupResult(provider, plans)
+        for name in rng.sample(canonical, int(channel_count * coverage)):
+            # Providers use their own capitalization and stray whitespace, and list some
+            # channels twice
+            for _ in range(2 if rng.random() < 0.05 else 1):
+                if provider not in NUMBERED_PROVIDERS:
+                    lineup.add(name, [rng.random() < 0.5 for _ in plans])
+                    continue
+                spelling = rng.choice(spellings[name])
+                spelling = spelling.upper() if rng.random() < 0.3 else spelling
+                lineup.add(f" {spelling} " if rng.random() < 0.1 else spelling,
+                           [rng.random() < 0.5 for _ in plans], str(rng.randint(2, 999)))
+        results[provider] = lineup
+    return results, aliases
+
+def legacy_result(provider, lineup):
+    """Convert a LineupResult to what the provider's scraper returned before LineupResult."""
+    if provider in NUMBERED_PROVIDERS:
+        rows = [[channel, number] + ["✔️" if lineup.in_plan(row, i) else ""
+                                     for i in range(len(lineup.plans))]
+                for row, (channel, number) in enumerate(zip(lineup.channels, lineup.numbers))]
+        return rows, lineup.plans
+    if lineup.plans:
+        channels = {}
+        for row, channel in enumerate(lineup.channels):
+            marks = channels.setdefault(channel, {plan: "" for plan in lineup.plans})
+            for i, plan in enumerate(lineup.plans):
+                if lineup.in_plan(row, i):
+                    marks[plan] = "✔️"
+        return channels, lineup.plans
+    return list(lineup.channels)
+
+def baseline_summary(results, channel_aliases):
+    """The summary table of generate_summary_excel at 01664d9, without the logging and file
+    output."""
+    all_channels = set()
+    for provider, result in results.items():
+        if not result:
+            continue
+        if provider in ['directv', 'directvstream']:
+            channels, _ = result
+            for ch in channels:
+                all_channels.add(normalize_channel_name(ch[0], channel_aliases))
+        elif provider in ['dish', 'fubo', 'sling']:
+            channels, _ = result
+            all_channels.update({normalize_channel_name(ch, channel_aliases)
+                                 for ch in channels.keys()})
+        else:  # hulu, youtube
+            all_channels.update({normalize_channel_name(ch, channel_aliases) for ch in result})
+
+    summary_df = pd.DataFrame({"Channel": sorted(all_channels)})
+    for provider, result in results.items():
+        if not result:
+            continue
+
+        if provider == 'directv':
+            channels, plans = result
+            number_map = {normalize_channel_name(ch[0], channel_aliases): ch[1] for ch in channels}
+            summary_df["DirecTV Channel Number"] = summary_df["Channel"].map(number_map)
+            for i, plan in enumerate(plans):
+                plan_map = {normalize_channel_name(ch[0], channel_aliases): ch[i + 2]
+                            for ch in channels}
+                summary_df[f"DirecTV - {plan}"] = summary_df["Channel"].map(plan_map)
+
+        elif provider == 'directvstream':
+            channels, plans = result
+            number_map = {normalize_channel_name(ch[0], channel_aliases): ch[1] for ch in channels}
+            summary_df["DirecTV Stream Channel Number"] = summary_df["Channel"].map(number_map)
+            for i, plan in enumerate(plans):
+                plan_map = {normalize_channel_name(ch[0], channel_aliases): ch[i + 2]
+                            for ch in channels}
+                summary_df[f"DirecTV Stream - {plan}"] = summary_df["Channel"].map(plan_map)
+
+        elif provider in ['dish', 'fubo', 'sling']:
+            channels, plans = result
+            for plan in plans:
+                summary_df[f"{provider.title()} - {plan}"] = summary_df["Channel"].map(
+                    lambda x: "✔️" if any(
+                        normalize_channel_name(alias, channel_aliases) in channels
+                        and channels[normalize_channel_name(alias, channel_aliases)].get(plan)
+                        == "✔️"
+                        for alias in [x] + [k for k, v in channel_aliases.items() if v == x]
+                    ) else ""
+                )
+
+        else:  # hulu, youtube
+            channels = result
+            summary_df[provider.title()] = summary_df["Channel"].map(
+                lambda x: "✔️" if any(
+                    normalize_channel_name(alias, channel_aliases) in channels
+                    for alias in [x] + [k for k, v in channel_aliases.items() if v == x]
+                ) else ""
+            )
+
+    summary_df.fillna("", inplace=True)
+    return summary_df
+
+def best_of(repeat, function, *args):
+    timings, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the summary builder")
+    parser.add_argument("--channels", type=int, default=10000,
+                        help="Canonical channels (default: 10000)")
+    parser.add_argument("--aliases", type=int, default=50000,
+                        help="Aliases in the alias map (default: 50000)")
+    parser.add_argument("--check-channels", type=int, default=1000,
+                        help="Canonical channels for the check against the baseline "
+                             "(default: 1000)")
+    parser.add_argument("--check-aliases", type=int, default=5000,
+                        help="Aliases for the check against the baseline (default: 5000)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Runs per build_summary_frame timing; the best is reported "
+                             "(default: 3)")
+    args = parser.parse_args()
+
+    results, aliases = make_inputs(args.check_channels, args.check_aliases)
+    legacy = {provider: legacy_result(provider, result) for provider, result in results.items()}
+    baseline_time, expected = best_of(1, baseline_summary, legacy, aliases)
+    check_time, actual = best_of(args.repeat, build_summary_frame, results, aliases)
+    identical = expected.to_csv(index=False) == actual.to_csv(index=False)
+    print(f"{args.check_channels} channels, {len(aliases)} aliases:")
+    print(f"  baseline             {baseline_time:8.3f}s")
+    print(f"  build_summary_frame  {check_time:8.3f}s  ({baseline_time / check_time:.0f}x)")
+    print(f"  {len(actual)} channels x {len(actual.columns)} columns, "
+          f"identical output: {identical}")
+
+    results, aliases = make_inputs(args.channels, args.aliases)
+    rows = sum(len(result) for result in results.values())
+    summary_time, actual = best_of(args.repeat, build_summary_frame, results, aliases)
+    print(f"{args.channels} channels, {len(aliases)} aliases ({rows} lineup rows):")
+    print(f"  build_summary_frame  {summary_time:8.3f}s, "
+          f"{len(actual)} channels x {len(actual.columns)} columns")
+    return 0 if identical else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+// Shared helpers for the provider fixture pages.
+// Every page renders the same channels.json, so scraper results can be checked against it.
+
+const LATENCY_MS = 150;  // Simulated network delay before lists render
+
+function loadChannels() {
+    return fetch("../channels.json").then((response) => response.json());
+}
+
+// Tiered plans: plan i of n carries the first (i + 1) / n of the channels
+function inTier(index, tier, tierCount, total) {
+    return index < Math.ceil(total * (tier + 1) / tierCount);
+}
+
+function element(tag, attributes, children) {
+    const node = document.createElement(tag);
+    for (const [name, value] of Object.entries(attributes || {})) {
+        if (name === "text") {
+            node.textContent = value;
+        } else {
+            node.setAttribute(name, value);
+        }
+    }
+    for (const child of children || []) {
+        node.appendChild(child);
+    }
+    return node;
+}
+
+function later(callback) {
+    setTimeout(callback, LATENCY_MS);
+}
@@ -0,0 +1,136 @@
+import csv
+import functools
+import hashlib
+import logging
+import os
+import pickle
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional
+from src.config import load_config
+
+# Kept free of pandas and WebDriverUtils so building the index stays cheap to import
+config = load_config()
+
+# Variables for flexibility
+OUTPUT_DIR = config["OUTPUT_DIR"]
+INDEX_FILE = os.path.join(OUTPUT_DIR, "channel_aliases.idx")
+INDEX_FORMAT = 1  # Bump when the artifact layout changes
+
+# Child of the scraper logger, so messages go to the same console and log file
+LOGGER = logging.getLogger("src.WebDriverUtils").getChild("AliasIndex")
+
+class AliasIndex(Mapping):
+    """Channel alias lookups compiled from channels.csv.
+
+    Works as a read-only mapping of alias -> canonical name (the forward map), with the
+    reverse map (canonical name -> aliases) alongside. normalize() is memoized per index.
+    """
+
+    __slots__ = ("forward", "reverse", "normalize")
+
+    def __init__(self, forward: Dict[str, str], reverse: Dict[str, List[str]]):
+        self.forward = forward
+        self.reverse = reverse
+        self.normalize = functools.lru_cache(maxsize=None)(self._normalize)
+
+    @classmethod
+    def from_csv(cls, path: str) -> "AliasIndex":
+        """Compile the index from an alias CSV.
+
+        Every row lists a canonical name followed by its aliases. The file has no header row,
+        so the first row is an alias row like the others.
+        """
+        forward, reverse = {}, {}
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            for row in csv.reader(f):
+                names = [cell.strip().lower() for cell in row if cell.strip()]
+                if not names:
+                    continue
+                canonical = names[0]  # Use first column as canonical name
+                aliases = reverse.setdefault(canonical, [])
+                for alias in names:
+                    forward[alias] = canonical  # Map alias to canonical name
+                    if alias not in aliases:
+                        aliases.append(alias)
+        return cls(forward, reverse)
+
+    def _normalize(self, channel_name: str) -> str:
+        channel_name = channel_name.strip().lower()
+        return self.forward.get(channel_name, channel_name)
+
+    def aliases(self, canonical: str) -> List[str]:
+        """Return every known spelling of a canonical name (including itself)."""
+        return self.reverse.get(canonical, [canonical])
+
+    def __getitem__(self, alias: str) -> str:
+        return self.forward[alias]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.forward)
+
+    def __len__(self) -> int:
+        return len(self.forward)
+
+_loaded: Dict[str, tuple] = {}  # Absolute CSV path -> ((mtime_ns, size), index)
+
+def _file_sha256(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def load_alias_index(path: str, artifact: Optional[str] = INDEX_FILE) -> AliasIndex:
+    """Load the alias index for a CSV, compiling it only when the CSV has changed.
+
+    The compiled maps are pickled to ``artifact`` along with the CSV's mtime, size and
+    SHA-256. A matching mtime and size reuse the artifact directly; otherwise the hash
+    decides whether the CSV really changed. Loaded indexes are also kept per process.
+
+    Parameters:
+        path (str): The alias CSV.
+        artifact (Optional[str]): Where to keep the compiled index, or None to always compile.
+
+    Returns:
+        AliasIndex: The compiled index.
+    """
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    cached = _loaded.get(key[0])
+    if cached is not None and cached[0] == key[1:]:
+        return cached[1]
+
+    stored = None
+    if artifact and os.path.exists(artifact):
+        try:
+            with open(artifact, "rb") as f:
+                stored = pickle.load(f)
+            if stored.get("format") != INDEX_FORMAT or stored.get("source") != key[0]:
+                stored = None
+        except Exception as e:
+            LOGGER.warning(f"Ignoring unreadable alias index {artifact}: {e}")
+            stored = None
+
+    index, digest = None, None
+    if stored and (stored["mtime_ns"], stored["size"]) == key[1:]:
+        index = AliasIndex(stored["forward"], stored["reverse"])
+    else:
+        digest = _file_sha256(path)
+        if stored and stored["sha256"] == digest:
+            index = AliasIndex(stored["forward"], stored["reverse"])  # Touched but unchanged
+        else:
+            index = AliasIndex.from_csv(path)
+            LOGGER.info(f"Compiled alias index: {len(index.forward)} aliases "
+                        f"for {len(index.reverse)} channels")
+
+    if artifact and digest is not None:
+        # Record the current mtime/hash so the next run can skip hashing
+        try:
+            os.makedirs(os.path.dirname(artifact) or ".", exist_ok=True)
+            with open(artifact, "wb") as f:
+                pickle.dump({"format": INDEX_FORMAT, "source": key[0], "mtime_ns": key[1],
+                             "size": key[2],
+                             "sha256": digest, "forward": index.forward, "reverse": index.reverse},
+                            f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError as e:
+            LOGGER.warning(f"Could not save alias index {artifact}: {e}")
+
+    _loaded[key[0]] = (key[1:], index)
+    return index
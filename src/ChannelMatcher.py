@@ -0,0 +1,176 @@
+import csv
+import hashlib
+import json
+import os
+import re
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+from src.AliasIndex import AliasIndex, LOGGER, OUTPUT_DIR, config
+
+# Variables for flexibility
+# Minimum trigram similarity (0-1) to accept a fuzzy match
+MATCH_THRESHOLD = config["MATCH_THRESHOLD"]
+MATCH_CACHE_FILE = os.path.join(OUTPUT_DIR, "channel_matches.json")
+UNRESOLVED_FILE = os.path.join(OUTPUT_DIR, "unresolved_channels.csv")
+
+_PARENTHESES_RE = re.compile(r"\([^)]*\)")
+_SEPARATOR_RE = re.compile(r"[^\w&+]+")
+_DIGITS_RE = re.compile(r"\d+")
+
+def match_key(name: str) -> str:
+    """Reduce a channel name to lowercase words, dropping punctuation."""
+    return " ".join(_SEPARATOR_RE.sub(" ", name.lower()).split())
+
+def trigrams(key: str) -> set:
+    padded = f" {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class ChannelMatcher:
+    """Resolve channel names missing from the alias file to known canonical names.
+
+    Every alias in the index is a match target. A name resolves if, ignoring punctuation,
+    it equals a target, or does once parenthesized parts like "(KAMC - Lubbock)" are
+    removed, or it shares enough trigrams with one (Dice similarity >= threshold) and has
+    the same numbers, so "FOX Sports 1" never becomes "FOX Sports 2". Results are kept per
+    name for the run and saved to disk, tied to the alias file's contents and the threshold.
+    """
+
+    def __init__(self, alias_index: AliasIndex, threshold: float = MATCH_THRESHOLD):
+        self.alias_index = alias_index
+        self.threshold = threshold
+        self.canonicals = set(alias_index.reverse)
+        targets = sorted(alias_index.forward.items())
+        self.fingerprint = hashlib.sha256(
+            json.dumps([threshold, targets], ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+
+        # Inverted index: trigram -> ids of the targets containing it
+        self._exact: Dict[str, str] = {}
+        # (alias, canonical, trigrams, numbers)
+        self._targets: List[Tuple[str, str, set, tuple]] = []
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        for alias, canonical in targets:
+            key = match_key(alias)
+            self._exact.setdefault(key, canonical)
+            grams = trigrams(key)
+            for gram in grams:
+                self._postings[gram].append(len(self._targets))
+            self._targets.append((alias, canonical, grams, tuple(_DIGITS_RE.findall(key))))
+
+        # name -> (canonical, score, closest)
+        self.matches: Dict[str, Tuple[Optional[str], float, Optional[str]]] = {}
+        self.sources: Dict[str, set] = defaultdict(set)  # name -> providers it was seen in this run
+
+    def resolve(self, name: str, source: Optional[str] = None) -> str:
+        """Return the canonical name for an already normalized name, or the name itself if
+        unresolved.
+
+        Parameters:
+            name (str): A name from normalize_channel_name.
+            source (Optional[str]): Where the name was seen (e.g. a provider), for the
+                unresolved report.
+        """
+        if name in self.canonicals:
+            return name
+        sources = self.sources[name]
+        if source:
+            sources.add(source)
+        match = self.matches.get(name)
+        if match is None:
+            match = self.matches[name] = self._match(name)
+            if match[0]:
+                LOGGER.info(f"Matched channel '{name}' to '{match[0]}' ({match[1]:.2f})")
+        return match[0] or name
+
+    def _match(self, name: str) -> Tuple[Optional[str], float, Optional[str]]:
+        key = match_key(name)
+        for candidate in (key, match_key(_PARENTHESES_RE.sub(" ", name))):
+            if candidate in self._exact:
+                return self._exact[candidate], 1.0, self._exact[candidate]
+
+        grams = trigrams(key)
+        numbers = tuple(_DIGITS_RE.findall(key))
+        shared = Counter(target for gram in grams for target in self._postings.get(gram, ()))
+        best_score, best_target = 0.0, None
+        for target, count in shared.items():
+            _, canonical, target_grams, target_numbers = self._targets[target]
+            score = 2 * count / (len(grams) + len(target_grams))
+            if target_numbers != numbers:
+                continue
+            if score > best_score or (score == best_score and best_target
+                                      and canonical < best_target):
+                best_score, best_target = score, canonical
+        if best_score >= self.threshold:
+            return best_target, round(best_score, 4), best_target
+        return None, round(best_score, 4), best_target
+
+    def unresolved(self) -> List[Tuple[str, Optional[str], float, List[str]]]:
+        """Return (name, closest canonical, similarity, sources) for names seen this run that
+        didn't resolve."""
+        return [
+            (name, self.matches[name][2], self.matches[name][1], sorted(sources))
+            for name, sources in sorted(self.sources.items())
+            if not self.matches[name][0]
+        ]
+
+    def load(self, path: str = MATCH_CACHE_FILE) -> int:
+        """Load saved match results made with the same aliases and threshold.
+
+        Returns:
+            int: The number of results loaded.
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError) as e:
+            LOGGER.warning(f"Ignoring unreadable channel match cache {path}: {e}")
+            return 0
+        if saved.get("fingerprint") != self.fingerprint:
+            return 0
+        for name, (canonical, score, closest) in saved.get("matches", {}).items():
+            self.matches.setdefault(name, (canonical, score, closest))
+        return len(saved.get("matches", {}))
+
+    def save(self, path: str = MATCH_CACHE_FILE) -> None:
+        """Save the match results so later runs skip the fuzzy search."""
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"fingerprint": self.fingerprint, "matches": self.matches}, f,
+                          ensure_ascii=False)
+        except OSError as e:
+            LOGGER.warning(f"Could not save channel match cache {path}: {e}")
+
+    def write_unresolved_report(self, path: str = UNRESOLVED_FILE) -> int:
+        """Write the unresolved names to a CSV for adding to channels.csv.
+
+        Returns:
+            int: The number of unresolved names.
+        """
+        rows = self.unresolved()
+        with open(path, "w", encoding="utf-8-sig", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Channel", "Closest Match", "Similarity", "Seen In"])
+            for name, closest, score, sources in rows:
+                writer.writerow([name, closest or "", f"{score:.2f}", ", ".join(sources)])
+        if rows:
+            LOGGER.info(f"{len(rows)} channel names not in the alias file, listed in {path}")
+        return len(rows)
+
+_matchers: Dict[float, ChannelMatcher] = {}  # Threshold -> matcher for the current alias index
+
+def get_channel_matcher(alias_index: AliasIndex, threshold: float = MATCH_THRESHOLD,
+                        cache_file: Optional[str] = MATCH_CACHE_FILE) -> ChannelMatcher:
+    """Return the run's matcher for an alias index, building its n-gram index only once.
+
+    Saved match results are loaded from ``cache_file`` when the matcher is built.
+    """
+    matcher = _matchers.get(threshold)
+    if matcher is None or matcher.alias_index is not alias_index:
+        matcher = ChannelMatcher(alias_index, threshold)
+        if cache_file:
+            matcher.load(cache_file)
+        _matchers[threshold] = matcher
+    return matcher
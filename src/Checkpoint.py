@@ -0,0 +1,161 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+from src.WebDriverUtils import (OUTPUT_DIR, CHECKPOINT_MAX_AGE_HOURS, RETRY_ATTEMPTS, LOGGER,
+                                retry_operation)
+
+# Variables for flexibility
+CHECKPOINT_FILE = os.path.join(OUTPUT_DIR, "checkpoints.sqlite")
+
+def _timestamp(seconds: float) -> str:
+    return datetime.fromtimestamp(seconds).isoformat(timespec="seconds")
+
+class Checkpoint:
+    """Completed steps of one scrape (e.g. each plan page of a provider for one ZIP code), saved
+    as they finish.
+
+    A scrape that fails part way keeps the steps it finished, so the next run repeats only the
+    steps that failed. Steps are keyed by provider, ZIP code and scraper version; steps older
+    than ``max_age`` hours are scraped again. ``provenance`` records where each step's result
+    came from. Steps may finish on several threads at once.
+    """
+
+    def __init__(self, provider: str, zipcode: str, version: int, path: str = CHECKPOINT_FILE,
+                 max_age: Optional[float] = CHECKPOINT_MAX_AGE_HOURS):
+        self.provider = provider
+        self.zipcode = zipcode
+        self.version = version
+        self.max_age = max_age
+        self.provenance: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        # Processes scraping other providers may write to the same file
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS steps ("
+            " provider TEXT NOT NULL, zipcode TEXT NOT NULL, version INTEGER NOT NULL,"
+            " step TEXT NOT NULL,"
+            " completed_at REAL NOT NULL, attempts INTEGER NOT NULL, result BLOB NOT NULL,"
+            " PRIMARY KEY (provider, zipcode, version, step))"
+        )
+        self.conn.commit()
+
+    def _key(self, step: str) -> tuple:
+        return (self.provider, self.zipcode, self.version, step)
+
+    def get(self, step: str) -> Optional[tuple]:
+        """Return (completed_at, result) of a saved step, or None if it has to be run."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT completed_at, result FROM steps"
+                " WHERE provider = ? AND zipcode = ? AND version = ? AND step = ?",
+                self._key(step),
+            ).fetchone()
+        if row is None:
+            return None
+        completed_at, blob = row
+        if self.max_age is not None and time.time() - completed_at > self.max_age * 3600:
+            return None
+        try:
+            return completed_at, pickle.loads(blob)
+        except Exception as e:
+            LOGGER.warning(f"Discarding unreadable {self.provider} checkpoint {step} "
+                           f"for {self.zipcode}: {e}")
+            return None
+
+    def run(self, step: str, operation: Callable[[], Any],
+            on_retry: Optional[Callable[[int, Exception], None]] = None,
+            max_retries: int = RETRY_ATTEMPTS) -> Any:
+        """Return a step's saved result, or run it (retrying with backoff, see retry_operation)
+        and save it.
+
+        Parameters:
+            step (str): Step name, unique within the scrape, e.g. the plan name.
+            operation: Function called without arguments that performs the step.
+            on_retry: Optional function called with (attempt number, error) before each retry.
+            max_retries (int): Attempts before giving up on the step.
+
+        Returns:
+            The step's result.
+
+        Raises:
+            Exception: The last error, if every attempt failed. The failure is recorded in
+                ``provenance``.
+        """
+        saved = self.get(step)
+        if saved is not None:
+            completed_at, result = saved
+            self.provenance[step] = {"source": "checkpoint",
+                                     "completed_at": _timestamp(completed_at)}
+            LOGGER.info(f"Resuming {self.provider} {step} for {self.zipcode} from checkpoint "
+                        f"({_timestamp(completed_at)})")
+            return result
+
+        attempts = 0
+
+        def attempt():
+            nonlocal attempts
+            attempts += 1
+            return operation()
+
+        try:
+            result = retry_operation(attempt, max_retries, on_retry=on_retry)
+        except Exception as e:
+            self.provenance[step] = {"source": "failed", "attempts": attempts,
+                                     "error": f"{type(e).__name__}: {e}"}
+            raise
+
+        completed_at = time.time()
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO steps"
+                " (provider, zipcode, version, step, completed_at, attempts, result)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (*self._key(step), completed_at, attempts,
+                 pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)),
+            )
+            self.conn.commit()
+        self.provenance[step] = {"source": "scraped", "attempts": attempts,
+                                 "completed_at": _timestamp(completed_at)}
+        return result
+
+    @property
+    def failed(self) -> List[str]:
+        """Steps that failed in this run."""
+        return [step for step, record in self.provenance.items() if record["source"] == "failed"]
+
+    def clear(self) -> None:
+        """Forget every saved step of this scrape, e.g. once its full result is cached."""
+        with self._lock:
+            self.conn.execute(
+                "DELETE FROM steps WHERE provider = ? AND zipcode = ? AND version = ?",
+                (self.provider, self.zipcode, self.version),
+            )
+            self.conn.commit()
+
+    def finish(self, lineup) -> None:
+        """Attach the provenance to a scrape's result and log it; clear the checkpoint if every
+        step completed."""
+        lineup.provenance = dict(self.provenance)
+        sources = [record["source"] for record in self.provenance.values()]
+        LOGGER.info(f"{self.provider} {self.zipcode}: {sources.count('scraped')} steps scraped, "
+                    f"{sources.count('checkpoint')} resumed from checkpoint, "
+                    f"{sources.count('failed')} failed")
+        if self.failed:
+            LOGGER.warning(f"Partial {self.provider} result for {self.zipcode}, "
+                           f"missing {self.failed}; "
+                           f"the next run retries only those")
+        else:
+            self.clear()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
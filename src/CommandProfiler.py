@@ -0,0 +1,149 @@
+import atexit
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+import selenium
+
+# Variables for flexibility
+PROFILE_TOP = 20  # Call sites in the report
+
+# Child of the scraper logger, so messages go to the same console and log file
+LOGGER = logging.getLogger("src.WebDriverUtils").getChild("CommandProfiler")
+
+# Kept free of WebDriverUtils so run_webdriver can instrument its drivers
+_HERE = os.path.abspath(__file__)
+_TRACING = os.path.join(os.path.dirname(_HERE), "Tracing.py")  # @traced wrappers
+_HELPERS = os.path.join(os.path.dirname(_HERE), "WebDriverUtils.py")
+_SELENIUM_DIR = os.path.dirname(os.path.abspath(selenium.__file__)) + os.sep
+
+_enabled = False
+_report_registered = False
+# (call site, helper, command) -> [count, total seconds]
+_stats: Dict[Tuple[str, Optional[str], str], List[float]] = {}
+_stats_lock = threading.Lock()
+
+def enable(top: Optional[int] = PROFILE_TOP) -> None:
+    """Profile the remote commands of every driver started from now on.
+
+    Parameters:
+        top (Optional[int]): Log a report of this many hottest call sites at exit; None for no
+            report.
+    """
+    global _enabled, _report_registered
+    _enabled = True
+    if top and not _report_registered:
+        # Registered after cleanup_chrome_drivers, so it runs before the drivers quit
+        atexit.register(report, top)
+        _report_registered = True
+
+def is_enabled() -> bool:
+    return _enabled
+
+def _frame_label(frame) -> str:
+    return f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno} {frame.f_code.co_name}"
+
+def _call_site(frame) -> Tuple[str, Optional[str]]:
+    """Find the code that sent a command, skipping Selenium's own frames.
+
+    Returns:
+        Tuple[str, Optional[str]]: The scraper line, and the WebDriverUtils line it went
+        through, if any.
+    """
+    helper = None
+    while frame is not None:
+        path = os.path.abspath(frame.f_code.co_filename)
+        if path in (_HERE, _TRACING) or path.startswith(_SELENIUM_DIR):
+            pass
+        elif path == _HELPERS:
+            helper = helper or _frame_label(frame)
+        else:
+            return _frame_label(frame), helper
+        frame = frame.f_back
+    return helper or "(unknown)", None
+
+def instrument(driver):
+    """Count and time every remote command a driver sends, by calling scraper line.
+
+    Element calls (text, get_attribute, find_elements on an element, ...) go through the
+    driver's connection too, so they are counted as well. The driver is changed in place
+    and returned.
+    """
+    connection = driver.command_executor
+    execute = connection.execute
+
+    def profiled_execute(command, params):
+        site, helper = _call_site(sys._getframe(1))
+        start = time.perf_counter()
+        try:
+            return execute(command, params)
+        finally:
+            elapsed = time.perf_counter() - start
+            with _stats_lock:
+                entry = _stats.setdefault((site, helper, command), [0, 0.0])
+                entry[0] += 1
+                entry[1] += elapsed
+
+    connection.execute = profiled_execute
+    return driver
+
+def collect() -> Dict[Tuple[str, Optional[str], str], List[float]]:
+    """Return and clear the counts so far, e.g. to send them from a worker process."""
+    with _stats_lock:
+        stats = dict(_stats)
+        _stats.clear()
+    return stats
+
+def merge(stats: Dict[Tuple[str, Optional[str], str], List[float]]) -> None:
+    """Add counts recorded in another process."""
+    with _stats_lock:
+        for key, (count, seconds) in stats.items():
+            entry = _stats.setdefault(key, [0, 0.0])
+            entry[0] += count
+            entry[1] += seconds
+
+def summarize(stats: Optional[Dict] = None) -> List[Dict[str, Any]]:
+    """Total the commands per call site, most time spent first.
+
+    Returns:
+        List[Dict[str, Any]]: Rows with site, via (the WebDriverUtils helper, if any), count,
+        total_s, mean_ms and commands (command name -> count, most frequent first).
+    """
+    if stats is None:
+        with _stats_lock:
+            stats = dict(_stats)
+    sites: Dict[Tuple[str, Optional[str]], Dict[str, Any]] = {}
+    for (site, helper, command), (count, seconds) in stats.items():
+        row = sites.setdefault((site, helper), {"site": site, "via": helper, "count": 0,
+                                                "total_s": 0.0, "commands": {}})
+        row["count"] += count
+        row["total_s"] += seconds
+        row["commands"][command] = row["commands"].get(command, 0) + count
+    rows = sorted(sites.values(), key=lambda row: (row["total_s"], row["count"]), reverse=True)
+    for row in rows:
+        row["mean_ms"] = round(row["total_s"] * 1000 / row["count"], 2)
+        row["total_s"] = round(row["total_s"], 3)
+        row["commands"] = dict(sorted(row["commands"].items(), key=lambda item: item[1],
+                                      reverse=True))
+    return rows
+
+def report(top: int = PROFILE_TOP) -> List[Dict[str, Any]]:
+    """Log the call sites that spent the most time on WebDriver round trips.
+
+    Returns:
+        List[Dict[str, Any]]: The reported rows (see summarize).
+    """
+    rows = summarize()
+    total = sum(row["count"] for row in rows)
+    LOGGER.info(f"{total} WebDriver commands from {len(rows)} call sites, "
+                f"{sum(row['total_s'] for row in rows):.2f}s in round trips")
+    LOGGER.info(f"{'Count':>7} {'Total s':>9} {'Mean ms':>8}  Call site")
+    for row in rows[:top]:
+        via = f" (via {row['via']})" if row["via"] else ""
+        top_commands = list(row["commands"].items())[:3]
+        commands = ", ".join(f"{name} x{count}" for name, count in top_commands)
+        LOGGER.info(f"{row['count']:>7} {row['total_s']:>9.3f} {row['mean_ms']:>8.2f}  "
+                    f"{row['site']}{via}: {commands}")
+    return rows[:top]
@@ -1,11 +1,13 @@
-import os
-import pandas as pd
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from src.WebDriverUtils import ZIPCODE, OUTPUT_DIR, LOGGER, load_page, click_element, set_zipcode, extract_channel_data, smooth_scroll_to_bottom, write_to_excel
+from src.LineupResult import LineupResult
+from src.HtmlSnapshot import parse_table_html
+from src.Tracing import traced
+from src.WebDriverUtils import (ZIPCODE, API_CAPTURE, LOGGER, load_page, wait_for_json_responses,
+                                click_element, set_zipcode, capture_html, save_snapshot,
+                                smooth_scroll_to_bottom, release_driver)
 
 # Variables for flexibility
+SCRAPER_VERSION = 2
 DIRECTV_URL = "https://www.directv.com/channel-lineup/"
 SET_ZIP_LINK_CLASS = "mui-style-1c87emg"
 ZIP_INPUT_ID = "zipcode-search"
@@ -15,69 +17,138 @@ CHANNELS_TABLE_HEADER_ID = "ChannelLineup-PackagesHeader"
 PLAN_NAME_CLASS = "MuiTypography-root"
 CHANNELS_TABLE_BODY_ID = "tableBody"
 CHANNELS_TABLE_ROW_CLASS = "mui-style-1ybie8h"
+SCROLL_STABLE_FRAMES = 30  # ~0.5s without new rows before the lineup counts as loaded
+SCROLL_DEADLINE = 60  # Hard limit for scrolling, in seconds
+API_WAIT = 10  # Seconds to wait for the lineup JSON once the ZIP code is set
 
-OUTPUT_FILE = os.path.join(OUTPUT_DIR, "DirecTVChannelList.xlsx")
+def is_lineup_payload(payload):
+    """Return True if a captured JSON response lists packages and channels."""
+    body = payload.get("body")
+    return (isinstance(body, dict) and isinstance(body.get("packages"), list)
+            and isinstance(body.get("channels"), list))
 
-def scrape_directv(mode="headless"):
-    """Scrapes live channel data from DirecTV."""
-    driver = load_page(mode, "DirecTV", DIRECTV_URL, sleep_time = 1)
-    all_channels, plans = [], []
+@traced("capture", provider="directv")
+def capture_directv(driver, zipcode=ZIPCODE, api_pattern=None):
+    """Set the ZIP code, then read the lineup JSON or, without it, load the whole lineup and
+    capture the table HTML.
+
+    Parameters:
+        api_pattern: Regex for the lineup JSON URLs (see API_CAPTURE), or None to always read
+            the table. The driver must capture network events if it is set.
+
+    Returns:
+        dict: The lineup JSON responses under 'api', and unless they could be used instead,
+        the header and body outerHTML of the channel table.
+    """
+    # Locate and click the zipcode link
+    click_element(driver, (By.CLASS_NAME, SET_ZIP_LINK_CLASS))
+    LOGGER.info("Opened set zipcode window...")
+
+    # Set zipcode and submit, page will be refreshed
+    set_zipcode(driver, zipcode, (By.ID, ZIP_INPUT_ID),
+                (By.XPATH, f"//a[@aria-label='{SET_ZIP_LINK_BUTTON_ARIA_LABEL}']"))
+
+    snapshot = {}
+    if api_pattern:
+        # The table is rendered from this JSON; with it there is no need to scroll
+        snapshot["api"] = wait_for_json_responses(driver, api_pattern, timeout=API_WAIT)
+        if any(is_lineup_payload(payload) for payload in snapshot["api"]):
+            return snapshot
+        LOGGER.warning("No DirecTV lineup JSON captured, reading the table instead")
+
+    # Lazy-loaded rows: stop once the table stops growing
+    smooth_scroll_to_bottom(driver,
+                            row_selector=f"#{CHANNELS_TABLE_BODY_ID} .{CHANNELS_TABLE_ROW_CLASS}",
+                            stable_frames=SCROLL_STABLE_FRAMES, deadline=SCROLL_DEADLINE)
+
+    snapshot["header"] = capture_html(driver, (By.ID, CHANNELS_TABLE_HEADER_ID))
+    snapshot["body"] = capture_html(driver, (By.ID, CHANNELS_TABLE_BODY_ID))
+    return snapshot
+
+@traced("parse", provider="directv")
+def parse_directv_api(payloads):
+    """Parse the captured lineup JSON into channel rows and plan names.
+
+    Each lineup response lists the 'packages' (plans) and the 'channels', each with its
+    'name', 'number' and the 'packages' it is in. Channels of several responses (e.g. pages
+    of the lineup) are combined; a channel listed again with the same number is kept once.
+
+    Returns:
+        LineupResult: Channel rows with numbers and plan membership.
+    """
+    bodies = [payload["body"] for payload in payloads if is_lineup_payload(payload)]
+    plans = list(dict.fromkeys(plan for body in bodies for plan in body["packages"]))
+    LOGGER.info(f"Extracted plans: {plans}")
+
+    lineup = LineupResult("directv", plans)
+    seen = set()
+    for body in bodies:
+        for channel in body["channels"]:
+            if not channel.get("name") or channel.get("number") is None:
+                continue  # Skip if information is missing
+            key = (channel["name"].strip(), str(channel["number"]))
+            if key in seen:
+                continue
+            seen.add(key)
+            packages = set(channel.get("packages", []))
+            lineup.add(key[0], [plan in packages for plan in plans], key[1])
+    LOGGER.info(f"Extracted {len(lineup)} channels for DirecTV from its lineup JSON.")
+    return lineup
+
+@traced("parse", provider="directv")
+def parse_directv(snapshot):
+    """Parse a DirecTV snapshot into channel rows and plan names.
+
+    Snapshots without the table HTML were captured from the lineup JSON (see
+    parse_directv_api).
+
+    Returns:
+        LineupResult: Channel rows with numbers and plan membership.
+    """
+    if "body" not in snapshot:
+        return parse_directv_api(snapshot["api"])
+
+    # Extract plans from table header dynamically
+    headers = parse_table_html(snapshot["header"], "td", value_selector=f".{PLAN_NAME_CLASS}")
+    plans = [header["value"] for header in headers if header["value"]]
+    if plans and plans[0] == "CHANNELS":
+        plans.pop(0)
+    LOGGER.info(f"Extracted plans: {plans}")
+
+    # Channel info is in the first child div (name, number), the next divs are plan columns
+    rows = parse_table_html(snapshot["body"], f".{CHANNELS_TABLE_ROW_CLASS}",
+                            cell_selector=":scope > div", info_selector="p",
+                            flag_selectors=("span", "img"))
+    LOGGER.info(f"Extracted {len(rows)} channels for DirecTV.")
+
+    lineup = LineupResult("directv", plans)
+    for row in rows:
+        if len(row["info"]) < 2:
+            continue  # Skip if information is missing
+        channel_name, channel_number = row["info"][0], row["info"][1]
+        lineup.add(channel_name, row["flags"][:len(plans)], channel_number)
+    return lineup
+
+@traced("scrape", provider="directv", arg_tags={"zipcode": "zip"})
+def scrape_directv(mode="headless", zipcode=ZIPCODE):
+    """Scrapes live channel data from DirecTV for a ZIP code."""
+    api_pattern = API_CAPTURE.get("directv")
+    driver = load_page(mode, "DirecTV", DIRECTV_URL, sleep_time=1,
+                       capture_network=bool(api_pattern), provider="directv")
+    lineup = LineupResult("directv")
     try:
-        # Locate and click the zipcode link
-        click_element(driver, (By.CLASS_NAME, SET_ZIP_LINK_CLASS))
-        LOGGER.info("Opened set zipcode window...")
-        
-        # Set zipcode and submit, page will be refreshed
-        set_zipcode(driver, ZIPCODE, (By.ID, ZIP_INPUT_ID), (By.XPATH, f"//a[@aria-label='{SET_ZIP_LINK_BUTTON_ARIA_LABEL}']"))
-
-        smooth_scroll_to_bottom(driver)
-        
-        # Locate the channel table header
-        channels_header = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.ID, CHANNELS_TABLE_HEADER_ID))
-        )
-        LOGGER.info(f"Header located")
-        # Extract plan plans from table header dynamically
-
-        plan_headers = channels_header.find_elements(By.TAG_NAME, "td")
-        for header in plan_headers:
-            plan_name_elem = header.find_elements(By.CLASS_NAME, PLAN_NAME_CLASS)
-            if plan_name_elem:
-                plans.append(plan_name_elem[0].text.strip())
-        if plans[0] == "CHANNELS":
-            plans.pop(0)
-        LOGGER.info(f"Extracted plans: {plans}")
-
-        channels = extract_channel_data(driver, (By.ID, CHANNELS_TABLE_BODY_ID), (By.CLASS_NAME, CHANNELS_TABLE_ROW_CLASS))
-        LOGGER.info(f"Extracted {len(channels)} channels for DirecTV.")
-
-        for channel in channels:
-            # The first child div contains channel info
-            info_div = channel.find_elements(By.XPATH, './div')[0]
-            channel_name = info_div.find_elements(By.TAG_NAME, "p")[0].text.strip()
-            channel_number = info_div.find_elements(By.TAG_NAME, "p")[1].text.strip()
-
-            # The next divs correspond to plan columns
-            plan_status = []
-            for i in range(1, len(plans) + 1):
-                plan_div = channel.find_elements(By.XPATH, f'./div[{i+1}]')[0]
-                included = "✔️" if plan_div.find_elements(By.TAG_NAME, "span") and plan_div.find_elements(By.TAG_NAME, "img") else ""
-                plan_status.append(included)
-
-            all_channels.append([channel_name, channel_number] + plan_status)
-
-        # Convert to DataFrame
-        df_directv = pd.DataFrame(all_channels, columns=["Channel Name", "Channel Number"] + plans)
-
-        # Sort DataFrame by Channel Name
-        df_directv = df_directv.sort_values(by=["Channel Name"])
-
-        # Write to Excel File
-        write_to_excel(df_directv, OUTPUT_FILE, sheet_name="DirecTV Channels")
+        snapshot = capture_directv(driver, zipcode, api_pattern)
+
+        # The browser is not needed once the lineup is captured
+        release_driver(driver)
+        driver = None
+        save_snapshot(f"directv_{zipcode}", snapshot)
+
+        lineup = parse_directv(snapshot)
 
     except Exception as e:
         LOGGER.error(f"Error: {e}")
 
     finally:
-        driver.quit()
-        return all_channels, plans
\ No newline at end of file
+        release_driver(driver)
+        return lineup
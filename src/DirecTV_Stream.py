@@ -1,11 +1,13 @@
-import os
-import pandas as pd
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from src.WebDriverUtils import ZIPCODE, OUTPUT_DIR, LOGGER, load_page, click_element, set_zipcode, extract_channel_data, smooth_scroll_to_bottom, write_to_excel
+from src.LineupResult import LineupResult
+from src.HtmlSnapshot import parse_table_html
+from src.Tracing import traced
+from src.WebDriverUtils import (ZIPCODE, LOGGER, load_page, click_element, set_zipcode,
+                                capture_html, save_snapshot, smooth_scroll_to_bottom,
+                                release_driver)
 
 # Variables for flexibility
+SCRAPER_VERSION = 2
 DIRECTV_STREAM_URL = "https://streamtv.directv.com/channels/modal/"
 SET_ZIP_LINK_ID = "hide-change"
 ZIP_INPUT_ID = "zipcode-search"
@@ -16,71 +18,81 @@ PLAN_NAME_CLASS = "package-name"
 CHANNELS_TABLE_BODY_ID = "nestedTableBody"
 CHANNELS_TABLE_ROW_CLASS = "MuiTableRow-root"
 CHANNEL_SPAN_CLASS = "MuiTypography-root"
-OUTPUT_FILE = os.path.join(OUTPUT_DIR, "DirecTVStreamChannelList.xlsx")
+SCROLL_STABLE_FRAMES = 30  # ~0.5s without new rows before the lineup counts as loaded
+SCROLL_DEADLINE = 60  # Hard limit for scrolling, in seconds
 
-def scrape_directv_stream(mode="headless"):
-    """Scrapes live channel data from DirecTV Stream."""
-    driver = load_page(mode, "DirecTV Stream", DIRECTV_STREAM_URL)
-    all_channels, plans = [], []
+@traced("capture", provider="directvstream")
+def capture_directv_stream(driver, zipcode=ZIPCODE):
+    """Set the ZIP code, load the whole lineup and capture the table HTML.
+
+    Returns:
+        dict: The header and body outerHTML of the channel table.
+    """
+    # Locate and click the zipcode link
+    click_element(driver, (By.ID, SET_ZIP_LINK_ID))
+    LOGGER.info("Opened set zipcode window...")
+
+    # Set zipcode and submit, page will be refreshed
+    set_zipcode(driver, zipcode, (By.ID, ZIP_INPUT_ID),
+                (By.XPATH, f"//a[@aria-label='{SET_ZIP_LINK_BUTTON_ARIA_LABEL}']"))
+
+    # Lazy-loaded rows: stop once the table stops growing
+    smooth_scroll_to_bottom(driver,
+                            row_selector=f"#{CHANNELS_TABLE_BODY_ID} .{CHANNELS_TABLE_ROW_CLASS}",
+                            stable_frames=SCROLL_STABLE_FRAMES, deadline=SCROLL_DEADLINE)
+
+    return {
+        "header": capture_html(driver, (By.ID, CHANNELS_TABLE_HEADER_ID)),
+        "body": capture_html(driver, (By.ID, CHANNELS_TABLE_BODY_ID)),
+    }
+
+@traced("parse", provider="directvstream")
+def parse_directv_stream(snapshot):
+    """Parse a DirecTV Stream snapshot into channel rows and plan names.
+
+    Returns:
+        LineupResult: Channel rows with numbers and plan membership.
+    """
+    # Extract plans from table header dynamically
+    headers = parse_table_html(snapshot["header"], "th", value_selector=f".{PLAN_NAME_CLASS}")
+    plans = [header["value"] for header in headers if header["value"]]
+    LOGGER.info(f"Extracted plans: {plans}")
+
+    # Channel name and number are in the first td, the following tds are plan columns
+    rows = parse_table_html(snapshot["body"], f".{CHANNELS_TABLE_ROW_CLASS}",
+                            cell_selector="td", info_selector=f".{CHANNEL_SPAN_CLASS}",
+                            flag_selectors=("span",))
+    LOGGER.info(f"Extracted {len(rows)} channels for DirecTV Stream.")
+
+    # Extract Channel Name, Number, and Availability in Plans
+    lineup = LineupResult("directvstream", plans)
+    for row in rows:
+        if len(row["info"]) < 2:
+            continue  # Skip if information is missing
+        channel_name, channel_number = row["info"][-2], row["info"][-1]
+
+        # Store data
+        lineup.add(channel_name, row["flags"][:len(plans)], channel_number)
+    return lineup
+
+@traced("scrape", provider="directvstream", arg_tags={"zipcode": "zip"})
+def scrape_directv_stream(mode="headless", zipcode=ZIPCODE):
+    """Scrapes live channel data from DirecTV Stream for a ZIP code."""
+    driver = load_page(mode, "DirecTV Stream", DIRECTV_STREAM_URL, provider="directvstream")
+    lineup = LineupResult("directvstream")
     try:
-        # Locate and click the zipcode link
-        click_element(driver, (By.ID, SET_ZIP_LINK_ID))
-        LOGGER.info("Opened set zipcode window...")
-        
-        # Set zipcode and submit, page will be refreshed
-        set_zipcode(driver, ZIPCODE, (By.ID, ZIP_INPUT_ID), (By.XPATH, f"//a[@aria-label='{SET_ZIP_LINK_BUTTON_ARIA_LABEL}']"))
-
-        smooth_scroll_to_bottom(driver)
-        
-        # Locate the channel table header
-        channels_header = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.ID, CHANNELS_TABLE_HEADER_ID))
-        )
-        LOGGER.info(f"Header located")
-        # Extract plans from table header dynamically
-        plan_headers = channels_header.find_elements(By.TAG_NAME, "th")
-        for header in plan_headers:
-            plan_name_elem = header.find_elements(By.CLASS_NAME, PLAN_NAME_CLASS)
-            if plan_name_elem:
-                plans.append(plan_name_elem[0].text.strip())
-        LOGGER.info(f"Extracted plans: {plans}")
-
-        channels = extract_channel_data(driver, (By.ID, CHANNELS_TABLE_BODY_ID), (By.CLASS_NAME, CHANNELS_TABLE_ROW_CLASS))
-        LOGGER.info(f"Extracted {len(channels)} channels for DirecTV Stream.")
-
-        # Extract Channel Name, Number, and Availability in Plans
-        LOGGER.info(len(channels))
-        for channel in channels:
-            cells = channel.find_elements(By.TAG_NAME, "td")
-
-            # Extract channel name and number (inside first td)
-            channel_info = cells[0].find_elements(By.CLASS_NAME, CHANNEL_SPAN_CLASS)
-            if len(channel_info) < 2:
-                continue  # Skip if information is missing
-            channel_name = channel_info[-2].text.strip()
-            channel_number = channel_info[-1].text.strip()
-
-            # Extract plan availability (second to fifth td)
-            plan_status = []
-            for i in range(1, len(plans) + 1):
-                included = "✔️" if cells[i].find_elements(By.TAG_NAME, "span") else ""
-                plan_status.append(included)
-
-            # Store data
-            all_channels.append([channel_name, channel_number] + plan_status)
-
-        # Convert to DataFrame
-        df_directv_stream = pd.DataFrame(all_channels, columns=["Channel Name", "Channel Number"] + plans)
-
-        # Sort DataFrame by Channel Name
-        df_directv_stream = df_directv_stream.sort_values(by=["Channel Name"])
-
-        # Write to Excel File
-        write_to_excel(df_directv_stream, OUTPUT_FILE, sheet_name="DirecTV Stream Channels")
+        snapshot = capture_directv_stream(driver, zipcode)
+
+        # The browser is not needed once the DOM is captured
+        release_driver(driver)
+        driver = None
+        save_snapshot(f"directvstream_{zipcode}", snapshot)
+
+        lineup = parse_directv_stream(snapshot)
 
     except Exception as e:
         LOGGER.error(f"Error: {e}")
 
     finally:
-        driver.quit()
-        return all_channels, plans
\ No newline at end of file
+        release_driver(driver)
+        return lineup
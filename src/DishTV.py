@@ -1,13 +1,20 @@
-import os
 import time
-import pandas as pd
+import contextvars
+import concurrent.futures
+from urllib.parse import urljoin
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from src.WebDriverUtils import ZIPCODE, OUTPUT_DIR, LOGGER, load_page,  extract_channel_data, set_zipcode, write_to_excel
+from src.Checkpoint import Checkpoint
+from src.LineupResult import LineupResult
+from src.HtmlSnapshot import parse_html, parse_table_html
+from src.Tracing import traced
+from src.WebDriverUtils import (ZIPCODE, DRIVER_POOL_SIZE, LOGGER, load_page, capture_html,
+                                save_snapshot, set_zipcode, release_driver)
 
 # Variables for flexibility
+SCRAPER_VERSION = 2
 DISH_URL = "https://www.dish.com/"
 PLANS_UL_ID = "navList_TV Packages"
 PLAN_LI_ID = "navLink_shop"
@@ -15,71 +22,156 @@ ZIP_INPUT_ARIA_LABEL = "Results for"
 ZIP_INPUT_CLASS = "cmp-textinput__input"
 CHANNELS_DIV_CLASS = "cmp-singlepackageclu__channellist"
 CHANNEL_CLASS = "cmp-singlepackageclu__channel"
-OUTPUT_FILE = os.path.join(OUTPUT_DIR, "DishTVChannelList.xlsx")
+PLAN_WORKERS = DRIVER_POOL_SIZE  # Plan pages loaded at the same time, each in its own pooled driver
 
-def scrape_dishtv(mode="headless"):
-    """Scrapes live channel data from DishTV."""
-    driver = load_page(mode, "DishTV", DISH_URL)
-    channels, plans = {}, {}
+@traced("parse_plans", provider="dish")
+def parse_dish_plans(html, base_url=DISH_URL):
+    """Parse plan names and URLs from the DishTV navigation menu.
+
+    Returns:
+        dict: Plan name -> absolute plan URL, in menu order.
+    """
+    plans = {}
+    for pkg in parse_html(html).select(f"ul[id*='{PLANS_UL_ID}'] a"):
+        plan_name = pkg.get("aria-label")  # First try aria-label (reliable)
+        if not plan_name:
+            plan_name = pkg.text()  # Fallback to text if aria-label is missing
+
+        plan_url = urljoin(base_url, pkg.get("href") or "")
+
+        if plan_name:  # Ensure we don't store empty keys
+            plans[plan_name] = plan_url
+    return plans
+
+@traced("capture_plans", provider="dish")
+def capture_dish_plans(driver):
+    """Find the plan pages in the DishTV navigation menu.
+
+    Returns:
+        dict: Plan name -> absolute plan URL, in menu order.
+    """
+    # Get plans name and url in the list
+    LOGGER.info("Locating plans info...")
+    WebDriverWait(driver, 20).until(
+        EC.presence_of_element_located((By.ID, PLANS_UL_ID))
+    )
+
+    # Extract plan names & URLs
+    plans = parse_dish_plans(capture_html(driver), driver.current_url)
+    LOGGER.info(f"Found {len(plans)} plans: {list(plans)}")
+    return plans
+
+@traced("capture_plan", provider="dish", arg_tags={"plan_name": "plan", "zipcode": "zip"})
+def capture_dish_plan_page(mode, plan_name, plan_url, zipcode=ZIPCODE):
+    """Load one plan page in a pooled driver, set the ZIP code and capture its channel list.
+
+    Returns:
+        str: The channel list outerHTML.
+    """
+    LOGGER.info(f"Processing plan: {plan_name}...")
+    driver = load_page(mode, f"DishTV {plan_name}", plan_url, provider="dish")
     try:
-        all_channels = {}  # Dictionary to store channels across plans
-
-        # Get plans name and url in the list
-        LOGGER.info("Locating plans info...")
-        WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.ID, PLANS_UL_ID))
-        )
-
-        # Extract plan names & URLs
-        plan_elements = driver.find_elements(By.XPATH, f"//ul[contains(@id, '{PLANS_UL_ID}')]//a")
-        plans = {}
-        for pkg in plan_elements:
-            plan_name = pkg.get_attribute("aria-label")  # First try aria-label (reliable)
-            if not plan_name:
-                plan_name = pkg.text.strip()  # Fallback to .text if aria-label is missing
-            
-            plan_url = pkg.get_attribute("href")
-            
-            if plan_name:  # Ensure we don't store empty keys
-                plans[plan_name] = plan_url
-        LOGGER.info(f"Found {len(plans)} plans:", plans)
-
-        # Iterate over each plan to scrape channels
-        for plan_name, plan_url in plans.items():
-            LOGGER.info(f"Processing plan: {plan_name}...")
-            driver.get(plan_url)  # Navigate to plan page
-
-            # Set ZIP code and mimic "Enter" key press
-            zip_input_box = set_zipcode(driver, ZIPCODE, (By.XPATH, f"//input[@aria-label='{ZIP_INPUT_ARIA_LABEL}']"))
-            zip_input_box.send_keys(Keys.ENTER)  # Simulate pressing Enter
-            time.sleep(1)  # Ensure the page fully loads
-
-            channels = extract_channel_data(driver, (By.CLASS_NAME, CHANNELS_DIV_CLASS), (By.CLASS_NAME, CHANNEL_CLASS))
-            LOGGER.info(f"Extracted {len(channels)} channels for {plan_name}.")
-
-            for channel in channels:
-                try:
-                    channel_name = channel.find_element(By.TAG_NAME, "p").text.strip()
-                    # Extract only the name after "-"
-                    channel_name = channel_name.split(" - ")[-1] if " - " in channel_name else channel_name
-
-                    # Store channel in dictionary (mark available in this plan)
-                    if channel_name not in all_channels:
-                        all_channels[channel_name] = {pkg: "" for pkg in plans.keys()}  # Initialize row
-                    all_channels[channel_name][plan_name] = "✔️"  # Mark availability
-                except Exception as e:
-                    LOGGER.info(f"Error extracting channel name: {e}")
-
-        # Convert dictionary to DataFrame
-        df_dishtv = pd.DataFrame.from_dict(all_channels, orient="index")
-        df_dishtv.index.name = "Channel Name"
-
-        # Save to Excel with a frozen first row and filtering enabled
-        write_to_excel(df_dishtv, OUTPUT_FILE, sheet_name="DishTV Channels", index=True)
+        # Set ZIP code and mimic "Enter" key press
+        zip_input_box = set_zipcode(driver, zipcode,
+                                    (By.XPATH, f"//input[@aria-label='{ZIP_INPUT_ARIA_LABEL}']"))
+        zip_input_box.send_keys(Keys.ENTER)  # Simulate pressing Enter
+        time.sleep(1)  # Ensure the page fully loads
+
+        return capture_html(driver, (By.CLASS_NAME, CHANNELS_DIV_CLASS))
+    finally:
+        release_driver(driver)
+
+def capture_dish_pages(mode, plans, zipcode=ZIPCODE, max_workers=PLAN_WORKERS, checkpoint=None):
+    """Capture the channel list of every plan page, several plans at a time.
+
+    Plan pages are independent, so each one is loaded in its own pooled driver. The caller
+    must not hold a driver from the pool while waiting, or the plans could starve for drivers.
+    With a checkpoint, plans captured by an earlier run are reused and failed plans are retried.
+
+    Returns:
+        dict: Plan name -> channel list outerHTML, in the same order as ``plans``. Plans that
+        still failed are left out.
+    """
+    def capture(plan_name, plan_url):
+        def operation():
+            return capture_dish_plan_page(mode, plan_name, plan_url, zipcode)
+
+        try:
+            return checkpoint.run(plan_name, operation) if checkpoint else operation()
+        except Exception as e:
+            LOGGER.error(f"Giving up on DishTV {plan_name}: {e}")
+            return None
+
+    workers = max(1, min(len(plans), max_workers))
+    # Each plan runs in a copy of the caller's context, so its drivers count as this scraper job's
+    # (see parallel_scrape deadlines) and its trace spans keep the job's tags
+    contexts = [contextvars.copy_context() for _ in plans]
+    with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+        pages = executor.map(lambda plan, context: context.run(capture, *plan), plans.items(),
+                             contexts)
+        return {plan_name: html for plan_name, html in zip(plans, pages) if html is not None}
+
+@traced("parse", provider="dish")
+def parse_dishtv(snapshot):
+    """Parse a DishTV snapshot into per-channel plan availability.
+
+    Returns:
+        LineupResult: Channels and the plans they are available in.
+    """
+    # Plans that failed to load are left out rather than shown as empty
+    plans = [plan_name for plan_name in snapshot["plans"] if plan_name in snapshot["pages"]]
+    lineup = LineupResult("dish", plans)
+    for plan_name, html in snapshot["pages"].items():
+        channels = parse_table_html(html, f".{CHANNEL_CLASS}", value_selector="p")
+        LOGGER.info(f"Extracted {len(channels)} channels for {plan_name}.")
+
+        for channel in channels:
+            channel_name = channel["value"]
+            if not channel_name:
+                LOGGER.info("Skipping channel without a name.")
+                continue
+            # Extract only the name after "-"
+            channel_name = channel_name.split(" - ")[-1] if " - " in channel_name else channel_name
+
+            lineup.mark(channel_name, plan_name)  # Mark availability
+    return lineup
+
+def load_dish_plans(mode):
+    """Load the DishTV home page and read the plan menu, releasing the driver before the plan
+    pages need it.
+
+    Raises:
+        ValueError: If the menu lists no plans, so an incomplete page is retried rather than saved.
+    """
+    driver = load_page(mode, "DishTV", DISH_URL, provider="dish")
+    try:
+        plans = capture_dish_plans(driver)
+    finally:
+        release_driver(driver)
+    if not plans:
+        raise ValueError("No plans found in the DishTV menu")
+    return plans
+
+@traced("scrape", provider="dish", arg_tags={"zipcode": "zip"})
+def scrape_dishtv(mode="headless", zipcode=ZIPCODE):
+    """Scrapes live channel data from DishTV for a ZIP code.
+
+    The plan menu and each plan page are checkpointed steps: a rerun after a failure only
+    loads the pages that are still missing.
+    """
+    lineup = LineupResult("dish")
+    try:
+        with Checkpoint("dish", zipcode, SCRAPER_VERSION) as checkpoint:
+            plan_urls = checkpoint.run("plans", lambda: load_dish_plans(mode))
+            pages = capture_dish_pages(mode, plan_urls, zipcode, checkpoint=checkpoint)
+            snapshot = {"plans": plan_urls, "pages": pages}
+            save_snapshot(f"dish_{zipcode}", snapshot)
+
+            lineup = parse_dishtv(snapshot)
+            checkpoint.finish(lineup)
 
     except Exception as e:
         LOGGER.error(f"Error: {e}")
 
     finally:
-        driver.quit()
-        return all_channels, plans.keys()
\ No newline at end of file
+        return lineup
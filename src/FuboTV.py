@@ -1,11 +1,17 @@
-import os
-import pandas as pd
+import time
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from src.WebDriverUtils import ZIPCODE, OUTPUT_DIR, LOGGER, load_page, click_element, set_zipcode, extract_channel_data, write_to_excel
+from src.Checkpoint import Checkpoint
+from src.LineupResult import LineupResult
+from src.HtmlSnapshot import parse_table_html
+from src.Tracing import traced
+from src.WebDriverUtils import (ZIPCODE, API_CAPTURE, LOGGER, load_page, capture_json_responses,
+                                relocate_on_stale, get_page_load_time, capture_html, save_snapshot,
+                                release_driver)
 
 # Variables for flexibility
+SCRAPER_VERSION = 2
 FUBO_URL = "https://www.fubo.tv/welcome/plans"
 ZIP_INPUT_NAME = "zip-input"
 PLAN_CONTAINERS = {
@@ -19,69 +25,160 @@ CHANNELS_DIV_CLASS = "css-1tqzony"
 CHANNEL_CLASS = "css-d9cqmo"
 IMG_TAG = "img"
 CLOSE_POPUP_BUTTON_ARIA = "Close"
-OUTPUT_FILE = os.path.join(OUTPUT_DIR, "FuboTVChannelList.xlsx")
-
-def scrape_fubo_tv(mode="headless"):
-    """Scrapes live channel data from FuboTV."""
-    driver = load_page(mode, "FuboTV", FUBO_URL)
-    all_channels = {}
-    try:        
-        for plan, plan_id in PLAN_CONTAINERS.items():
-            LOGGER.info(f"Processing {plan} plan...")
-
-            # Reload the DOM to prevent stale element reference
-            driver.refresh()
-
-            #set_zipcode(driver, ZIPCODE, (By.NAME, ZIP_INPUT_NAME))
-            
-            # Re-locate plan container to prevent stale element reference
-            plan_container = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, f"//div[@data-testid='{plan_id}']"))
-            )
-
-            # Re-locate the "Learn More" button before clicking
-            click_element(driver, (By.CLASS_NAME, LEARN_MORE_BUTTON_CLASS), plan_container)
-            #click_element(driver, (By.XPATH, f"//button[@aria-label='Learn more']"), plan_container)
-            LOGGER.info("Learn more button clicked")
-
-            # Re-locate the "Show More" button before clicking
-            click_element(driver, (By.CLASS_NAME, SHOW_MORE_BUTTON_CLASS))
-            LOGGER.info("Show more button clicked")
-
-            channels = extract_channel_data(driver, (By.CLASS_NAME, CHANNELS_DIV_CLASS), (By.CLASS_NAME, CHANNEL_CLASS))
-            LOGGER.info(f"Extracted {len(channels)} channels for {plan}.")
-
-            # Store channel presence in dictionary
-            for channel in channels:
-                try:
-                    img_element = channel.find_element(By.TAG_NAME, "img")
-                    # Extract only the name after "-"
-                    channel_name = img_element.get_attribute('title')
-
-                    # Store channel in dictionary (mark available in this package)
-                    if channel_name not in all_channels:
-                        all_channels[channel_name] = {pkg: "" for pkg in PLAN_CONTAINERS.keys()}  # Initialize row
-                    all_channels[channel_name][plan] = "✔️"  # Mark availability
-                except Exception as e:
-                    LOGGER.info(f"Error extracting channel name: {e}")
-
-            # Re-locate and close the pop-up before moving to the next plan
-            close_button = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, f"//button[@aria-label='{CLOSE_POPUP_BUTTON_ARIA}']"))
-            )
-            click_element(driver, close_button)
-            LOGGER.info("Channel list closed")
-
-        # Convert dictionary to DataFrame
-        df_fubo_tv = pd.DataFrame.from_dict(all_channels, orient="index").reset_index()
-        df_fubo_tv.columns = ["Channel Name"] + list(PLAN_CONTAINERS.keys())
-
-        # Save to Excel in a single sheet
-        write_to_excel(df_fubo_tv, OUTPUT_FILE, sheet_name="FuboTV Channels", index=False)
+
+def click_now(driver, locator, container_id=None):
+    """Locate an element (inside a plan container, if given) and click it with JavaScript.
+
+    Unlike click_element, errors are raised so a stale node can be re-located and retried.
+    """
+    if container_id:
+        container = WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located((By.XPATH, f"//div[@data-testid='{container_id}']"))
+        )
+        element = container.find_element(*locator)
+    else:
+        element = WebDriverWait(driver, 20).until(EC.element_to_be_clickable(locator))
+    driver.execute_script("arguments[0].scrollIntoView({block: 'center'}); arguments[0].click();",
+                          element)
+
+def capture_fubo_plan(driver, plan, plan_id):
+    """Open one plan's channel list, capture its HTML and close it again.
+
+    Returns:
+        str: The channel list outerHTML.
+    """
+    LOGGER.info(f"Processing {plan} plan...")
+
+    # Each step finds its own node, so a stale element only repeats that step
+    relocate_on_stale(lambda: click_now(driver, (By.CLASS_NAME, LEARN_MORE_BUTTON_CLASS), plan_id))
+    LOGGER.info("Learn more button clicked")
+
+    relocate_on_stale(lambda: click_now(driver, (By.CLASS_NAME, SHOW_MORE_BUTTON_CLASS)))
+    LOGGER.info("Show more button clicked")
+
+    html = capture_html(driver, (By.CLASS_NAME, CHANNELS_DIV_CLASS))
+
+    # Close the pop-up and wait for it to go away so the next plan doesn't read this list
+    close_button = (By.XPATH, f"//button[@aria-label='{CLOSE_POPUP_BUTTON_ARIA}']")
+    relocate_on_stale(lambda: click_now(driver, close_button))
+    WebDriverWait(driver, 10).until(
+        EC.invisibility_of_element_located((By.CLASS_NAME, CHANNELS_DIV_CLASS))
+    )
+    LOGGER.info("Channel list closed")
+    return html
+
+@traced("capture", provider="fubo")
+def capture_fubo_tv(driver, checkpoint=None):
+    """Open each plan's channel list in turn and capture its HTML, all from one page load.
+
+    With a checkpoint, plans captured by an earlier run are reused, and a failed plan is
+    retried from a reloaded page. A plan that still fails is left out and the next plan
+    is captured from a reloaded page. The driver may be None if every plan is checkpointed.
+
+    Returns:
+        dict: Plan name -> channel list outerHTML.
+    """
+    started = time.perf_counter()
+    load_time = get_page_load_time(driver) if driver else None
+    refreshes = 0
+
+    def reload(attempt=None, error=None):
+        # A failed plan may leave its pop-up open; start the next attempt from a fresh page
+        nonlocal refreshes
+        refreshes += 1
+        driver.refresh()
+
+    pages = {}
+    for plan, plan_id in PLAN_CONTAINERS.items():
+        def operation():
+            return capture_fubo_plan(driver, plan, plan_id)
+
+        try:
+            if checkpoint:
+                pages[plan] = checkpoint.run(plan, operation, on_retry=reload)
+            else:
+                pages[plan] = operation()
+        except Exception as e:
+            LOGGER.error(f"Giving up on the {plan} plan: {e}")
+            reload()
+
+    elapsed = time.perf_counter() - started
+    restored = [plan for plan in pages
+                if checkpoint and checkpoint.provenance.get(plan, {}).get("source") == "checkpoint"]
+    captured = len(pages) - len(restored)
+    if driver is None:
+        LOGGER.info(f"Restored all {len(restored)} plans from checkpoint without loading the page")
+        return pages
+
+    # The previous flow loaded the page once per plan; this one loads it once plus any refreshes
+    skipped = len(PLAN_CONTAINERS) - refreshes
+    LOGGER.info(f"Captured {captured} plans in {elapsed:.1f}s "
+                f"({len(restored)} restored from checkpoint, {refreshes} refreshes)")
+    if load_time:
+        LOGGER.info(f"Skipped {skipped} reloads "
+                    f"(~{load_time * skipped:.1f}s at {load_time:.1f}s per load)")
+    else:
+        LOGGER.info(f"Skipped {skipped} reloads")
+    return pages
+
+@traced("parse", provider="fubo")
+def parse_fubo_tv(snapshot):
+    """Parse a FuboTV snapshot into per-channel plan availability.
+
+    Returns:
+        LineupResult: Channels and the plans they are available in.
+    """
+    # Plans that failed to load are left out rather than shown as empty
+    lineup = LineupResult("fubo", [plan for plan in PLAN_CONTAINERS if plan in snapshot])
+    for plan in lineup.plans:
+        html = snapshot.get(plan, "")
+        channels = parse_table_html(html, f".{CHANNEL_CLASS}", value_selector=IMG_TAG,
+                                    attribute="title")
+        LOGGER.info(f"Extracted {len(channels)} channels for {plan}.")
+
+        # Store channel presence in dictionary
+        for channel in channels:
+            channel_name = channel["value"]
+            if not channel_name:
+                LOGGER.info("Skipping channel without a logo title.")
+                continue
+
+            lineup.mark(channel_name, plan)  # Mark availability
+    return lineup
+
+@traced("scrape", provider="fubo", arg_tags={"zipcode": "zip"})
+def scrape_fubo_tv(mode="headless", zipcode=ZIPCODE):
+    """Scrapes live channel data from FuboTV for a ZIP code.
+
+    Fubo shows the same plans for every ZIP code; the ZIP only names the output. Each plan
+    is a checkpointed step: a rerun after a failure only opens the plans that are still missing,
+    and does not load the page at all if none are.
+    """
+    api_pattern = API_CAPTURE.get("fubo")
+    driver = None
+    lineup = LineupResult("fubo", PLAN_CONTAINERS.keys())
+    try:
+        with Checkpoint("fubo", zipcode, SCRAPER_VERSION) as checkpoint:
+            if any(checkpoint.get(plan) is None for plan in PLAN_CONTAINERS):
+                driver = load_page(mode, "FuboTV", FUBO_URL, capture_network=bool(api_pattern),
+                                   provider="fubo")
+            snapshot = capture_fubo_tv(driver, checkpoint)
+            if driver and api_pattern:
+                # Record the lineup JSON for offline study; the lineup itself is still
+                # parsed from the DOM
+                snapshot["api"] = capture_json_responses(driver, api_pattern)
+
+            # The browser is not needed once the DOM is captured
+            release_driver(driver)
+            driver = None
+            save_snapshot(f"fubo_{zipcode}", snapshot)
+
+            lineup = parse_fubo_tv(snapshot)
+            checkpoint.finish(lineup)
     
     except Exception as e:
         LOGGER.error(f"ERROR: {e}")
 
     finally:
-        driver.quit()
-        return all_channels, PLAN_CONTAINERS.keys()
\ No newline at end of file
+        release_driver(driver)
+        return lineup
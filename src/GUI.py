@@ -23,8 +23,14 @@ class ScraperGUI:
         # Output format selection
         ttk.Label(main_frame, text="Output Format:").grid(row=1, column=0, sticky=tk.W, pady=5)
         self.output_var = tk.StringVar(value="excel")
-        ttk.Radiobutton(main_frame, text="Excel", variable=self.output_var, value="excel").grid(row=1, column=1, sticky=tk.W)
-        ttk.Radiobutton(main_frame, text="CSV", variable=self.output_var, value="csv").grid(row=1, column=2, sticky=tk.W)
+        ttk.Radiobutton(main_frame, text="Excel", variable=self.output_var,
+                        value="excel").grid(row=1, column=1, sticky=tk.W)
+        ttk.Radiobutton(main_frame, text="CSV", variable=self.output_var,
+                        value="csv").grid(row=1, column=2, sticky=tk.W)
+        ttk.Radiobutton(main_frame, text="JSON Lines", variable=self.output_var,
+                        value="jsonl").grid(row=1, column=3, sticky=tk.W)
+        ttk.Radiobutton(main_frame, text="Parquet", variable=self.output_var,
+                        value="parquet").grid(row=1, column=4, sticky=tk.W)
         
         # Provider selection
         ttk.Label(main_frame, text="Select Providers:").grid(row=2, column=0, sticky=tk.W, pady=5)
@@ -0,0 +1,301 @@
+import re
+from html.parser import HTMLParser
+from typing import List, Dict, Any, Optional, Union
+
+# Elements that never have children or an end tag
+VOID_ELEMENTS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+}
+# Elements whose text is never rendered
+HIDDEN_TEXT_ELEMENTS = {"script", "style", "template", "noscript"}
+# Elements rendered on their own line (or cell), so innerText separates their text from the text
+# around them; inline elements like <b> or <sup> run into their neighbors
+BLOCK_ELEMENTS = {
+    "address", "article", "aside", "blockquote", "caption", "dd", "details", "dialog", "div",
+    "dl", "dt", "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4",
+    "h5", "h6", "header", "hr", "li", "main", "nav", "ol", "option", "p", "pre", "section",
+    "summary", "table", "tbody", "td", "tfoot", "th", "thead", "tr", "ul",
+}
+
+class Element:
+    """A parsed HTML element with just enough of the DOM API for lineup parsing."""
+
+    __slots__ = ("tag", "attrs", "children", "parent")
+
+    def __init__(self, tag: str, attrs: Dict[str, str], parent: Optional["Element"] = None):
+        self.tag = tag
+        self.attrs = attrs
+        self.children: List[Union["Element", str]] = []
+        self.parent = parent
+
+    @property
+    def classes(self) -> List[str]:
+        return self.attrs.get("class", "").split()
+
+    def get(self, attribute: str) -> Optional[str]:
+        """Return an attribute value, or None if the element doesn't have it."""
+        return self.attrs.get(attribute)
+
+    def iter_descendants(self):
+        """Yield all descendant elements in document order."""
+        for child in self.children:
+            if isinstance(child, Element):
+                yield child
+                yield from child.iter_descendants()
+
+    def element_children(self) -> List["Element"]:
+        return [child for child in self.children if isinstance(child, Element)]
+
+    def text(self) -> str:
+        """Return the element's text with whitespace collapsed, similar to innerText.
+
+        Text of inline elements joins its neighbors directly (``ESPN<sup>2</sup>`` reads
+        "ESPN2"); block elements and ``<br>`` are separated by a space.
+        """
+        parts = []
+        self._collect_text(parts)
+        return " ".join("".join(parts).split())
+
+    def _collect_text(self, parts: List[str]) -> None:
+        for child in self.children:
+            if isinstance(child, str):
+                parts.append(child)
+            elif child.tag == "br":
+                parts.append("\n")
+            elif child.tag in BLOCK_ELEMENTS:
+                parts.append("\n")
+                child._collect_text(parts)
+                parts.append("\n")
+            elif child.tag not in HIDDEN_TEXT_ELEMENTS:
+                child._collect_text(parts)
+
+    def select(self, selector: str) -> List["Element"]:
+        """Return all descendants matching a CSS selector, in document order.
+
+        Supports type, ``*``, ``.class``, ``#id`` and ``[attr]``/``[attr=v]``/``[attr*=v]``/
+        ``[attr^=v]``/``[attr$=v]`` selectors, the descendant and ``>`` combinators,
+        selector lists and a leading ``:scope``.
+        """
+        compiled = compile_selector(selector)
+        return [el for el in self.iter_descendants()
+                if any(_matches(el, steps, len(steps) - 1, self) for steps in compiled)]
+
+    def select_one(self, selector: str) -> Optional["Element"]:
+        """Return the first descendant matching a CSS selector, or None."""
+        compiled = compile_selector(selector)
+        for el in self.iter_descendants():
+            if any(_matches(el, steps, len(steps) - 1, self) for steps in compiled):
+                return el
+        return None
+
+    def __repr__(self):
+        return f"<Element {self.tag} {self.attrs}>"
+
+class _TreeBuilder(HTMLParser):
+    """Build an Element tree with the standard library HTML parser."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Element("#document", {})
+        self.current = self.root
+
+    def handle_starttag(self, tag, attrs):
+        attributes = {name: (value if value is not None else "") for name, value in attrs}
+        element = Element(tag, attributes, self.current)
+        self.current.children.append(element)
+        if tag not in VOID_ELEMENTS:
+            self.current = element
+
+    def handle_startendtag(self, tag, attrs):
+        attributes = {name: (value if value is not None else "") for name, value in attrs}
+        element = Element(tag, attributes, self.current)
+        self.current.children.append(element)
+
+    def handle_endtag(self, tag):
+        # Close up to the matching open element; ignore stray end tags
+        node = self.current
+        while node is not self.root and node.tag != tag:
+            node = node.parent
+        if node is not self.root:
+            self.current = node.parent
+
+    def handle_data(self, data):
+        self.current.children.append(data)
+
+def parse_html(html: str) -> Element:
+    """Parse an HTML string into an Element tree.
+
+    Parameters:
+        html (str): A full page source or an element's outerHTML.
+
+    Returns:
+        Element: The document root; its children are the top-level elements.
+    """
+    builder = _TreeBuilder()
+    builder.feed(html or "")
+    builder.close()
+    return builder.root
+
+_SIMPLE_SELECTOR_RE = re.compile(
+    r"""(?P<tag>\*|[a-zA-Z][\w-]*)"""
+    r"""|\.(?P<cls>[\w-]+)"""
+    r"""|\#(?P<id>[\w-]+)"""
+    r"""|\[\s*(?P<attr>[\w:-]+)\s*"""
+    r"""(?:(?P<op>[*^$]?=)\s*(?P<quote>['"]?)(?P<val>.*?)(?P=quote))?\s*\]"""
+    r"""|(?P<scope>:scope)"""
+)
+
+class _Compound:
+    """One compound selector (e.g. ``div.row[data-id]``) and the combinator to its left."""
+
+    __slots__ = ("tag", "classes", "ids", "attrs", "scope", "combinator")
+
+    def __init__(self):
+        self.tag = None
+        self.classes = []
+        self.ids = []
+        self.attrs = []
+        self.scope = False
+        self.combinator = " "
+
+    def matches(self, element: Element, scope: Element) -> bool:
+        if self.scope and element is not scope:
+            return False
+        if self.tag and self.tag != "*" and element.tag != self.tag:
+            return False
+        if self.classes:
+            element_classes = element.classes
+            if any(cls not in element_classes for cls in self.classes):
+                return False
+        if any(element.get("id") != element_id for element_id in self.ids):
+            return False
+        for name, op, value in self.attrs:
+            actual = element.get(name)
+            if actual is None:
+                return False
+            if op == "=" and actual != value:
+                return False
+            if op == "*=" and value not in actual:
+                return False
+            if op == "^=" and not actual.startswith(value):
+                return False
+            if op == "$=" and not actual.endswith(value):
+                return False
+        return True
+
+_selector_cache: Dict[str, List[List[_Compound]]] = {}
+
+def compile_selector(selector: str) -> List[List[_Compound]]:
+    """Compile a CSS selector list into compound steps, caching the result.
+
+    Raises:
+        ValueError: If the selector uses syntax that isn't supported.
+    """
+    compiled = _selector_cache.get(selector)
+    if compiled is not None:
+        return compiled
+
+    compiled = []
+    for part in selector.split(","):
+        steps = []
+        combinator = " "
+        position = 0
+        part = part.strip()
+        while position < len(part):
+            char = part[position]
+            if char.isspace():
+                position += 1
+                continue
+            if char == ">":
+                combinator = ">"
+                position += 1
+                continue
+            compound = _Compound()
+            compound.combinator = combinator
+            combinator = " "
+            while position < len(part):
+                match = _SIMPLE_SELECTOR_RE.match(part, position)
+                if not match or match.end() == position:
+                    break
+                if match.group("tag"):
+                    compound.tag = match.group("tag").lower()
+                elif match.group("cls"):
+                    compound.classes.append(match.group("cls"))
+                elif match.group("id"):
+                    compound.ids.append(match.group("id"))
+                elif match.group("attr"):
+                    compound.attrs.append((match.group("attr").lower(), match.group("op"),
+                                           match.group("val")))
+                else:
+                    compound.scope = True
+                position = match.end()
+            if position < len(part) and not part[position].isspace() and part[position] != ">":
+                raise ValueError(f"Unsupported selector: {selector!r}")
+            steps.append(compound)
+        if not steps:
+            raise ValueError(f"Empty selector: {selector!r}")
+        compiled.append(steps)
+
+    _selector_cache[selector] = compiled
+    return compiled
+
+def _matches(element: Element, steps: List[_Compound], index: int, scope: Element) -> bool:
+    """Match ``steps[:index + 1]`` right to left, starting at ``element``."""
+    step = steps[index]
+    if not step.matches(element, scope):
+        return False
+    if index == 0:
+        return True
+    parent = element.parent
+    if step.combinator == ">":
+        return parent is not None and _matches(parent, steps, index - 1, scope)
+    while parent is not None:
+        if _matches(parent, steps, index - 1, scope):
+            return True
+        parent = parent.parent
+    return False
+
+def parse_table_html(html: str, row_selector: str, value_selector: Optional[str] = None,
+                     attribute: Optional[str] = None, cell_selector: Optional[str] = None,
+                     info_selector: Optional[str] = None,
+                     flag_selectors: tuple = ()) -> List[Dict[str, Any]]:
+    """Extract every row of a table or list from a captured container (its outerHTML).
+
+    Works for both table-style lineups (channel info in the first cell, one cell per plan)
+    and list-style lineups (one value per item, e.g. an image ``alt`` or a label's text).
+
+    Parameters:
+        html (str): The container's outerHTML.
+        row_selector (str): Selector for the rows/items inside the container.
+        value_selector (Optional[str]): Selector for the element holding the row value, or None
+            for the row itself.
+        attribute (Optional[str]): Attribute to read as the value, or None for the element's text.
+        cell_selector (Optional[str]): Selector for the row cells (e.g. 'td' or ':scope > div').
+        info_selector (Optional[str]): Selector for the text elements inside the first cell.
+        flag_selectors (tuple): Selectors that must all match inside a cell for its flag to be True.
+
+    Returns:
+        List[Dict[str, Any]]: One dict per row with 'value', 'info' and 'flags'.
+    """
+    root = parse_html(html)
+    containers = root.element_children()
+    if not containers:
+        return []
+    container = containers[0]
+
+    rows = []
+    for row in container.select(row_selector):
+        target = row.select_one(value_selector) if value_selector else row
+        if target is None:
+            value = None
+        else:
+            value = target.get(attribute) if attribute else target.text()
+            value = value.strip() if isinstance(value, str) else value
+        cells = row.select(cell_selector) if cell_selector else []
+        info = ([el.text() for el in cells[0].select(info_selector)]
+                if cells and info_selector else [])
+        flags = [all(cell.select_one(sel) is not None for sel in flag_selectors)
+                 for cell in cells[1:]]
+        rows.append({"value": value, "info": info, "flags": flags})
+    return rows
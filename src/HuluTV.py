@@ -1,43 +1,65 @@
-import os
-import pandas as pd
 from selenium.webdriver.common.by import By
-from src.WebDriverUtils import ZIPCODE, OUTPUT_DIR, LOGGER, extract_channel_data, load_page, click_element, set_zipcode, write_to_excel
+from src.LineupResult import LineupResult
+from src.HtmlSnapshot import parse_table_html
+from src.Tracing import traced
+from src.WebDriverUtils import (ZIPCODE, LOGGER, capture_html, save_snapshot, load_page,
+                                click_element, set_zipcode, release_driver)
 
 # Variables for flexibility
+SCRAPER_VERSION = 2
 HULU_URL = "https://www.hulu.com/welcome"
 VIEW_CHANNELS_BUTTON_CLASS = "Billboard__modalLink"
 ZIP_INPUT_ID = "zipcode-input"
 ZIP_SUBMIT_CLASS = "submit-button"
 CHANNELS_DIV_CLASS = "channels-container"
 SPAN_CLASS = "NetworkIcon__network-name-invisible"
-OUTPUT_FILE = os.path.join(OUTPUT_DIR, "HuluTVChannelList.xlsx")
 
-def scrape_hulu_tv(mode="headless"):
-    """Scrapes live channel data from HuluTV."""
-    driver = load_page(mode, "HuluTV", HULU_URL)
+@traced("capture", provider="hulu")
+def capture_hulu_tv(driver, zipcode=ZIPCODE):
+    """Open the channel list for the configured ZIP code and capture its HTML.
 
-    try:
-        # Locate and click the "View Channels" button
-        click_element(driver, (By.CLASS_NAME, VIEW_CHANNELS_BUTTON_CLASS))
-        LOGGER.info("Opened Channel Plans window...")
-        
-        # Set to specified zipcode
-        set_zipcode(driver, ZIPCODE, (By.ID, ZIP_INPUT_ID), (By.CLASS_NAME, ZIP_SUBMIT_CLASS))
+    Returns:
+        dict: The channel container outerHTML.
+    """
+    # Locate and click the "View Channels" button
+    click_element(driver, (By.CLASS_NAME, VIEW_CHANNELS_BUTTON_CLASS))
+    LOGGER.info("Opened Channel Plans window...")
+
+    # Set to specified zipcode
+    set_zipcode(driver, zipcode, (By.ID, ZIP_INPUT_ID), (By.CLASS_NAME, ZIP_SUBMIT_CLASS))
+
+    return {"channels": capture_html(driver, (By.CLASS_NAME, CHANNELS_DIV_CLASS))}
 
-        channels = extract_channel_data(driver, (By.CLASS_NAME, CHANNELS_DIV_CLASS), (By.CLASS_NAME, SPAN_CLASS))
-        LOGGER.info(f"Extracted {len(channels)} channels for HuluTV.")
+@traced("parse", provider="hulu")
+def parse_hulu_tv(snapshot):
+    """Parse a HuluTV snapshot into its channel lineup."""
+    channels = parse_table_html(snapshot["channels"], f".{SPAN_CLASS}")
+    LOGGER.info(f"Extracted {len(channels)} channels for HuluTV.")
 
-        # Extract the text from each span element
-        channel_names = [span.get_attribute("innerText").strip() for span in channels]
+    # Extract the text from each span element
+    lineup = LineupResult("hulu")
+    for span in channels:
+        if span["value"]:
+            lineup.add(span["value"])
+    return lineup
+
+@traced("scrape", provider="hulu", arg_tags={"zipcode": "zip"})
+def scrape_hulu_tv(mode="headless", zipcode=ZIPCODE):
+    """Scrapes live channel data from HuluTV for a ZIP code."""
+    driver = load_page(mode, "HuluTV", HULU_URL, provider="hulu")
+    lineup = LineupResult("hulu")
+    try:
+        snapshot = capture_hulu_tv(driver, zipcode)
 
-        # Convert data to dataframe
-        df_hulu_tv = pd.DataFrame(channel_names, columns=["Channel Name"])
+        # The browser is not needed once the DOM is captured
+        release_driver(driver)
+        driver = None
+        save_snapshot(f"hulu_{zipcode}", snapshot)
 
-        # Save to excel with formatting
-        write_to_excel(df_hulu_tv, OUTPUT_FILE, sheet_name="HuluTV Channels")
-        return channel_names
+        lineup = parse_hulu_tv(snapshot)
     except Exception as e:
         LOGGER.error(f"Error: {e}")
 
     finally:
-        driver.quit()
\ No newline at end of file
+        release_driver(driver)
+        return lineup
@@ -0,0 +1,210 @@
+import argparse
+import os
+import sqlite3
+import sys
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, Optional, Tuple
+from src.WebDriverUtils import OUTPUT_DIR, LOGGER
+
+# Variables for flexibility
+HISTORY_FILE = os.path.join(OUTPUT_DIR, "lineup_history.sqlite")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    started_at TEXT NOT NULL
+);
+-- Which (ZIP, provider) pairs each run actually scraped, so a failed scrape isn't read as
+-- dropping everything
+CREATE TABLE IF NOT EXISTS run_providers (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    zipcode TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    PRIMARY KEY (run_id, zipcode, provider)
+) WITHOUT ROWID;
+-- One row per channel and plan; plan is '' for providers without plans or channels in no plan
+CREATE TABLE IF NOT EXISTS lineups (
+    run_id INTEGER NOT NULL REFERENCES runs (run_id),
+    zipcode TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    plan TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    PRIMARY KEY (run_id, zipcode, provider, plan, channel)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS lineups_by_channel ON lineups (provider, channel, run_id);
+"""
+
+class LineupHistory:
+    """Append-only SQLite store of every run's normalized lineups.
+
+    Runs are only ever added, and change queries run inside SQLite (EXCEPT over two runs),
+    so answering them doesn't read the rest of the history.
+    """
+
+    def __init__(self, path: str = HISTORY_FILE):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def record_run(self, results_by_zip: Dict[str, Dict[str, object]],
+                   normalize: Optional[Callable[[str, str], str]] = None,
+                   started_at: Optional[str] = None) -> int:
+        """Append one run's results.
+
+        Parameters:
+            results_by_zip: Dictionary of ZIP code -> {provider: LineupResult}. Empty results
+                (failed scrapes) are left out.
+            normalize: Optional function (channel name, provider) -> canonical name.
+            started_at: ISO timestamp of the run; defaults to now (UTC).
+
+        Returns:
+            int: The new run's id.
+        """
+        started_at = started_at or datetime.now(timezone.utc).isoformat(timespec="seconds")
+        with self.conn:
+            run_id = self.conn.execute("INSERT INTO runs (started_at) VALUES (?)",
+                                       (started_at,)).lastrowid
+            for zipcode, results in results_by_zip.items():
+                for provider, lineup in results.items():
+                    if not lineup:
+                        continue
+                    self.conn.execute("INSERT INTO run_providers VALUES (?, ?, ?)",
+                                      (run_id, zipcode, provider))
+                    self.conn.executemany(
+                        "INSERT OR IGNORE INTO lineups VALUES (?, ?, ?, ?, ?)",
+                        ((run_id, zipcode, provider, plan, channel)
+                         for plan, channel in self._rows(provider, lineup, normalize)),
+                    )
+        LOGGER.info(f"Recorded run {run_id} in lineup history")
+        return run_id
+
+    @staticmethod
+    def _rows(provider, lineup, normalize) -> Iterator[Tuple[str, str]]:
+        for channel, mask in zip(lineup.channels, lineup.masks):
+            name = normalize(channel, provider) if normalize else channel
+            plans = [plan for i, plan in enumerate(lineup.plans) if mask >> i & 1]
+            for plan in plans or [""]:
+                yield plan, name
+
+    def runs(self) -> Iterator[Tuple[int, str, int]]:
+        """Yield (run id, start time, number of lineup rows) for every run, oldest first."""
+        yield from self.conn.execute(
+            "SELECT run_id, started_at,"
+            " (SELECT COUNT(*) FROM lineups WHERE lineups.run_id = runs.run_id) "
+            "FROM runs ORDER BY run_id"
+        )
+
+    def resolve_run(self, run: str) -> int:
+        """Turn a run id, 'latest' or 'previous' into a run id.
+
+        Raises:
+            ValueError: If there is no such run.
+        """
+        if run in ("latest", "previous"):
+            rows = self.conn.execute(
+                "SELECT run_id FROM runs ORDER BY run_id DESC LIMIT 2"
+            ).fetchall()
+            index = 0 if run == "latest" else 1
+            if len(rows) <= index:
+                raise ValueError(f"Not enough runs recorded for '{run}'")
+            return rows[index][0]
+        row = self.conn.execute("SELECT run_id FROM runs WHERE run_id = ?", (int(run),)).fetchone()
+        if row is None:
+            raise ValueError(f"No run {run}")
+        return row[0]
+
+    def changes(self, old_run: int, new_run: int, provider: Optional[str] = None,
+                zipcode: Optional[str] = None) -> Iterator[Tuple[str, str, str, str, str]]:
+        """Yield ('added' or 'removed', ZIP code, provider, plan, channel) between two runs.
+
+        Only (ZIP, provider) pairs scraped successfully in both runs are compared.
+        """
+        filters, params = "", []
+        if provider:
+            filters += " AND provider = ?"
+            params.append(provider)
+        if zipcode:
+            filters += " AND zipcode = ?"
+            params.append(zipcode)
+        side = ("SELECT zipcode, provider, plan, channel FROM lineups WHERE run_id = ?{filters}"
+                " AND (zipcode, provider) IN"
+                " (SELECT zipcode, provider FROM run_providers WHERE run_id = ?)")
+        for change, first, second in (("added", new_run, old_run), ("removed", old_run, new_run)):
+            query = (side.format(filters=filters) + " EXCEPT " + side.format(filters=filters)
+                     + " ORDER BY provider, zipcode, plan, channel")
+            for row in self.conn.execute(query, [first, *params, second, second, *params, first]):
+                yield (change, *row)
+
+    def timeline(self, provider: str, channel: str,
+                 zipcode: Optional[str] = None) -> Iterator[Tuple[int, str, bool]]:
+        """Yield (run id, start time, listed) for every run that scraped the provider, oldest
+        first."""
+        zip_filter = " AND zipcode = ?" if zipcode else ""
+        zip_params = [zipcode] if zipcode else []
+        params = [provider, channel] + zip_params + [provider] + zip_params
+        yield from (
+            (run_id, started_at, bool(listed)) for run_id, started_at, listed in self.conn.execute(
+                "SELECT run_id, started_at,"
+                " EXISTS (SELECT 1 FROM lineups WHERE lineups.run_id = runs.run_id"
+                f" AND provider = ? AND channel = ?{zip_filter})"
+                " FROM runs WHERE run_id IN (SELECT run_id FROM run_providers WHERE provider = ?"
+                f"{zip_filter}) ORDER BY run_id",
+                params,
+            )
+        )
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Query the lineup history")
+    parser.add_argument("--db", default=HISTORY_FILE,
+                        help=f"History database (default: {HISTORY_FILE})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("runs", help="List recorded runs")
+    diff = commands.add_parser("diff", help="Channels added and removed between two runs")
+    diff.add_argument("old", nargs="?", default="previous", help="Older run id (default: previous)")
+    diff.add_argument("new", nargs="?", default="latest", help="Newer run id (default: latest)")
+    diff.add_argument("--provider", help="Only this provider (e.g. 'directv')")
+    diff.add_argument("--zipcode", help="Only this ZIP code")
+    timeline = commands.add_parser("timeline", help="When a provider listed a channel")
+    timeline.add_argument("provider", help="Provider name (e.g. 'sling')")
+    timeline.add_argument("channel", help="Canonical channel name, as in the summary")
+    timeline.add_argument("--zipcode", help="Only this ZIP code")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        parser.error(f"No lineup history at {args.db}")
+    with LineupHistory(args.db) as history:
+        if args.command == "runs":
+            for run_id, started_at, rows in history.runs():
+                print(f"{run_id:>5}  {started_at}  {rows} rows")
+        elif args.command == "diff":
+            try:
+                old_run, new_run = history.resolve_run(args.old), history.resolve_run(args.new)
+            except ValueError as e:
+                parser.error(str(e))
+            count = 0
+            changes = history.changes(old_run, new_run, args.provider, args.zipcode)
+            for change, zipcode, provider, plan, channel in changes:
+                sign = "+" if change == "added" else "-"
+                print(f"{sign} {provider:<14} {zipcode}  {plan or '-':<24} {channel}")
+                count += 1
+            print(f"{count} changes between run {old_run} and run {new_run}")
+        else:
+            previous = None
+            timeline = history.timeline(args.provider, args.channel.strip().lower(), args.zipcode)
+            for run_id, started_at, listed in timeline:
+                if listed != previous:
+                    print(f"{run_id:>5}  {started_at}  {'listed' if listed else 'not listed'}")
+                previous = listed
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+import pandas as pd
+
+CHECK_MARK = "✔️"
+
+def typed_numbers(numbers: Iterable[Optional[str]]) -> pd.Series:
+    """Channel numbers as nullable integers, or as strings if any of them isn't a plain number."""
+    series = pd.Series(list(numbers), dtype="string")  # None and NaN become <NA>
+    if series.dropna().str.fullmatch(r"\d+").all():
+        return series.astype("Int64")
+    return series
+
+class LineupResult:
+    """One provider's channel lineup, as returned by every scraper.
+
+    Channel names are interned, and plan membership is kept as one int bitmask per row
+    (bit ``i`` set means the channel is in ``plans[i]``), so large lineups stay small and
+    cheap to pickle. Check marks are only produced when rendering a DataFrame.
+    Providers without plans (Hulu, YouTube) have an empty ``plans`` list; being listed
+    is what counts. A result with no channels is falsy, which is how failed scrapes show up.
+    Scrapers that work in checkpointed steps record each step's origin in ``provenance``
+    (see Checkpoint); a result missing failed steps is not ``complete``.
+    """
+
+    __slots__ = ("provider", "plans", "channels", "numbers", "masks", "provenance", "_rows")
+
+    def __init__(self, provider: str, plans: Iterable[str] = ()):
+        self.provider = provider
+        self.plans: List[str] = list(plans)
+        self.channels: List[str] = []
+        self.numbers: List[Optional[str]] = []
+        self.masks: List[int] = []
+        # Step -> source, attempts, completed_at or error
+        self.provenance: Dict[str, Dict[str, Any]] = {}
+        self._rows = {}  # Channel name -> index of its first row
+
+    def add(self, channel: str, flags: Iterable[bool] = (), number: Optional[str] = None) -> int:
+        """Append a row, with flags aligned to ``plans``.
+
+        Returns:
+            int: The new row's index.
+        """
+        channel = sys.intern(channel)
+        mask = 0
+        for i, included in enumerate(flags):
+            if included:
+                mask |= 1 << i
+        self.channels.append(channel)
+        self.numbers.append(number)
+        self.masks.append(mask)
+        self._rows.setdefault(channel, len(self.channels) - 1)
+        return len(self.channels) - 1
+
+    def mark(self, channel: str, plan: str) -> None:
+        """Mark a channel as available in a plan, adding the channel if it isn't listed yet."""
+        row = self._rows.get(channel)
+        if row is None:
+            row = self.add(channel)
+        self.masks[row] |= 1 << self.plans.index(plan)
+
+    def row(self, channel: str) -> Optional[int]:
+        """Return the index of a channel's first row, or None if it isn't listed."""
+        return self._rows.get(channel)
+
+    def in_plan(self, row: int, plan_index: int) -> bool:
+        return bool(self.masks[row] >> plan_index & 1)
+
+    @property
+    def complete(self) -> bool:
+        """False if some steps of the scrape failed and the lineup only covers the others."""
+        return all(record["source"] != "failed" for record in self.provenance.values())
+
+    @property
+    def has_numbers(self) -> bool:
+        return any(number is not None for number in self.numbers)
+
+    def to_dataframe(self, mark: Optional[str] = CHECK_MARK, sort: bool = False) -> pd.DataFrame:
+        """Render the lineup as 'Channel Name', optional 'Channel Number' and one column per plan.
+
+        With ``mark=None`` plan columns are booleans and channel numbers are typed (see
+        typed_numbers), for columnar output; otherwise plans show ``mark`` or '' and numbers
+        stay as scraped.
+        """
+        data = {"Channel Name": self.channels}
+        if self.has_numbers:
+            data["Channel Number"] = typed_numbers(self.numbers) if mark is None else self.numbers
+        for i, plan in enumerate(self.plans):
+            if mark is None:
+                data[plan] = [bool(mask >> i & 1) for mask in self.masks]
+            else:
+                data[plan] = [mark if mask >> i & 1 else "" for mask in self.masks]
+        df = pd.DataFrame(data, columns=list(data))
+        return df.sort_values(by=["Channel Name"]) if sort else df
+
+    def __len__(self) -> int:
+        return len(self.channels)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.channels)
+
+    def __contains__(self, channel) -> bool:
+        return channel in self._rows
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, LineupResult):
+            return NotImplemented
+        return (self.provider, self.plans, self.channels, self.numbers, self.masks) == \
+            (other.provider, other.plans, other.channels, other.numbers, other.masks)
+
+    def __getstate__(self):
+        return (self.provider, self.plans, self.channels, self.numbers, self.masks, self.provenance)
+
+    def __setstate__(self, state):
+        self.provider, self.plans, channels, self.numbers, self.masks = state[:5]
+        # Results cached before provenance was kept have no sixth item
+        self.provenance = state[5] if len(state) > 5 else {}
+        # Unpickled strings aren't interned
+        self.channels = [sys.intern(channel) for channel in channels]
+        self._rows = {}
+        for i, channel in enumerate(self.channels):
+            self._rows.setdefault(channel, i)
+
+    def __repr__(self):
+        return f"<LineupResult {self.provider}: {len(self.channels)} channels, plans={self.plans}>"
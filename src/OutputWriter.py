@@ -0,0 +1,125 @@
+import importlib.util
+import os
+import queue
+import threading
+from typing import Optional
+from src.LineupResult import CHECK_MARK, LineupResult
+from src.Tracing import span
+from src.WebDriverUtils import LOGGER, write_to_csv, write_to_jsonl, write_to_parquet
+from src.WorkbookWriter import WorkbookWriter
+
+# Variables for flexibility
+OUTPUT_FORMATS = ("excel", "csv", "parquet", "jsonl")
+# Boolean plan columns and typed channel numbers instead of check marks
+TYPED_FORMATS = ("parquet", "jsonl")
+FILE_EXTENSIONS = {"csv": ".csv", "parquet": ".parquet", "jsonl": ".jsonl"}
+
+_STOP = object()  # Queued by close() to end the writer thread
+
+def parquet_available() -> bool:
+    """Whether pyarrow, which pandas needs to write Parquet, is installed."""
+    return importlib.util.find_spec("pyarrow") is not None
+
+_FILE_WRITERS = {"csv": write_to_csv, "parquet": write_to_parquet, "jsonl": write_to_jsonl}
+
+class OutputWriter:
+    """Writes a run's output files on a background thread.
+
+    Lineups are handed over as each scrape finishes and written while the other scrapers
+    are still running; nothing waits on file I/O except flush() and close(). Excel output
+    goes into one streaming workbook (see WorkbookWriter); CSV, Parquet and JSON Lines output
+    into one file per sheet next to ``output_path``. Parquet and JSON Lines lineups have
+    boolean plan columns and typed channel numbers.
+    """
+
+    def __init__(self, output_path: str, output_format: str = "excel"):
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {output_format}")
+        self.output_path = output_path
+        self.output_format = output_format
+        self.directory = os.path.dirname(output_path) or "."
+        self.workbook: Optional[WorkbookWriter] = None
+        self.failures = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="OutputWriter", daemon=True)
+        self._thread.start()
+
+    def write_lineup(self, sheet_name: str, lineup: LineupResult) -> None:
+        """Queue a provider's lineup; empty results (failed scrapes) are skipped."""
+        if lineup:
+            self._queue.put(("lineup", sheet_name, lineup, False, None))
+
+    def write_sheet(self, sheet_name: str, df, active: bool = False,
+                    file_name: Optional[str] = None) -> None:
+        """Queue a DataFrame sheet.
+
+        Parameters:
+            sheet_name (str): Sheet name in the workbook.
+            df: The DataFrame to write.
+            active (bool): Open the workbook on this sheet.
+            file_name (Optional[str]): File name without extension for file-per-sheet formats;
+                defaults to the sheet name.
+        """
+        self._queue.put(("sheet", sheet_name, df, active, file_name))
+
+    def flush(self) -> bool:
+        """Wait until everything queued so far is written.
+
+        Returns:
+            bool: True if every write so far succeeded.
+        """
+        self._queue.join()
+        return self.failures == 0
+
+    def close(self) -> bool:
+        """Write what is still queued, finish the workbook and stop the thread.
+
+        Returns:
+            bool: True if every write succeeded and the output files are complete.
+        """
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        if self.workbook is not None:
+            # Zipping the streamed sheets into the .xlsx happens here
+            with span("write_excel", sheet="(close)"):
+                if not self.workbook.close():
+                    self.failures += 1
+            self.workbook = None
+        return self.failures == 0
+
+    def _run(self) -> None:
+        while True:
+            task = self._queue.get()
+            try:
+                if task is _STOP:
+                    return
+                with span(f"write_{self.output_format}", sheet=task[1]):
+                    self._write(*task)
+            except Exception as e:
+                self.failures += 1
+                LOGGER.error(f"Error writing {task[1]}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, kind, sheet_name, data, active, file_name) -> None:
+        if self.output_format == "excel":
+            if self.workbook is None:
+                self.workbook = WorkbookWriter(self.output_path)
+            if kind == "lineup":
+                self.workbook.add_lineup(sheet_name, data, active=active)
+            else:
+                self.workbook.add_dataframe(sheet_name, data, active=active)
+        else:
+            if kind == "lineup":
+                mark = None if self.output_format in TYPED_FORMATS else CHECK_MARK
+                data = data.to_dataframe(mark=mark, sort=True)
+            file_name = ((file_name or sheet_name).replace(" ", "_")
+                         + FILE_EXTENSIONS[self.output_format])
+            _FILE_WRITERS[self.output_format](data, os.path.join(self.directory, file_name))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
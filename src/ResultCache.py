@@ -0,0 +1,76 @@
+import os
+import pickle
+import sqlite3
+import time
+from typing import Any, Optional
+from src.WebDriverUtils import OUTPUT_DIR, LOGGER
+
+# Variables for flexibility
+CACHE_FILE = os.path.join(OUTPUT_DIR, "results_cache.sqlite")
+
+class ResultCache:
+    """SQLite store of scraper results keyed by provider, ZIP code and scraper version.
+
+    Each scraper module has a SCRAPER_VERSION; bumping it when a scraper's output changes
+    makes older entries unreachable, so they are scraped again.
+    """
+
+    def __init__(self, path: str = CACHE_FILE):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " provider TEXT NOT NULL, zipcode TEXT NOT NULL, version INTEGER NOT NULL,"
+            " scraped_at REAL NOT NULL, result BLOB NOT NULL,"
+            " PRIMARY KEY (provider, zipcode, version))"
+        )
+        self.conn.commit()
+
+    def get(self, provider: str, zipcode: str, version: int,
+            max_age: Optional[float] = None) -> Optional[Any]:
+        """Return a cached result, or None if there is none or it is too old.
+
+        Parameters:
+            provider (str): Provider name, e.g. 'directv'.
+            zipcode (str): ZIP code the result was scraped for.
+            version (int): The scraper's SCRAPER_VERSION.
+            max_age (Optional[float]): Maximum age in seconds, or None to accept any age.
+        """
+        row = self.conn.execute(
+            "SELECT scraped_at, result FROM results"
+            " WHERE provider = ? AND zipcode = ? AND version = ?",
+            (provider, zipcode, version),
+        ).fetchone()
+        if row is None:
+            return None
+        scraped_at, blob = row
+        age = time.time() - scraped_at
+        if max_age is not None and age > max_age:
+            LOGGER.info(f"Cached {provider} result for {zipcode} is stale ({age / 3600:.1f}h old)")
+            return None
+        try:
+            result = pickle.loads(blob)
+        except Exception as e:
+            LOGGER.warning(f"Discarding unreadable cached {provider} result for {zipcode}: {e}")
+            return None
+        LOGGER.info(f"Using cached {provider} result for {zipcode} ({age / 3600:.1f}h old)")
+        return result
+
+    def put(self, provider: str, zipcode: str, version: int, result: Any) -> None:
+        """Store a result, replacing any earlier entry for the same key."""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO results (provider, zipcode, version, scraped_at, result)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (provider, zipcode, version, time.time(),
+             pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)),
+        )
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
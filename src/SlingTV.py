@@ -1,9 +1,12 @@
-import os
-import pandas as pd
 from selenium.webdriver.common.by import By
-from src.WebDriverUtils import ZIPCODE, OUTPUT_DIR, LOGGER, load_page, click_element, set_zipcode, extract_channel_data, write_to_excel
+from src.LineupResult import LineupResult
+from src.HtmlSnapshot import parse_table_html
+from src.Tracing import traced
+from src.WebDriverUtils import (ZIPCODE, LOGGER, load_page, click_element, set_zipcode,
+                                capture_html, save_snapshot, release_driver)
 
 # Variables for flexibility
+SCRAPER_VERSION = 2
 SLING_URL = "https://www.sling.com/channels"
 PLAN_CONTAINERS = {
     "Orange" : "Only on Sling Orange",
@@ -11,54 +14,72 @@ PLAN_CONTAINERS = {
     "Both" : "Available in All Base Services"
  }
 IMG_TAG = "img"
-OUTPUT_FILE = os.path.join(OUTPUT_DIR, "SlingTVChannelList.xlsx")
 
-def scrape_sling_tv(mode="headless"):
-    """Scrapes live channel data from SlingTV."""
-    driver = load_page(mode, "SlingTV", SLING_URL, check_popup = True, close_locator = (By.XPATH, "//button[@type='reset']"), sleep_time = 1)
-    all_channels = {}
-    try:
-        # Locate and click the "Compare Plans" button
-        LOGGER.info("Locating Compare Plans button...")
-        click_element(driver, (By.XPATH, "//a[.//p[contains(text(), 'Compare Plans')]]"))
-        LOGGER.info("Opened Compare Plans window...")
-        
-        set_zipcode(driver, ZIPCODE, (By.XPATH, "//input[@data-reference-id='billing-form-zip-field']"))
+@traced("capture", provider="sling")
+def capture_sling_tv(driver, zipcode=ZIPCODE):
+    """Open the plan comparison, set the ZIP code and capture each plan's channel grid.
+
+    Returns:
+        dict: Plan name -> channel grid outerHTML.
+    """
+    # Locate and click the "Compare Plans" button
+    LOGGER.info("Locating Compare Plans button...")
+    click_element(driver, (By.XPATH, "//a[.//p[contains(text(), 'Compare Plans')]]"))
+    LOGGER.info("Opened Compare Plans window...")
 
-        # Initialize dictionary to store channel data
-        for plan_name, plan_div in PLAN_CONTAINERS.items():
-            channels = extract_channel_data(driver, (By.XPATH, f"//div[contains(text(), '{plan_div}')]/following-sibling::*"), (By.TAG_NAME, "img"))
+    set_zipcode(driver, zipcode, (By.XPATH, "//input[@data-reference-id='billing-form-zip-field']"))
 
-            try:
-                # Extract all channel names from `img alt` attributes
-                channel_names = [img.get_attribute("alt") for img in channels]
-                LOGGER.info(f"Extracted {len(channel_names)} channels for {plan_name}.")
+    return {
+        plan_name: capture_html(
+            driver, (By.XPATH, f"//div[contains(text(), '{plan_div}')]/following-sibling::*")
+        )
+        for plan_name, plan_div in PLAN_CONTAINERS.items()
+    }
 
-                # Store channel presence in dictionary
-                for channel in channel_names:
-                    if channel not in all_channels:
-                        all_channels[channel] = {p_name: "" for p_name in PLAN_CONTAINERS.keys()}
+@traced("parse", provider="sling")
+def parse_sling_tv(snapshot):
+    """Parse a SlingTV snapshot into per-channel plan availability.
 
-                    all_channels[channel][plan_name] = "✔️"  # Mark availability
+    Returns:
+        LineupResult: Channels and the plans they are available in.
+    """
+    lineup = LineupResult("sling", PLAN_CONTAINERS.keys())
+    for plan_name, html in snapshot.items():
+        # Extract all channel names from `img alt` attributes
+        images = parse_table_html(html, IMG_TAG, attribute="alt")
+        channel_names = [img["value"] for img in images if img["value"]]
+        LOGGER.info(f"Extracted {len(channel_names)} channels for {plan_name}.")
 
-            except Exception as e:
-                LOGGER.info(f"Error extracting channels for {plan_name}: {e}")
+        # Store channel presence
+        for channel in channel_names:
+            lineup.mark(channel, plan_name)  # Mark availability
 
-        # ✅ NEW: Update "Both" Plan
-        for channel, plans in all_channels.items():
-            if plans["Orange"] == "✔️" or plans["Blue"] == "✔️":
-                all_channels[channel]["Both"] = "✔️"
+    # ✅ NEW: Update "Both" Plan
+    both = 1 << lineup.plans.index("Both")
+    either = (1 << lineup.plans.index("Orange")) | (1 << lineup.plans.index("Blue"))
+    lineup.masks = [mask | both if mask & either else mask for mask in lineup.masks]
+    return lineup
+
+@traced("scrape", provider="sling", arg_tags={"zipcode": "zip"})
+def scrape_sling_tv(mode="headless", zipcode=ZIPCODE):
+    """Scrapes live channel data from SlingTV for a ZIP code."""
+    driver = load_page(mode, "SlingTV", SLING_URL, check_popup=True,
+                       close_locator=(By.XPATH, "//button[@type='reset']"), sleep_time=1,
+                       provider="sling")
+    lineup = LineupResult("sling", PLAN_CONTAINERS.keys())
+    try:
+        snapshot = capture_sling_tv(driver, zipcode)
 
-        # Convert dictionary to DataFrame
-        df_sling_tv = pd.DataFrame.from_dict(all_channels, orient="index").reset_index()
-        df_sling_tv.columns = ["Channel Name", "Orange", "Blue", "Both"]
+        # The browser is not needed once the DOM is captured
+        release_driver(driver)
+        driver = None
+        save_snapshot(f"sling_{zipcode}", snapshot)
 
-        # Save to Excel
-        write_to_excel(df_sling_tv, OUTPUT_FILE, sheet_name="SlingTV Channels")
+        lineup = parse_sling_tv(snapshot)
 
     except Exception as e:
         LOGGER.error(f"Error: {e}")
 
     finally:
-        driver.quit()
-        return all_channels, PLAN_CONTAINERS.keys()
\ No newline at end of file
+        release_driver(driver)
+        return lineup
@@ -0,0 +1,152 @@
+import contextvars
+import csv
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+from src.config import load_config
+
+# Kept free of WebDriverUtils so every module, WebDriverUtils included, can trace
+config = load_config()
+
+# Variables for flexibility
+TRACE_FILE = os.path.join(config["OUTPUT_DIR"], "trace.json")
+
+# Child of the scraper logger, so messages go to the same console and log file
+LOGGER = logging.getLogger("src.WebDriverUtils").getChild("Tracing")
+
+_enabled = False
+_events: List[Dict[str, Any]] = []
+_events_lock = threading.Lock()
+_tags = contextvars.ContextVar("trace_tags", default={})  # Tags inherited by nested spans
+
+def enable() -> None:
+    """Start recording spans. Until then span() and @traced cost next to nothing."""
+    global _enabled
+    _enabled = True
+
+def is_enabled() -> bool:
+    return _enabled
+
+@contextmanager
+def span(name: str, **tags):
+    """Time a block as one span.
+
+    Tags (e.g. provider, plan, zip) are passed on to the spans nested inside it, in the
+    same thread. Tags set to None are left out.
+    """
+    if not _enabled:
+        yield
+        return
+    merged = {**_tags.get(), **{key: value for key, value in tags.items() if value is not None}}
+    token = _tags.set(merged)
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        end = time.perf_counter_ns()
+        _tags.reset(token)
+        event = {"name": name, "ph": "X", "ts": start / 1000, "dur": (end - start) / 1000,
+                 "pid": os.getpid(), "tid": threading.get_native_id(), "args": merged}
+        with _events_lock:
+            _events.append(event)
+
+def traced(name: Optional[str] = None, arg_tags: Optional[Dict[str, str]] = None, **tags):
+    """Decorator running a function inside a span.
+
+    Parameters:
+        name (Optional[str]): Span name; defaults to the function name.
+        arg_tags (Optional[Dict[str, str]]): Function arguments to tag the span with, as
+            argument name -> tag name, e.g. {"zipcode": "zip"}.
+        tags: Fixed tags, e.g. provider="directv".
+    """
+    def decorator(func):
+        label = name or func.__name__
+        signature = inspect.signature(func) if arg_tags else None
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            extra = {}
+            if signature:
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                extra = {tag: bound.arguments.get(arg) for arg, tag in arg_tags.items()}
+            with span(label, **{**tags, **extra}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def collect() -> List[Dict[str, Any]]:
+    """Return and clear the spans recorded so far, e.g. to send them from a worker process."""
+    with _events_lock:
+        events = list(_events)
+        _events.clear()
+    return events
+
+def merge(events: List[Dict[str, Any]]) -> None:
+    """Add spans recorded in another process."""
+    with _events_lock:
+        _events.extend(events)
+
+def summarize(events: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+    """Total the spans per name and provider, slowest first.
+
+    Returns:
+        List[Dict[str, Any]]: Rows with span, provider, count, total_s, mean_ms and max_ms.
+    """
+    if events is None:
+        with _events_lock:
+            events = list(_events)
+    totals: Dict[tuple, List[float]] = {}
+    for event in events:
+        key = (event["name"], event["args"].get("provider", ""))
+        totals.setdefault(key, []).append(event["dur"] / 1000)
+    rows = [
+        {"span": name, "provider": provider, "count": len(durations),
+         "total_s": round(sum(durations) / 1000, 3),
+         "mean_ms": round(sum(durations) / len(durations), 1), "max_ms": round(max(durations), 1)}
+        for (name, provider), durations in totals.items()
+    ]
+    return sorted(rows, key=lambda row: row["total_s"], reverse=True)
+
+def export(path: str = TRACE_FILE) -> Optional[str]:
+    """Write the recorded spans as a Chrome trace (open in chrome://tracing or Perfetto) and a
+    summary CSV.
+
+    The summary table is also logged. The CSV goes next to the trace, as <name>_summary.csv.
+
+    Returns:
+        Optional[str]: The trace path, or None if the write failed.
+    """
+    with _events_lock:
+        events = sorted(_events, key=lambda event: event["ts"])
+    rows = summarize(events)
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str)
+        summary_path = os.path.splitext(path)[0] + "_summary.csv"
+        with open(summary_path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=["span", "provider", "count", "total_s",
+                                                   "mean_ms", "max_ms"])
+            writer.writeheader()
+            writer.writerows(rows)
+    except OSError as e:
+        LOGGER.error(f"Error writing trace {path}: {e}")
+        return None
+
+    LOGGER.info(f"{'Span':<24} {'Provider':<14} {'Count':>6} {'Total s':>9} {'Mean ms':>9} "
+                f"{'Max ms':>9}")
+    for row in rows:
+        LOGGER.info(f"{row['span']:<24} {row['provider']:<14} {row['count']:>6} "
+                    f"{row['total_s']:>9.3f} "
+                    f"{row['mean_ms']:>9.1f} {row['max_ms']:>9.1f}")
+    LOGGER.info(f"Trace with {len(events)} spans written to {path}")
+    return path
@@ -3,6 +3,12 @@ import sys
 import os
 import time
 import random
+import threading
+import json
+import re
+import base64
+import contextvars
+import itertools
 import pandas as pd
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -13,12 +19,16 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
 import concurrent.futures
+import multiprocessing
 from src.config import load_config
+from src import CommandProfiler, Tracing
+from src.Tracing import traced
 import logging.handlers
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Optional
 from selenium.webdriver.chrome.webdriver import WebDriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
+from selenium.common.exceptions import StaleElementReferenceException
 import atexit
 import psutil
 
@@ -26,27 +36,114 @@ import psutil
 config = load_config()
 ZIPCODE = config["ZIPCODE"]
 OUTPUT_DIR = config["OUTPUT_DIR"]
+DRIVER_POOL_SIZE = config["DRIVER_POOL_SIZE"]
+MAX_WORKERS = config["MAX_WORKERS"]  # None to size from CPU/memory headroom
+EXECUTOR = config["EXECUTOR"]  # "thread" or "process"
+CACHE_MAX_AGE_HOURS = config["CACHE_MAX_AGE_HOURS"]  # Reuse cached results up to this age
+# Resume from completed steps up to this age
+CHECKPOINT_MAX_AGE_HOURS = config["CHECKPOINT_MAX_AGE_HOURS"]
+RETRY_ATTEMPTS = config["RETRY_ATTEMPTS"]
+RETRY_DELAY = config["RETRY_DELAY"]  # Seconds before the first retry; doubles with each attempt
+JOB_TIMEOUT = config["JOB_TIMEOUT"]  # Wall-clock seconds a job may run, or None for no deadline
+CHROMEDRIVER_PATH = config["CHROMEDRIVER_PATH"]
+SNAPSHOT_DIR = config["SNAPSHOT_DIR"]
+# Provider name -> regex for the lineup JSON URLs to record (off by default)
+API_CAPTURE = config["API_CAPTURE"]
+LEAN_MODE = config["LEAN_MODE"]
+LEAN_BLOCKED_URLS = config["LEAN_BLOCKED_URLS"]
+LEAN_PROVIDERS = config["LEAN_PROVIDERS"]  # Provider name -> {"enabled": bool, "allow": [patterns]}
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
 LOG_FILE = os.path.join(OUTPUT_DIR, "tv_scraper.log")
+DRIVER_MANIFEST = os.path.join(OUTPUT_DIR, "chromedriver_manifest.json")
+DRIVER_MEMORY_MB = 600  # Rough footprint of one Chrome + chromedriver, to size the worker count
+DEADLINE_POLL = 1.0  # Seconds between checks for scraper jobs past their deadline
+
+# Chromedriver binary resolved once per process
+_chromedriver_path = None
+_chromedriver_lock = threading.Lock()
 
 # Global variable to store active ChromeDriver instances
 _active_drivers = set()
 
-def cleanup_chrome_drivers():
-    """Clean up all ChromeDriver processes."""
-    for driver in _active_drivers:
+# The scraper job running in the current thread, and which job holds each leased driver, so a
+# job that overruns its deadline can have its own browsers killed without touching the others
+_current_job = contextvars.ContextVar("scrape_job", default=None)
+_driver_jobs = {}
+_cancelled_jobs = set()
+_job_started = {}  # Job -> when it got its first driver; its deadline runs from then
+_jobs_lock = threading.Lock()
+_job_ids = itertools.count(1)
+
+# Warm driver pools, one per WebDriver mode and set of driver options; _browser_limit (below
+# DriverPool) caps the browsers alive across all of them
+_driver_pools = {}
+_driver_pools_lock = threading.Lock()
+
+# Buffered DevTools network events per session, for drivers started with capture_network
+_network_events = {}
+_network_events_lock = threading.Lock()
+
+# Page name and URL blocking per leased session, for lean-mode reporting and reset
+_lease_labels = {}
+_blocking_sessions = set()
+_lease_lock = threading.Lock()
+
+def _quit_owned_drivers():
+    """Drain the driver pools and quit every driver started by this process."""
+    with _driver_pools_lock:
+        pools = list(_driver_pools.values())
+    for pool in pools:
+        pool.drain()
+
+    for driver in list(_active_drivers):
         try:
             driver.quit()
         except Exception as e:
             LOGGER.error(f"Error quitting driver: {e}")
     _active_drivers.clear()
-    
-    # Kill any remaining ChromeDriver processes
-    for proc in psutil.process_iter(['pid', 'name']):
+
+def kill_process_tree(pid: int, timeout: float = 3) -> int:
+    """Terminate a process and all its descendants, killing those still alive after ``timeout``
+    seconds.
+
+    Returns:
+        int: The number of processes signalled.
+    """
+    try:
+        root = psutil.Process(pid)
+        processes = root.children(recursive=True) + [root]
+    except psutil.NoSuchProcess:
+        return 0
+    for process in processes:
+        try:
+            process.terminate()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+    _, alive = psutil.wait_procs(processes, timeout=timeout)
+    for process in alive:
+        try:
+            process.kill()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+    return len(processes)
+
+def cleanup_chrome_drivers():
+    """Clean up the ChromeDriver processes started by this process.
+
+    Chromedrivers belonging to other programs or other runs on the same machine are left alone.
+    """
+    _quit_owned_drivers()
+
+    # Kill any of our ChromeDriver processes (and their browsers) that didn't quit
+    try:
+        children = psutil.Process().children(recursive=True)
+    except psutil.Error:
+        children = []
+    for proc in children:
         try:
-            if 'chromedriver' in proc.info['name'].lower():
-                proc.kill()
+            if 'chromedriver' in proc.name().lower():
+                kill_process_tree(proc.pid)
         except (psutil.NoSuchProcess, psutil.AccessDenied):
             pass
 
@@ -69,7 +166,8 @@ def setup_logger():
     logger.addHandler(console_handler)
 
     # Rotating File Handler (Force UTF-8 Encoding)
-    file_handler = logging.handlers.RotatingFileHandler(LOG_FILE, maxBytes=10485760, backupCount=5, encoding="utf-8")
+    file_handler = logging.handlers.RotatingFileHandler(LOG_FILE, maxBytes=10485760, backupCount=5,
+                                                        encoding="utf-8")
     file_handler.setLevel(logging.INFO)  # Log all levels to file
     file_formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
     file_handler.setFormatter(file_formatter)
@@ -78,8 +176,13 @@ def setup_logger():
     return logger
 LOGGER = setup_logger() # Initialize logger
 
-def setup_chrome_options(mode: str) -> Options:
-    """Setup Chrome options based on the specified mode."""
+def setup_chrome_options(mode: str, capture_network: bool = False, lean: bool = False) -> Options:
+    """Setup Chrome options based on the specified mode.
+
+    With ``capture_network`` the DevTools performance log is enabled so network
+    responses can be read back with capture_json_responses. ``lean`` switches to the
+    eager page load strategy and disables image loading and decoding.
+    """
     chrome_options = Options()
     if mode.lower() == "headless":
         chrome_options.add_argument("--headless=new")
@@ -97,13 +200,108 @@ def setup_chrome_options(mode: str) -> Options:
     chrome_options.add_argument("--disable-blink-features=AutomationControlled")
     chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
     chrome_options.add_experimental_option("useAutomationExtension", False)
+    if capture_network:
+        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    if lean:
+        # Return from driver.get at DOMContentLoaded, scrapers wait for their own elements
+        chrome_options.page_load_strategy = "eager"
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_experimental_option(
+            "prefs", {"profile.managed_default_content_settings.images": 2}
+        )
     return chrome_options
 
-def run_webdriver(mode: str = "headless") -> WebDriver:
+def get_chrome_version() -> Optional[str]:
+    """Return the locally installed Google Chrome version, or None if it can't be detected.
+
+    The lookup only inspects the local installation and works offline.
+    """
+    try:
+        try:
+            from webdriver_manager.core.os_manager import OperationSystemManager, ChromeType
+            return OperationSystemManager().get_browser_version_from_os(ChromeType.GOOGLE)
+        except ImportError:  # webdriver-manager < 4
+            from webdriver_manager.core.utils import ChromeType, get_browser_version_from_os
+            return get_browser_version_from_os(ChromeType.GOOGLE)
+    except Exception as e:
+        LOGGER.warning(f"Could not detect Chrome version: {e}")
+        return None
+
+def _read_driver_manifest() -> Dict[str, Any]:
+    """Read the cached chromedriver manifest, returning an empty dict if missing or corrupt."""
+    try:
+        with open(DRIVER_MANIFEST, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _write_driver_manifest(driver_path: str, chrome_version: Optional[str]) -> None:
+    """Persist the resolved chromedriver path and the Chrome version it was resolved for."""
+    manifest = {
+        "driver_path": driver_path,
+        "chrome_version": chrome_version,
+        "resolved_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    try:
+        with open(DRIVER_MANIFEST, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=4)
+    except OSError as e:
+        LOGGER.warning(f"Could not write chromedriver manifest: {e}")
+
+def resolve_chromedriver() -> str:
+    """Return the chromedriver binary path, resolving it at most once per process.
+
+    Resolution order:
+        1. ``CHROMEDRIVER_PATH`` from config, if set.
+        2. The on-disk manifest, if its binary still exists and was resolved for the
+           Chrome version installed now (or the version can't be detected, e.g. offline).
+        3. ``ChromeDriverManager().install()``, whose result is written back to the manifest.
+
+    Returns:
+        str: Path to the chromedriver executable.
+
+    Raises:
+        FileNotFoundError: If the configured CHROMEDRIVER_PATH does not exist.
+    """
+    global _chromedriver_path
+    with _chromedriver_lock:
+        if _chromedriver_path:
+            return _chromedriver_path
+
+        if CHROMEDRIVER_PATH:
+            if not os.path.isfile(CHROMEDRIVER_PATH):
+                raise FileNotFoundError(
+                    f"Configured CHROMEDRIVER_PATH not found: {CHROMEDRIVER_PATH}"
+                )
+            LOGGER.info(f"Using pinned chromedriver: {CHROMEDRIVER_PATH}")
+            _chromedriver_path = CHROMEDRIVER_PATH
+            return _chromedriver_path
+
+        chrome_version = get_chrome_version()
+        manifest = _read_driver_manifest()
+        cached_path = manifest.get("driver_path")
+        if cached_path and os.path.isfile(cached_path) and (
+            chrome_version is None or manifest.get("chrome_version") == chrome_version
+        ):
+            LOGGER.info(f"Using cached chromedriver for Chrome {manifest.get('chrome_version')}: "
+                        f"{cached_path}")
+            _chromedriver_path = cached_path
+            return _chromedriver_path
+
+        LOGGER.info("Resolving chromedriver with webdriver-manager...")
+        _chromedriver_path = ChromeDriverManager().install()
+        _write_driver_manifest(_chromedriver_path, chrome_version)
+        return _chromedriver_path
+
+@traced("start_chrome")
+def run_webdriver(mode: str = "headless", capture_network: bool = False,
+                  lean: bool = False) -> WebDriver:
     """Initialize and return a Selenium WebDriver instance.
 
     Parameters:
         mode (str): The mode to run the WebDriver in. Options are 'headless' or 'gui'.
+        capture_network (bool): Enable DevTools network logging (see capture_json_responses).
+        lean (bool): Use the eager page load strategy and don't load images.
 
     Returns:
         WebDriver: A configured Selenium WebDriver instance.
@@ -111,24 +309,495 @@ def run_webdriver(mode: str = "headless") -> WebDriver:
     Raises:
         Exception: If there is an error initializing the WebDriver.
     """
+    service = None
     try:
-        chrome_options = setup_chrome_options(mode)
+        chrome_options = setup_chrome_options(mode, capture_network, lean)
         LOGGER.info(f"Starting WebDriver in {'Headless' if 'headless' in mode else 'GUI'} mode...")
         
-        # Initialize ChromeDriver with default version
-        service = Service(ChromeDriverManager().install())
+        # Reuse the chromedriver binary resolved for this process
+        start_time = time.perf_counter()
+        service = Service(resolve_chromedriver())
         driver = webdriver.Chrome(service=service, options=chrome_options)
+        LOGGER.info(f"WebDriver started in {time.perf_counter() - start_time:.2f}s")
         
+        if CommandProfiler.is_enabled():
+            CommandProfiler.instrument(driver)
+
         # Add driver to active set
         _active_drivers.add(driver)
+        if capture_network:
+            with _network_events_lock:
+                _network_events[driver.session_id] = []
         
         return driver
     except Exception as e:
         LOGGER.error(f"Failed to initialize WebDriver: {e}")
-        cleanup_chrome_drivers()  # Clean up any partial initialization
+        # Clean up this driver's partial initialization only; other scrapers' browsers keep running
+        # Not set if chromedriver never started
+        pid = getattr(getattr(service, "process", None), "pid", None)
+        if pid:
+            kill_process_tree(pid)
         raise
 
-def load_page(mode: str, page_name: str, page_url: str, check_popup: bool = False, close_locator: Optional[tuple] = None, sleep_time: int = 0) -> WebDriver:
+def reset_driver_state(driver: WebDriver) -> None:
+    """Reset a WebDriver so it can be handed to the next scraper.
+
+    Closes every tab except the first one, clears cookies and web storage and
+    navigates to a blank page. The HTTP cache is kept on purpose so repeated
+    visits to the same provider stay warm.
+
+    Parameters:
+        driver (WebDriver): The WebDriver instance to reset.
+
+    Raises:
+        Exception: If the browser is no longer reachable.
+    """
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+
+    try:
+        driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+    except Exception:
+        pass  # about:blank and some error pages have no storage
+    try:
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    except Exception:
+        driver.delete_all_cookies()
+    driver.get("about:blank")
+
+    # Drop URL blocking and network events from the previous lease
+    with _lease_lock:
+        blocking = driver.session_id in _blocking_sessions
+        _blocking_sessions.discard(driver.session_id)
+    if blocking:
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": []})
+    with _network_events_lock:
+        capturing = driver.session_id in _network_events
+    if capturing:
+        driver.get_log("performance")
+        with _network_events_lock:
+            _network_events[driver.session_id] = []
+
+class BrowserLimit:
+    """A cap on the browsers alive across several DriverPools.
+
+    Pools sharing a limit also share its lock. A pool that needs a new browser while the limit is
+    reached quits an idle browser of another pool to make room, so warm browsers started with
+    one set of options can't keep scrapers that need other options waiting.
+    """
+
+    def __init__(self, size: int = DRIVER_POOL_SIZE):
+        self.size = max(1, int(size))
+        self.condition = threading.Condition()
+        self.pools = []
+
+    def alive(self) -> int:
+        """Browsers started or starting in every pool; call with ``condition`` held."""
+        return sum(pool._created for pool in self.pools)
+
+    def evict_idle(self, pool) -> Optional[WebDriver]:
+        """Take an idle driver from a pool other than ``pool`` and free its slot; call with
+        ``condition`` held. The caller quits the returned driver."""
+        for other in self.pools:
+            if other is not pool and other._idle:
+                other._created -= 1
+                return other._idle.pop(0)
+        return None
+
+class DriverPool:
+    """A bounded pool of warm WebDriver instances with lease/return semantics.
+
+    Drivers are started lazily (or up front with ``prewarm``) up to ``size``
+    instances, and up to the ``limit`` shared with other pools, if any.
+    ``lease`` hands out an idle driver, starting a new one only if the pool is
+    not full, and blocks otherwise. ``release`` resets the
+    browser state and puts the driver back; drivers that fail to reset are
+    quit and replaced on the next lease.
+    """
+
+    def __init__(self, mode: str = "headless", size: int = DRIVER_POOL_SIZE, factory=None,
+                 limit: Optional[BrowserLimit] = None, **driver_options):
+        """Create an empty pool.
+
+        Parameters:
+            mode (str): The mode to run the WebDriver in. Options are 'headless' or 'gui'.
+            size (int): Maximum number of drivers alive at the same time.
+            factory: Callable taking ``mode`` and returning a new WebDriver. Defaults to
+                run_webdriver.
+            limit (Optional[BrowserLimit]): A cap on the browsers of this and other pools
+                together.
+            driver_options: Extra keyword arguments passed to the factory (e.g. capture_network).
+        """
+        self.mode = mode
+        self.size = max(1, int(size))
+        self.driver_options = driver_options
+        self._factory = factory or run_webdriver
+        self._idle = []
+        self._leased = set()
+        self._created = 0
+        self._limit = limit
+        self._condition = limit.condition if limit else threading.Condition()
+        if limit:
+            with self._condition:
+                limit.pools.append(self)
+
+    def _room(self) -> int:
+        """Drivers that can still be started; call with ``_condition`` held."""
+        room = self.size - self._created
+        if self._limit:
+            room = min(room, self._limit.size - self._limit.alive())
+        return room
+
+    def _start_driver(self) -> WebDriver:
+        """Start a driver for a slot already reserved in ``_created``."""
+        try:
+            return self._factory(self.mode, **self.driver_options)
+        except Exception:
+            with self._condition:
+                self._created -= 1
+                self._condition.notify_all()
+            raise
+
+    def prewarm(self, count: Optional[int] = None) -> int:
+        """Start drivers up front so the first leases don't pay for a cold start.
+
+        Parameters:
+            count (Optional[int]): Number of idle drivers wanted, capped at the pool size.
+
+        Returns:
+            int: The number of drivers started.
+        """
+        with self._condition:
+            wanted = self.size if count is None else min(int(count), self.size)
+            missing = min(wanted - len(self._idle), self._room())
+            if missing <= 0:
+                return 0
+            self._created += missing
+
+        LOGGER.info(f"Pre-warming {missing} WebDriver instance(s)...")
+        started = 0
+        with concurrent.futures.ThreadPoolExecutor(missing) as executor:
+            futures = [executor.submit(self._start_driver) for _ in range(missing)]
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    driver = future.result()
+                except Exception as e:
+                    LOGGER.error(f"Error pre-warming WebDriver: {e}")
+                    continue
+                with self._condition:
+                    self._idle.append(driver)
+                    self._condition.notify_all()
+                started += 1
+        return started
+
+    def lease(self, timeout: Optional[float] = None) -> WebDriver:
+        """Take a driver from the pool, starting one if the pool is not full.
+
+        Parameters:
+            timeout (Optional[float]): Seconds to wait for a free driver, or None to wait forever.
+
+        Returns:
+            WebDriver: A driver reserved for the caller until ``release``.
+
+        Raises:
+            TimeoutError: If no driver became available within ``timeout``.
+        """
+        evicted = None
+        with self._condition:
+            while not self._idle and self._room() <= 0:
+                if self._limit and self._created < self.size:
+                    # Other pools hold the browsers; replace one of their idle ones
+                    evicted = self._limit.evict_idle(self)
+                    if evicted is not None:
+                        break
+                if not self._condition.wait(timeout):
+                    raise TimeoutError(f"No WebDriver available after {timeout}s")
+            if self._idle:
+                driver = self._idle.pop()
+            else:
+                self._created += 1
+                driver = None
+
+        if evicted is not None:
+            _quit_driver(evicted)
+        if driver is None:
+            driver = self._start_driver()
+        with self._condition:
+            self._leased.add(driver)
+        try:
+            _claim_driver(driver)
+        except TimeoutError:
+            self.release(driver)
+            raise
+        return driver
+
+    def grow(self, size: int) -> None:
+        """Raise the pool size to at least ``size``, waking leases waiting for a free slot."""
+        with self._condition:
+            if size > self.size:
+                self.size = int(size)
+                self._condition.notify_all()
+
+    def discard(self, driver: WebDriver) -> None:
+        """Forget a leased driver whose browser was killed, so its slot can be filled again."""
+        with self._condition:
+            if driver in self._leased:
+                self._leased.discard(driver)
+                self._created -= 1
+                self._condition.notify_all()
+
+    def owns(self, driver: WebDriver) -> bool:
+        """Return True if ``driver`` is currently leased from this pool."""
+        with self._condition:
+            return driver in self._leased
+
+    def release(self, driver: WebDriver) -> None:
+        """Reset a leased driver and return it to the pool.
+
+        Parameters:
+            driver (WebDriver): A driver previously returned by ``lease``.
+        """
+        with self._condition:
+            if driver not in self._leased:
+                leased = False
+            else:
+                self._leased.discard(driver)
+                leased = True
+        if not leased:
+            # Not ours (or the pool was drained meanwhile), just shut it down
+            _quit_driver(driver)
+            return
+
+        try:
+            reset_driver_state(driver)
+        except Exception as e:
+            LOGGER.warning(f"Discarding WebDriver that failed to reset: {e}")
+            _quit_driver(driver)
+            with self._condition:
+                self._created -= 1
+                self._condition.notify_all()
+            return
+
+        with self._condition:
+            self._idle.append(driver)
+            self._condition.notify_all()
+
+    def drain(self) -> None:
+        """Quit idle drivers and forget leased ones; the pool can be used again afterwards."""
+        with self._condition:
+            idle = self._idle
+            self._idle = []
+            self._leased.clear()
+            self._created = 0
+            self._condition.notify_all()
+        for driver in idle:
+            _quit_driver(driver)
+
+# Browsers alive across every pool from get_driver_pool
+_browser_limit = BrowserLimit(DRIVER_POOL_SIZE)
+
+def _quit_driver(driver: WebDriver) -> None:
+    """Quit a driver and stop tracking it, ignoring errors from dead browsers."""
+    with _network_events_lock:
+        _network_events.pop(driver.session_id, None)
+    try:
+        driver.quit()
+    except Exception:
+        pass
+    _active_drivers.discard(driver)
+
+def _claim_driver(driver: WebDriver) -> None:
+    """Record that the current scraper job holds a leased driver.
+
+    Raises:
+        TimeoutError: If the job has already been stopped for overrunning its deadline.
+    """
+    job = _current_job.get()
+    if job is None:
+        return
+    with _jobs_lock:
+        if job in _cancelled_jobs:
+            raise TimeoutError("Scraper job was stopped after its deadline")
+        _driver_jobs[driver] = job
+        # Time spent queued for a free browser doesn't count against the deadline
+        _job_started.setdefault(job, time.monotonic())
+
+def _driver_pid(driver: WebDriver) -> Optional[int]:
+    """Return the PID of a driver's chromedriver process, whose descendants are its Chrome
+    processes."""
+    process = getattr(getattr(driver, "service", None), "process", None)
+    return getattr(process, "pid", None)
+
+def terminate_job_drivers(job) -> int:
+    """Kill the chromedriver and Chrome processes of the drivers a scraper job holds.
+
+    The job can't lease new drivers afterwards; the scraper's pending WebDriver calls fail,
+    so its thread unwinds. Other jobs' browsers are left running.
+
+    Returns:
+        int: The number of drivers killed.
+    """
+    with _jobs_lock:
+        _cancelled_jobs.add(job)
+        drivers = [driver for driver, owner in _driver_jobs.items() if owner == job]
+        for driver in drivers:
+            del _driver_jobs[driver]
+
+    with _driver_pools_lock:
+        pools = list(_driver_pools.values())
+    for driver in drivers:
+        pid = _driver_pid(driver)
+        if pid:
+            kill_process_tree(pid)
+        for pool in pools:
+            pool.discard(driver)
+        with _network_events_lock:
+            _network_events.pop(driver.session_id, None)
+        _active_drivers.discard(driver)
+    return len(drivers)
+
+def get_driver_pool(mode: str = "headless", capture_network: bool = False,
+                    lean: bool = False) -> DriverPool:
+    """Return the process-wide DriverPool for the given mode, creating it on first use.
+
+    Parameters:
+        mode (str): The mode to run the WebDriver in. Options are 'headless' or 'gui'.
+        capture_network (bool): Use drivers with DevTools network logging enabled.
+        lean (bool): Use lean drivers (eager page loads, no images). Lean drivers always
+            capture network events so transferred bytes can be reported.
+
+    Returns:
+        DriverPool: The shared pool for that mode and options. Every pool counts against one
+        limit of DRIVER_POOL_SIZE browsers (see ensure_driver_pool_size).
+    """
+    # The "MB transferred" log in release_driver needs the network log, so lean implies capture
+    capture_network = capture_network or lean
+    key = (mode, capture_network, lean)
+    with _driver_pools_lock:
+        pool = _driver_pools.get(key)
+        if pool is None:
+            options = {}
+            if capture_network:
+                options["capture_network"] = True
+            if lean:
+                options["lean"] = True
+            pool = _driver_pools[key] = DriverPool(mode, _browser_limit.size,
+                                                   limit=_browser_limit, **options)
+        return pool
+
+def get_provider_pool(mode: str, provider: str) -> DriverPool:
+    """Return the pool a provider's scraper leases from, given its API_CAPTURE and lean
+    settings."""
+    return get_driver_pool(mode, bool(API_CAPTURE.get(provider)),
+                           lean=get_lean_blocklist(provider) is not None)
+
+def ensure_driver_pool_size(size: int) -> None:
+    """Let the driver pools, current and future, hold at least ``size`` browsers between them.
+
+    Parameters:
+        size (int): Drivers that must be leased out at the same time, e.g. the number of
+            thread-mode scrapers running at once.
+    """
+    with _driver_pools_lock:
+        pools = list(_driver_pools.values())
+    with _browser_limit.condition:
+        if size <= _browser_limit.size:
+            return
+        _browser_limit.size = int(size)
+        _browser_limit.condition.notify_all()
+    LOGGER.info(f"Driver pools grown to {size} WebDriver instances")
+    for pool in pools:
+        pool.grow(size)
+
+def get_lean_blocklist(provider: Optional[str]) -> Optional[List[str]]:
+    """Return the URL patterns to block for a provider, or None if lean mode is off for it.
+
+    LEAN_MODE switches lean mode on for every provider; LEAN_PROVIDERS can turn it on or
+    off per provider ("enabled") and un-block patterns a page needs ("allow").
+
+    Parameters:
+        provider (Optional[str]): Provider name as used in TV_Webscraping.SCRAPERS, e.g. 'directv'.
+
+    Returns:
+        Optional[List[str]]: Patterns for Network.setBlockedURLs, or None.
+    """
+    settings = LEAN_PROVIDERS.get(provider, {}) if provider else {}
+    if not settings.get("enabled", LEAN_MODE):
+        return None
+    allowed = set(settings.get("allow", []))
+    return [pattern for pattern in LEAN_BLOCKED_URLS if pattern not in allowed]
+
+def block_urls(driver: WebDriver, patterns: List[str]) -> None:
+    """Block requests matching URL patterns (with * wildcards) until the driver is released.
+
+    Parameters:
+        driver (WebDriver): The WebDriver instance.
+        patterns (List[str]): Patterns for the DevTools Network.setBlockedURLs command.
+    """
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    with _lease_lock:
+        _blocking_sessions.add(driver.session_id)
+    LOGGER.info(f"Blocking {len(patterns)} URL patterns")
+
+def get_transfer_stats(driver: WebDriver) -> Optional[Dict[str, int]]:
+    """Return network totals for a driver's current lease, or None if it isn't capturing.
+
+    Returns:
+        Optional[Dict[str, int]]: 'bytes' received (encoded, as on the wire), finished 'requests'
+        and requests 'blocked' by block_urls.
+    """
+    with _network_events_lock:
+        capturing = driver.session_id in _network_events
+    if not capturing:
+        return None
+    stats = {"bytes": 0, "requests": 0, "blocked": 0}
+    for event in read_network_events(driver):
+        if event.get("method") == "Network.loadingFinished":
+            stats["bytes"] += int(event["params"].get("encodedDataLength", 0))
+            stats["requests"] += 1
+        elif (event.get("method") == "Network.loadingFailed"
+              and event["params"].get("blockedReason")):
+            stats["blocked"] += 1
+    return stats
+
+def release_driver(driver: Optional[WebDriver]) -> None:
+    """Return a driver obtained from load_page to its pool.
+
+    Drivers that don't belong to any pool are quit instead.
+
+    Parameters:
+        driver (Optional[WebDriver]): The WebDriver instance to release.
+    """
+    if driver is None:
+        return
+    with _jobs_lock:
+        _driver_jobs.pop(driver, None)
+    with _lease_lock:
+        label = _lease_labels.pop(driver.session_id, None)
+    try:
+        stats = get_transfer_stats(driver)
+        if stats:
+            LOGGER.info(f"{label or 'WebDriver'}: {stats['bytes'] / 1048576:.2f} MB transferred in "
+                        f"{stats['requests']} requests, {stats['blocked']} blocked.")
+    except Exception as e:
+        LOGGER.warning(f"Could not read transfer stats: {e}")
+
+    with _driver_pools_lock:
+        pools = list(_driver_pools.values())
+    for pool in pools:
+        if pool.owns(driver):
+            pool.release(driver)
+            return
+    _quit_driver(driver)
+
+@traced(arg_tags={"provider": "provider"})
+def load_page(mode: str, page_name: str, page_url: str, check_popup: bool = False,
+              close_locator: Optional[tuple] = None, sleep_time: int = 0,
+              capture_network: bool = False, provider: Optional[str] = None) -> WebDriver:
     """Load a web page using the specified WebDriver mode.
 
     Parameters:
@@ -138,9 +807,12 @@ def load_page(mode: str, page_name: str, page_url: str, check_popup: bool = Fals
         check_popup (bool): Whether to check for and handle popups.
         close_locator (Optional[tuple]): Locator for the popup close button.
         sleep_time (int): Time to wait after loading the page.
+        capture_network (bool): Lease a driver with DevTools network logging enabled.
+        provider (Optional[str]): Provider name used to look up lean-mode settings.
 
     Returns:
-        WebDriver: The WebDriver instance after loading the page.
+        WebDriver: A pooled WebDriver instance after loading the page. Hand it back with
+        release_driver.
 
     Raises:
         Exception: If there is an error loading the page.
@@ -148,7 +820,12 @@ def load_page(mode: str, page_name: str, page_url: str, check_popup: bool = Fals
     LOGGER.info(f"Web scraping {page_name}...")
     driver = None
     try:
-        driver = run_webdriver(mode)
+        blocklist = get_lean_blocklist(provider)
+        driver = get_driver_pool(mode, capture_network, lean=blocklist is not None).lease()
+        with _lease_lock:
+            _lease_labels[driver.session_id] = page_name
+        if blocklist:
+            block_urls(driver, blocklist)
         driver.get(page_url)
         LOGGER.info("Waiting for page to load...")
         time.sleep(sleep_time)
@@ -157,12 +834,7 @@ def load_page(mode: str, page_name: str, page_url: str, check_popup: bool = Fals
         return driver
     except Exception as e:
         LOGGER.error(f"Error loading page {page_name}: {e}")
-        if driver:
-            try:
-                driver.quit()
-                _active_drivers.discard(driver)
-            except:
-                pass
+        release_driver(driver)
         raise
 
 def handle_popup(driver: WebDriver, close_locator: Optional[tuple]) -> WebDriver:
@@ -186,7 +858,9 @@ def handle_popup(driver: WebDriver, close_locator: Optional[tuple]) -> WebDriver
         LOGGER.exception("No pop-up found, proceeding.")
     return driver
 
-def click_element(driver: WebDriver, element_locator: tuple, element_container: Optional[WebElement] = None) -> None:
+@traced()
+def click_element(driver: WebDriver, element_locator: tuple,
+                  element_container: Optional[WebElement] = None) -> None:
     """Click an element on the page.
 
     Parameters:
@@ -212,7 +886,49 @@ def click_element(driver: WebDriver, element_locator: tuple, element_container:
     except Exception as e:
         LOGGER.error(f"Error: {e}")
 
-def set_zipcode(driver: WebDriver, zipcode: str, input_locator: tuple, submit_locator: Optional[tuple] = None) -> Optional[WebElement]:
+def relocate_on_stale(operation, attempts: int = 3):
+    """Run an operation that locates its own elements, re-running it if an element went stale.
+
+    Only the failed operation is repeated, so it re-locates just the node it works on
+    instead of reloading the page.
+
+    Parameters:
+        operation: A callable that finds and uses the element(s) it needs.
+        attempts (int): Maximum number of runs.
+
+    Returns:
+        The operation's return value.
+
+    Raises:
+        StaleElementReferenceException: If the element is still stale on the last attempt.
+    """
+    for attempt in range(attempts):
+        try:
+            return operation()
+        except StaleElementReferenceException:
+            if attempt == attempts - 1:
+                raise
+            LOGGER.info(f"Stale element, re-locating (attempt {attempt + 2}/{attempts})...")
+
+def get_page_load_time(driver: WebDriver) -> Optional[float]:
+    """Return how long the current page took to load, in seconds, from the Navigation Timing API.
+
+    Returns:
+        Optional[float]: The load time, or None if the browser doesn't report it.
+    """
+    try:
+        ms = driver.execute_script(
+            "const nav = performance.getEntriesByType('navigation')[0];"
+            "return nav ? (nav.loadEventEnd || nav.domContentLoadedEventEnd) : null;"
+        )
+        return ms / 1000 if ms else None
+    except Exception as e:
+        LOGGER.warning(f"Could not read page load time: {e}")
+        return None
+
+@traced(arg_tags={"zipcode": "zip"})
+def set_zipcode(driver: WebDriver, zipcode: str, input_locator: tuple,
+                submit_locator: Optional[tuple] = None) -> Optional[WebElement]:
     """Set the ZIP code in the input field and submit if required.
 
     Parameters:
@@ -248,7 +964,9 @@ def set_zipcode(driver: WebDriver, zipcode: str, input_locator: tuple, submit_lo
          # Handle submit button if available
         if submit_locator:
             try:
-                submit_button = WebDriverWait(driver, 5).until(EC.element_to_be_clickable(submit_locator))
+                submit_button = WebDriverWait(driver, 5).until(
+                    EC.element_to_be_clickable(submit_locator)
+                )
                 click_element(driver, submit_button)
             except:
                 LOGGER.info("Submit button not found or not needed.")
@@ -259,31 +977,88 @@ def set_zipcode(driver: WebDriver, zipcode: str, input_locator: tuple, submit_lo
         LOGGER.error(f"Error setting ZIP code: {e}")
         return None
 
-def smooth_scroll_to_bottom(driver: WebDriver, scroll_step: int = 500, wait_time: float = 0.4) -> None:
-    """Smoothly scroll from the top to the bottom of the page.
+# Scrolls the page once per animation frame until the row count and scrollHeight stop changing.
+# Arguments: rowSelector, targetRows, stableFrames, step, deadlineMs, observeMutations, callback
+SCROLL_UNTIL_STABLE_SCRIPT = """
+const [rowSelector, targetRows, stableFrames, step, deadlineMs, observeMutations, done] = arguments;
+const start = performance.now();
+const countRows = () => rowSelector ? document.querySelectorAll(rowSelector).length : 0;
+const pageHeight = () => Math.max(document.body.scrollHeight,
+                                 document.documentElement.scrollHeight);
+let lastHeight = -1, lastRows = -1, stable = 0, mutations = 0, observer = null;
+if (observeMutations && window.MutationObserver) {
+    observer = new MutationObserver((records) => { mutations += records.length; stable = 0; });
+    observer.observe(document.body, {childList: true, subtree: true});
+}
+const finish = (reason) => {
+    if (observer) observer.disconnect();
+    done({rows: countRows(), height: pageHeight(), elapsed: (performance.now() - start) / 1000,
+          reason: reason, mutations: mutations});
+};
+const tick = () => {
+    const height = pageHeight();
+    const rows = countRows();
+    if (targetRows && rows >= targetRows) return finish("target");
+    if (performance.now() - start > deadlineMs) return finish("deadline");
+    const atBottom = window.innerHeight + window.scrollY >= height - 2;
+    stable = (atBottom && height === lastHeight && rows === lastRows) ? stable + 1 : 0;
+    if (stable >= stableFrames) return finish("stable");
+    lastHeight = height;
+    lastRows = rows;
+    window.scrollBy(0, step || window.innerHeight);
+    requestAnimationFrame(tick);
+};
+window.scrollTo(0, 0);
+requestAnimationFrame(tick);
+"""
+
+@traced()
+def smooth_scroll_to_bottom(driver: WebDriver, row_selector: Optional[str] = None,
+                            target_rows: Optional[int] = None, scroll_step: int = 500,
+                            stable_frames: int = 30, deadline: float = 60,
+                            observe_mutations: bool = False) -> Dict[str, Any]:
+    """Scroll to the bottom of the page until lazy-loaded content stops growing.
+
+    Scrolling runs inside the browser, one step per animation frame, and stops as soon as
+    ``target_rows`` rows are present or the page is at the bottom with an unchanged
+    scrollHeight and row count for ``stable_frames`` consecutive frames.
 
     Parameters:
         driver (WebDriver): The WebDriver instance.
+        row_selector (Optional[str]): CSS selector for the rows being loaded, used for counting.
+        target_rows (Optional[int]): Stop as soon as this many rows are loaded.
         scroll_step (int): Pixels per scroll step.
-        wait_time (float): Time to wait after each scroll.
+        stable_frames (int): Frames without any change required before stopping (~60 per second).
+        deadline (float): Hard limit in seconds.
+        observe_mutations (bool): Also watch the DOM with a MutationObserver; any mutation
+            resets the stable count.
 
-    Raises:
-        Exception: If there is an error scrolling the page.
-    """
-    LOGGER.info("Resetting scroll position to the top...")
-    driver.execute_script("window.scrollTo(0, 0);")
-    time.sleep(0.1)
-    total_height = driver.execute_script("return document.body.scrollHeight")
-    current_position = 0
-    LOGGER.info(f"Starting smooth scroll to bottom... (Total Height: {total_height}px)")
-    while current_position < 2 * total_height:
-        current_position += scroll_step
-        driver.execute_script(f"window.scrollTo(0, {current_position});")
-        time.sleep(wait_time)  # Allow content to load smoothly
-
-    LOGGER.info("Finished scrolling to the bottom.")
-
-def extract_channel_data(driver: WebDriver, container_locator: tuple, channel_locator: tuple) -> List[WebElement]:
+    Returns:
+        Dict[str, Any]: 'rows' loaded, final 'height' in px, 'elapsed' seconds, the stop 'reason'
+        ('target', 'stable', 'deadline' or 'error') and the number of observed 'mutations'.
+    """
+    LOGGER.info("Scrolling to the bottom until the page stops growing...")
+    previous_timeout = driver.timeouts.script
+    driver.set_script_timeout(deadline + 5)
+    start_time = time.perf_counter()
+    try:
+        report = driver.execute_async_script(SCROLL_UNTIL_STABLE_SCRIPT, row_selector, target_rows,
+                                             stable_frames, scroll_step, int(deadline * 1000),
+                                             observe_mutations)
+    except Exception as e:
+        LOGGER.error(f"Error scrolling the page: {e}")
+        report = {"rows": None, "height": None, "elapsed": time.perf_counter() - start_time,
+                  "reason": "error", "mutations": 0}
+    finally:
+        driver.set_script_timeout(previous_timeout)
+
+    LOGGER.info(f"Finished scrolling in {report['elapsed']:.2f}s ({report['reason']}): "
+                f"{report['rows']} rows loaded, height {report['height']}px.")
+    return report
+
+@traced()
+def extract_channel_data(driver: WebDriver, container_locator: tuple,
+                         channel_locator: tuple) -> List[WebElement]:
     """Extract channel names from a given container.
 
     Parameters:
@@ -298,7 +1073,9 @@ def extract_channel_data(driver: WebDriver, container_locator: tuple, channel_lo
         Exception: If there is an error extracting channel data.
     """
     try:
-        container = WebDriverWait(driver, 10).until(EC.presence_of_element_located(container_locator))
+        container = WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located(container_locator)
+        )
         LOGGER.info("channel container div located")
         channels = container.find_elements(channel_locator[0], channel_locator[1])
         return channels
@@ -306,46 +1083,177 @@ def extract_channel_data(driver: WebDriver, container_locator: tuple, channel_lo
         LOGGER.error(f"Error extracting channels: {e}")
         return []
 
-def write_to_excel(df, output_file, sheet_name="Sheet1", index=False):
-    """Write DataFrame to Excel file."""
+def read_network_events(driver: WebDriver) -> List[Dict[str, Any]]:
+    """Return all DevTools network events seen by a driver during its current lease.
+
+    Drains the driver's performance log into a per-session buffer, so the events stay
+    available to later calls. The driver must have been started with capture_network.
+
+    Parameters:
+        driver (WebDriver): The WebDriver instance.
+
+    Returns:
+        List[Dict[str, Any]]: DevTools events as {'method': ..., 'params': ...} dicts.
+    """
+    new_events = []
+    for entry in driver.get_log("performance"):
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, TypeError, ValueError):
+            continue
+        if message.get("method", "").startswith("Network."):
+            new_events.append(message)
+    with _network_events_lock:
+        events = _network_events.setdefault(driver.session_id, [])
+        events.extend(new_events)
+        return list(events)
+
+def match_network_responses(events: List[Dict[str, Any]], url_pattern: str) -> List[Dict[str, Any]]:
+    """Select the responses whose URL matches a pattern from a list of DevTools events.
+
+    Parameters:
+        events (List[Dict[str, Any]]): Events from read_network_events.
+        url_pattern (str): Regular expression searched in each response URL.
+
+    Returns:
+        List[Dict[str, Any]]: One dict per matching response with 'request_id', 'url',
+        'status', 'mime_type' and whether loading has 'finished'.
+    """
+    pattern = re.compile(url_pattern)
+    finished = {event["params"].get("requestId") for event in events
+                if event.get("method") == "Network.loadingFinished"}
+    responses = []
+    for event in events:
+        if event.get("method") != "Network.responseReceived":
+            continue
+        response = event["params"].get("response", {})
+        if not pattern.search(response.get("url", "")):
+            continue
+        request_id = event["params"].get("requestId")
+        responses.append({
+            "request_id": request_id,
+            "url": response.get("url"),
+            "status": response.get("status"),
+            "mime_type": response.get("mimeType"),
+            "finished": request_id in finished,
+        })
+    return responses
+
+@traced()
+def capture_json_responses(driver: WebDriver, url_pattern: str) -> List[Dict[str, Any]]:
+    """Return the decoded JSON bodies of the network responses matching a URL pattern.
+
+    DirecTV builds its lineup from these payloads and skips walking the table; the other
+    scrapers only record them next to their DOM snapshot, which adds work to a scrape
+    rather than saving any. The driver must have been started with capture_network
+    (see load_page).
+
+    Parameters:
+        driver (WebDriver): The WebDriver instance.
+        url_pattern (str): Regular expression searched in each response URL.
+
+    Returns:
+        List[Dict[str, Any]]: One dict per response with 'url', 'status' and the parsed 'body'.
+        Responses whose body is unavailable or not valid JSON are skipped.
+    """
+    payloads = []
+    for response in match_network_responses(read_network_events(driver), url_pattern):
+        try:
+            result = driver.execute_cdp_cmd("Network.getResponseBody",
+                                            {"requestId": response["request_id"]})
+            body = result.get("body", "")
+            if result.get("base64Encoded"):
+                body = base64.b64decode(body).decode("utf-8")
+            payloads.append({"url": response["url"], "status": response["status"],
+                             "body": json.loads(body)})
+        except Exception as e:
+            LOGGER.warning(f"Could not read response body for {response['url']}: {e}")
+    LOGGER.info(f"Captured {len(payloads)} JSON responses matching {url_pattern}")
+    return payloads
+
+def wait_for_json_responses(driver: WebDriver, url_pattern: str, timeout: float = 10,
+                            poll: float = 0.25) -> List[Dict[str, Any]]:
+    """Wait until a response matching a URL pattern has finished loading, then return the
+    JSON bodies of all matching responses (see capture_json_responses).
+
+    Parameters:
+        driver (WebDriver): A WebDriver started with capture_network.
+        url_pattern (str): Regular expression searched in each response URL.
+        timeout (float): Seconds to wait for a finished response.
+        poll (float): Seconds between checks of the network log.
+
+    Returns:
+        List[Dict[str, Any]]: The decoded responses; empty if none finished in time.
+    """
+    deadline = time.monotonic() + timeout
+    while not any(response["finished"] for response in
+                  match_network_responses(read_network_events(driver), url_pattern)):
+        if time.monotonic() >= deadline:
+            LOGGER.warning(f"No response matching {url_pattern} after {timeout}s")
+            return []
+        time.sleep(poll)
+    return capture_json_responses(driver, url_pattern)
+
+@traced()
+def capture_html(driver: WebDriver, container_locator: Optional[tuple] = None,
+                 timeout: int = 10) -> str:
+    """Capture the outerHTML of a container, or the whole page source, in one round trip.
+
+    Parameters:
+        driver (WebDriver): The WebDriver instance.
+        container_locator (Optional[tuple]): Locator for the container element, or None for the
+            whole page.
+        timeout (int): Seconds to wait for the container to appear.
+
+    Returns:
+        str: The captured HTML, or an empty string if the container was not found.
+    """
+    if container_locator is None:
+        return driver.page_source
+
+    def read_container():
+        container = WebDriverWait(driver, timeout).until(
+            EC.presence_of_element_located(container_locator)
+        )
+        LOGGER.info("channel container div located")
+        return container.get_attribute("outerHTML") or ""
+
     try:
-        # Ensure file has .xlsx extension
-        if not output_file.endswith('.xlsx'):
-            output_file = output_file + '.xlsx'
-            
-        with pd.ExcelWriter(output_file, engine='xlsxwriter') as writer:
-            df.to_excel(writer, sheet_name=sheet_name, index=index)
-            
-            # Get workbook and worksheet objects
-            workbook = writer.book
-            worksheet = writer.sheets[sheet_name]
-            
-            # Add some formatting
-            header_format = workbook.add_format({
-                'bold': True,
-                'text_wrap': True,
-                'valign': 'top',
-                'bg_color': '#D9E1F2',
-                'border': 1
-            })
-            
-            # Write the column headers with the defined format
-            for col_num, value in enumerate(df.columns.values):
-                worksheet.write(0, col_num + (1 if index else 0), value, header_format)
-                
-            # Adjust column widths
-            for i, col in enumerate(df.columns):
-                max_len = max(
-                    df[col].astype(str).apply(len).max(),
-                    len(col)
-                )
-                worksheet.set_column(i + (1 if index else 0), i + (1 if index else 0), max_len + 2)
-                
-        LOGGER.info(f"Successfully wrote data to {output_file}")
-        return True
+        # A re-render between locating and reading only needs the container found again
+        return relocate_on_stale(read_container)
     except Exception as e:
-        LOGGER.error(f"Error writing to Excel: {str(e)}")
-        return False
+        LOGGER.error(f"Error capturing container HTML: {e}")
+        return ""
+
+def save_snapshot(name: str, snapshot: Dict[str, Any]) -> Optional[str]:
+    """Save a captured page snapshot to SNAPSHOT_DIR so it can be parsed again offline.
+
+    Does nothing unless SNAPSHOT_DIR is set in the config.
+
+    Parameters:
+        name (str): File name (without extension), usually the provider name.
+        snapshot (Dict[str, Any]): The captured HTML fragments, keyed by section.
+
+    Returns:
+        Optional[str]: The path written, or None if snapshots are disabled or the write failed.
+    """
+    if not SNAPSHOT_DIR:
+        return None
+    try:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        path = os.path.join(SNAPSHOT_DIR, f"{name}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+        LOGGER.info(f"Snapshot saved to {path}")
+        return path
+    except OSError as e:
+        LOGGER.error(f"Error saving snapshot {name}: {e}")
+        return None
+
+def load_snapshot(path: str) -> Dict[str, Any]:
+    """Load a snapshot written by save_snapshot."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
 
 def write_to_csv(df: pd.DataFrame, output_file: str, index: bool = False) -> None:
     """Write a DataFrame to a CSV file.
@@ -361,6 +1269,33 @@ def write_to_csv(df: pd.DataFrame, output_file: str, index: bool = False) -> Non
     df.to_csv(output_file, index=index)
     LOGGER.info(f"Data saved to {output_file}")
 
+def write_to_jsonl(df: pd.DataFrame, output_file: str) -> None:
+    """Write a DataFrame as JSON Lines, one object per row, with missing values as null.
+
+    Parameters:
+        df (pd.DataFrame): The DataFrame to write.
+        output_file (str): The path to the output .jsonl file.
+
+    Raises:
+        Exception: If there is an error writing the file.
+    """
+    df.to_json(output_file, orient="records", lines=True, force_ascii=False)
+    LOGGER.info(f"Data saved to {output_file}")
+
+def write_to_parquet(df: pd.DataFrame, output_file: str) -> None:
+    """Write a DataFrame to a Parquet file, without the index.
+
+    Parameters:
+        df (pd.DataFrame): The DataFrame to write.
+        output_file (str): The path to the output .parquet file.
+
+    Raises:
+        ImportError: If pyarrow isn't installed.
+        Exception: If there is an error writing the file.
+    """
+    df.to_parquet(output_file, index=False)
+    LOGGER.info(f"Data saved to {output_file}")
+
 def move_mouse_randomly(driver: WebDriver) -> None:
     """Move the mouse randomly on the page to simulate human interaction.
 
@@ -377,35 +1312,214 @@ def move_mouse_randomly(driver: WebDriver) -> None:
         actions.move_by_offset(x_offset, y_offset).perform()
         time.sleep(random.uniform(0.1, 0.5))
 
-def parallel_scrape(scrapers, max_workers = 2):
-    """Run multiple scrapers in parallel using concurrent.futures.
+def default_max_workers() -> int:
+    """Size the scraper concurrency from the CPU and memory headroom reported by psutil.
+
+    Returns:
+        int: The number of idle CPUs or the number of browsers that fit in available memory,
+        whichever is smaller, and at least 1.
+    """
+    cpus = psutil.cpu_count(logical=True) or 1
+    idle_cpus = int(cpus * (100 - psutil.cpu_percent(interval=0.2)) / 100)
+    memory_slots = int(psutil.virtual_memory().available / (DRIVER_MEMORY_MB * 1024 * 1024))
+    workers = max(1, min(idle_cpus, memory_slots))
+    LOGGER.info(f"Using {workers} workers ({idle_cpus} idle CPUs, "
+                f"room for {memory_slots} browsers)")
+    return workers
+
+def resolve_max_workers(max_workers: Optional[int] = None) -> int:
+    """Return ``max_workers`` if set, else MAX_WORKERS, else the CPU/memory headroom."""
+    return max_workers or MAX_WORKERS or default_max_workers()
+
+def _job_label(key, job) -> str:
+    return f"{key} ({job[0].__name__})"
+
+def _scrape_in_process(conn, scraper, args, trace=False, profile=False):
+    """Entry point of a process-mode job: run the scraper and send ("ok", result, spans, commands)
+    or ("error", message, spans, commands)."""
+    # Only this job's browsers belong to this process; don't sweep other jobs' chromedrivers on exit
+    atexit.unregister(cleanup_chrome_drivers)
+    if trace:
+        Tracing.enable()
+    if profile:
+        CommandProfiler.enable(top=None)  # Counts go to the parent, which reports them
+    try:
+        result = scraper(*args)
+        conn.send(("ok", result, Tracing.collect(), CommandProfiler.collect()))
+    except Exception as e:
+        conn.send(("error", f"{type(e).__name__}: {e}", Tracing.collect(),
+                   CommandProfiler.collect()))
+    finally:
+        _quit_owned_drivers()
+        conn.close()
+
+def _run_in_process(scraper, args, label, timeout=None):
+    """Run one scraper in its own process and return its result.
+
+    Raises:
+        RuntimeError: If the scraper raised, or its process died without sending a result.
+        TimeoutError: If no result came within ``timeout`` seconds; the process and its
+            browsers are killed.
+    """
+    # Start clean, without the parent's drivers or threads
+    context = multiprocessing.get_context("spawn")
+    parent_conn, child_conn = context.Pipe(duplex=False)
+    process = context.Process(target=_scrape_in_process,
+                              args=(child_conn, scraper, args, Tracing.is_enabled(),
+                                    CommandProfiler.is_enabled()),
+                              name=label, daemon=True)
+    process.start()
+    child_conn.close()
+    try:
+        if not parent_conn.poll(timeout):
+            killed = kill_process_tree(process.pid)
+            raise TimeoutError(f"No result after {timeout}s; killed its process tree "
+                               f"({killed} processes)")
+        try:
+            status, payload, spans, commands = parent_conn.recv()
+        except EOFError:
+            process.join()
+            raise RuntimeError(f"Process exited with code {process.exitcode} without a result")
+        # The job's spans keep its process id, so it shows as its own process in the trace
+        Tracing.merge(spans)
+        CommandProfiler.merge(commands)
+        if status == "error":
+            raise RuntimeError(payload)
+        return payload
+    finally:
+        parent_conn.close()
+        process.join()
+
+def _run_job(job, scraper, args):
+    """Run a thread-mode scraper job, tagging the drivers it leases as its own."""
+    token = _current_job.set(job)
+    try:
+        return scraper(*args)
+    finally:
+        _current_job.reset(token)
+        with _jobs_lock:
+            _cancelled_jobs.discard(job)
+            _job_started.pop(job, None)
+            for driver in [driver for driver, owner in _driver_jobs.items() if owner == job]:
+                del _driver_jobs[driver]
+
+def parallel_scrape(jobs: Dict[Any, tuple], max_workers: Optional[int] = None,
+                    executor: str = EXECUTOR,
+                    on_result: Optional[Callable[[Any, Any], None]] = None,
+                    timeout: Optional[float] = JOB_TIMEOUT) -> Dict[Any, Any]:
+    """Run multiple scrapers in parallel.
+
+    In "thread" mode scrapers share this process and its driver pools. In "process" mode each
+    scraper runs in its own process, so a scraper that crashes its interpreter or leaks
+    memory only loses its own result.
+
+    A scraper still running ``timeout`` seconds after it got its first browser (time spent
+    waiting for a free pooled driver doesn't count; in process mode, after its process
+    started) is stopped: its own chromedriver and Chrome processes (or, in process mode, its
+    whole process tree) are killed and its result is None. The other scrapers carry on.
 
     Parameters:
-        scrapers: A list of tuples, each containing (scraper_function, mode).
+        jobs: Mapping of a key (e.g. the provider name) to (scraper_function, mode, *extra_args),
+            e.g. {"directv": (scrape_directv, "headless", "79423")}.
+        max_workers: Maximum number of scrapers running at once; defaults to MAX_WORKERS, or to
+            the CPU/memory headroom when that isn't configured. In thread mode the driver pools
+            are grown to at least this size (see ensure_driver_pool_size).
+        executor: "thread" or "process".
+        on_result: Optional function called with (key, result) as each scraper finishes,
+            e.g. to start writing its output while the others are still running.
+        timeout: Wall-clock seconds each scraper may run; defaults to JOB_TIMEOUT. None for no
+            deadline.
 
     Returns:
-        A list of results from each scraper.
+        A dict mapping each key to its scraper's result; None for scrapers that failed or timed out.
 
     Raises:
-        Exception: If there is an error in parallel scraping.
+        ValueError: If the executor isn't "thread" or "process".
     """
-    results = []
+    if executor not in ("thread", "process"):
+        raise ValueError(f"Unknown executor: {executor}")
+    max_workers = resolve_max_workers(max_workers)
+    if executor == "thread":
+        # Every thread-mode scraper leases a pooled browser; a smaller pool would leave the
+        # extra threads waiting in lease()
+        ensure_driver_pool_size(max_workers)
+
+    results = dict.fromkeys(jobs)
+    timed_out = False
+    # Process jobs are driven from threads too; each thread just waits on its process
+    pool = concurrent.futures.ThreadPoolExecutor(max_workers)
     try:
-        with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:  # Limit concurrent scrapers
-            futures = [executor.submit(scraper, mode) for scraper, mode in scrapers]
-            for future in concurrent.futures.as_completed(futures):
+        futures = {}
+        for key, (scraper, *args) in jobs.items():
+            if executor == "process":
+                label = _job_label(key, jobs[key])
+                futures[pool.submit(_run_in_process, scraper, args, label, timeout)] = (key, None)
+            else:
+                job = next(_job_ids)
+                futures[pool.submit(_run_job, job, scraper, args)] = (key, job)
+
+        pending = set(futures)
+        while pending:
+            # Wake up now and then to check the thread-mode deadlines; process jobs
+            # enforce their own
+            poll = DEADLINE_POLL if timeout and executor == "thread" else None
+            done, pending = concurrent.futures.wait(pending, timeout=poll,
+                                                    return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                key, _ = futures[future]
                 try:
-                    results.append(future.result())
-                    LOGGER.info(f"Scraper {results.index(future.result())} completed.")
+                    results[key] = future.result()
+                    LOGGER.info(f"Scraper {_job_label(key, jobs[key])} completed.")
                 except Exception as e:
-                    LOGGER.error(f"Error in parallel scraping: {e}")
+                    LOGGER.error(f"Error in parallel scraping {_job_label(key, jobs[key])}: {e}")
+                if on_result:
+                    on_result(key, results[key])
+
+            if timeout and executor == "thread":
+                now = time.monotonic()
+                for future in list(pending):
+                    key, job = futures[future]
+                    with _jobs_lock:
+                        started = _job_started.get(job)
+                    if started is not None and now - started > timeout:
+                        pending.discard(future)
+                        timed_out = True
+                        killed = terminate_job_drivers(job)
+                        LOGGER.error(f"Scraper {_job_label(key, jobs[key])} exceeded its "
+                                     f"{timeout}s deadline; killed its {killed} browser(s) "
+                                     f"and moved on without its result")
+                        if on_result:
+                            on_result(key, None)
     finally:
+        # A timed-out scraper's thread unwinds on its own once its browsers are gone;
+        # don't wait for it
+        pool.shutdown(wait=not timed_out)
         cleanup_chrome_drivers()  # Ensure cleanup after parallel scraping
         LOGGER.info(f"Parallel Scraping Completed.")
     return results
 
-def retry_operation(operation, max_retries: int = 3, delay: float = 1.0):
-    """Retry a given operation a specified number of times."""
+def retry_operation(operation, max_retries: int = RETRY_ATTEMPTS, delay: float = RETRY_DELAY,
+                    backoff: float = 2.0, jitter: float = 0.5,
+                    on_retry: Optional[Callable[[int, Exception], None]] = None):
+    """Call an operation until it succeeds, waiting exponentially longer between attempts.
+
+    Parameters:
+        operation: Function called without arguments.
+        max_retries (int): Attempts in total.
+        delay (float): Seconds to wait before the first retry; multiplied by ``backoff`` for
+            each later one.
+        backoff (float): Growth factor of the wait.
+        jitter (float): Up to this fraction of the wait is added at random, so scrapers that
+            failed together don't all retry at the same moment.
+        on_retry: Optional function called with (attempt number, error) before each retry,
+            e.g. to reload the page.
+
+    Returns:
+        The operation's result.
+
+    Raises:
+        Exception: The last attempt's error, once every attempt failed.
+    """
     for attempt in range(max_retries):
         try:
             return operation()
@@ -413,5 +1527,9 @@ def retry_operation(operation, max_retries: int = 3, delay: float = 1.0):
             if attempt == max_retries - 1:
                 LOGGER.error(f"Operation failed after {max_retries} attempts: {e}")
                 raise
-            LOGGER.warning(f"Attempt {attempt + 1} failed, retrying...")
-            time.sleep(delay)
\ No newline at end of file
+            wait = delay * backoff ** attempt
+            wait += random.uniform(0, wait * jitter)
+            LOGGER.warning(f"Attempt {attempt + 1} failed ({e}), retrying in {wait:.1f}s...")
+            time.sleep(wait)
+            if on_retry:
+                on_retry(attempt + 1, e)
@@ -0,0 +1,123 @@
+import math
+from typing import Iterable, List, Sequence
+import xlsxwriter
+from src.LineupResult import CHECK_MARK, LineupResult
+from src.WebDriverUtils import LOGGER
+
+# Variables for flexibility
+HEADER_FORMAT = {
+    'bold': True,
+    'text_wrap': True,
+    'valign': 'top',
+    'bg_color': '#D9E1F2',
+    'border': 1
+}
+SHEET_NAME_LIMIT = 31  # Excel's maximum sheet name length
+
+def _is_blank(value) -> bool:
+    return (value is None or (isinstance(value, str) and not value)
+            or (isinstance(value, float) and math.isnan(value)))
+
+class WorkbookWriter:
+    """One .xlsx workbook written sheet by sheet in xlsxwriter's constant_memory mode.
+
+    Every row goes to disk as soon as the next one starts, and column widths are tracked
+    while the rows go by, so memory stays flat however many lineups and ZIP codes a run has.
+    Rows must be given in order, and a sheet can't be changed once the next one is added.
+    """
+
+    def __init__(self, output_file: str):
+        # Ensure file has .xlsx extension
+        if not output_file.endswith('.xlsx'):
+            output_file = output_file + '.xlsx'
+        self.output_file = output_file
+        self.workbook = xlsxwriter.Workbook(output_file, {'constant_memory': True})
+        self.header_format = self.workbook.add_format(HEADER_FORMAT)
+        self.sheet_names: List[str] = []
+
+    def add_sheet(self, sheet_name: str, columns: Sequence[str], rows: Iterable[Sequence],
+                  active: bool = False) -> int:
+        """Stream rows into a new sheet under a formatted header row.
+
+        Parameters:
+            sheet_name (str): Sheet name; cut to Excel's 31 characters.
+            columns (Sequence[str]): Column headers.
+            rows (Iterable[Sequence]): Row values in column order. None, NaN and '' leave a
+                cell empty.
+            active (bool): Open the workbook on this sheet.
+
+        Returns:
+            int: The number of rows written, not counting the header.
+        """
+        worksheet = self.workbook.add_worksheet(sheet_name[:SHEET_NAME_LIMIT])
+        self.sheet_names.append(worksheet.name)
+        worksheet.write_row(0, 0, columns, self.header_format)
+        widths = [len(str(column)) for column in columns]
+
+        count = 0
+        for count, row in enumerate(rows, start=1):
+            for col, value in enumerate(row):
+                if _is_blank(value):
+                    continue
+                worksheet.write(count, col, value)
+                width = len(str(value))
+                if width > widths[col]:
+                    widths[col] = width
+
+        for col, width in enumerate(widths):
+            worksheet.set_column(col, col, width + 2)
+        if active:
+            worksheet.activate()
+        return count
+
+    def add_lineup(self, sheet_name: str, lineup: LineupResult, sort: bool = True,
+                   active: bool = False) -> int:
+        """Stream a provider's lineup into a sheet, with the same columns as
+        LineupResult.to_dataframe().
+
+        Rows are rendered from the plan bitmasks one at a time, without building a DataFrame.
+        With ``sort`` they are ordered by channel name.
+        """
+        numbers = ["Channel Number"] if lineup.has_numbers else []
+        columns = ["Channel Name"] + numbers + lineup.plans
+        order = range(len(lineup))
+        if sort:
+            order = sorted(order, key=lineup.channels.__getitem__)
+
+        def rows():
+            with_numbers = lineup.has_numbers
+            for i in order:
+                mask = lineup.masks[i]
+                row = [lineup.channels[i]]
+                if with_numbers:
+                    row.append(lineup.numbers[i])
+                row.extend(CHECK_MARK if mask >> plan & 1 else ""
+                           for plan in range(len(lineup.plans)))
+                yield row
+
+        return self.add_sheet(sheet_name, columns, rows(), active=active)
+
+    def add_dataframe(self, sheet_name: str, df, active: bool = False) -> int:
+        """Stream a DataFrame's rows into a sheet, leaving out the index."""
+        return self.add_sheet(sheet_name, [str(column) for column in df.columns],
+                              df.itertuples(index=False, name=None), active=active)
+
+    def close(self) -> bool:
+        """Finish the workbook.
+
+        Returns:
+            bool: True if the file was written.
+        """
+        try:
+            self.workbook.close()
+            LOGGER.info(f"Successfully wrote {len(self.sheet_names)} sheets to {self.output_file}")
+            return True
+        except Exception as e:
+            LOGGER.error(f"Error writing to Excel: {str(e)}")
+            return False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -1,39 +1,67 @@
-import os
-import pandas as pd
 from selenium.webdriver.common.by import By
-from src.WebDriverUtils import ZIPCODE, OUTPUT_DIR, LOGGER, load_page, click_element, extract_channel_data, write_to_excel
+from src.LineupResult import LineupResult
+from src.HtmlSnapshot import parse_table_html
+from src.Tracing import traced
+from src.WebDriverUtils import (ZIPCODE, API_CAPTURE, LOGGER, load_page, capture_json_responses,
+                                click_element, capture_html, save_snapshot, release_driver)
 
 # Variables for flexibility
-YOUTUBE_TV_URL = f"https://tv.youtube.com/welcome/?utm_servlet=prod&rd_rsn=asi&zipcode={ZIPCODE}"
+SCRAPER_VERSION = 2
+YOUTUBE_TV_URL = "https://tv.youtube.com/welcome/?utm_servlet=prod&rd_rsn=asi&zipcode={zipcode}"
 SUBMIT_BUTTON_CLASS = "tv-network-browser__input-area-submit"
 CHANNELS_DIV_CLASS = "tv-network-matrix__body"
 CHANNEL_TAG = "img"
 CHANNEL_NAME_CLASS = 'alt'
-OUTPUT_FILE = os.path.join(OUTPUT_DIR, "YoutubeTVChannelList.xlsx")
 
-def scrape_youtube_tv(mode="headless"):
-    """Scrapes live channel data from YoutubeTV."""
-    driver = load_page(mode, "YoutubeTV", YOUTUBE_TV_URL)
-    channel_names = []
-    try:
-        # Locate and click the submit button to pull channel list
-        click_element(driver, (By.CLASS_NAME, SUBMIT_BUTTON_CLASS))
-        LOGGER.info("Compare plans window opened successfully.")
+@traced("capture", provider="youtube")
+def capture_youtube_tv(driver):
+    """Submit the ZIP code form and capture the network matrix HTML.
+
+    Returns:
+        dict: The channel matrix outerHTML.
+    """
+    # Locate and click the submit button to pull channel list
+    click_element(driver, (By.CLASS_NAME, SUBMIT_BUTTON_CLASS))
+    LOGGER.info("Compare plans window opened successfully.")
+
+    return {"channels": capture_html(driver, (By.CLASS_NAME, CHANNELS_DIV_CLASS))}
 
-        channels = extract_channel_data(driver, (By.CLASS_NAME, CHANNELS_DIV_CLASS), (By.TAG_NAME, CHANNEL_TAG))
-        LOGGER.info(f"Extracted {len(channels)} channels for youtube.")
+@traced("parse", provider="youtube")
+def parse_youtube_tv(snapshot):
+    """Parse a YoutubeTV snapshot into its channel lineup."""
+    channels = parse_table_html(snapshot["channels"], CHANNEL_TAG, attribute=CHANNEL_NAME_CLASS)
+    LOGGER.info(f"Extracted {len(channels)} channels for youtube.")
 
-        for channel in channels:
-            channel_names.append(channel.get_attribute(CHANNEL_NAME_CLASS)) # Extract only the first matched string
+    # Channel names come from the logo alt text
+    lineup = LineupResult("youtube")
+    for channel in channels:
+        if channel["value"]:
+            lineup.add(channel["value"])
+    return lineup
+
+@traced("scrape", provider="youtube", arg_tags={"zipcode": "zip"})
+def scrape_youtube_tv(mode="headless", zipcode=ZIPCODE):
+    """Scrapes live channel data from YoutubeTV for a ZIP code."""
+    api_pattern = API_CAPTURE.get("youtube")
+    driver = load_page(mode, "YoutubeTV", YOUTUBE_TV_URL.format(zipcode=zipcode),
+                       capture_network=bool(api_pattern), provider="youtube")
+    lineup = LineupResult("youtube")
+    try:
+        snapshot = capture_youtube_tv(driver)
+        if api_pattern:
+            # Record the lineup JSON for offline study; the lineup itself is still parsed
+            # from the DOM
+            snapshot["api"] = capture_json_responses(driver, api_pattern)
 
-        # Convert data to dataframe
-        df_youtube_tv = pd.DataFrame(channel_names, columns=["Channel Name"])
+        # The browser is not needed once the DOM is captured
+        release_driver(driver)
+        driver = None
+        save_snapshot(f"youtube_{zipcode}", snapshot)
 
-        # Save to excel with formatting
-        write_to_excel(df_youtube_tv, OUTPUT_FILE, sheet_name="YoutubeTV Channels")
-        return channel_names
+        lineup = parse_youtube_tv(snapshot)
     except Exception as e:
         LOGGER.error(f"Error: {e}")
 
     finally:
-        driver.quit()
\ No newline at end of file
+        release_driver(driver)
+        return lineup
@@ -4,17 +4,41 @@ import os
 # Default configuration
 DEFAULT_CONFIG = {
     "ZIPCODE": "79423",
-    "OUTPUT_DIR": "./output/"
+    "OUTPUT_DIR": "./output/",
+    "DRIVER_POOL_SIZE": 2,
+    "MAX_WORKERS": None,
+    "EXECUTOR": "thread",
+    "CACHE_MAX_AGE_HOURS": 168,
+    "CHECKPOINT_MAX_AGE_HOURS": 24,
+    "RETRY_ATTEMPTS": 3,
+    "RETRY_DELAY": 2.0,
+    "JOB_TIMEOUT": 900,
+    "MATCH_THRESHOLD": 0.85,
+    "CHROMEDRIVER_PATH": None,
+    "SNAPSHOT_DIR": None,
+    "API_CAPTURE": {},
+    "LEAN_MODE": False,
+    "LEAN_BLOCKED_URLS": [
+        "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+        "*.woff", "*.woff2", "*.ttf", "*.otf",
+        "*.mp4", "*.webm", "*.m3u8", "*.ts",
+        "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+        "*facebook.net*", "*hotjar.com*", "*optimizely.com*", "*adobedtm.com*"
+    ],
+    "LEAN_PROVIDERS": {}
 }
 
 CONFIG_FILE = "config.json"
 
 def load_config():
-    """Load configuration from config.json, or use defaults if file doesn't exist."""
+    """Load configuration from config.json, or use defaults if file doesn't exist.
+
+    Keys missing from config.json fall back to their default values.
+    """
     if os.path.exists(CONFIG_FILE):
         with open(CONFIG_FILE, 'r') as f:
-            return json.load(f)
-    return DEFAULT_CONFIG
+            return {**DEFAULT_CONFIG, **json.load(f)}
+    return dict(DEFAULT_CONFIG)
 
 def save_config(config):
     """Save configuration to config.json."""
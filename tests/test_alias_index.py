@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from src.AliasIndex import AliasIndex, load_alias_index
+import src.AliasIndex as AliasIndexModule
+
+CSV = "\ufeffabc,kamc,abc (kamc - lubbock)\nacc network ,acc network (local),,\n"
+
+class TestAliasIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.csv = os.path.join(self.tmp.name, "channels.csv")
+        self.artifact = os.path.join(self.tmp.name, "channels.idx")
+        with open(self.csv, "w", encoding="utf-8") as f:
+            f.write(CSV)
+        AliasIndexModule._loaded.clear()
+
+    def test_first_row_and_bom(self):
+        """The CSV has no header: the first row is a channel, and the BOM isn't part of its name."""
+        index = AliasIndex.from_csv(self.csv)
+        self.assertEqual(index["kamc"], "abc")
+        self.assertEqual(index.normalize(" ACC Network (Local) "), "acc network")
+        self.assertEqual(index.aliases("abc"), ["abc", "kamc", "abc (kamc - lubbock)"])
+        index.normalize(" ACC Network (Local) ")
+        self.assertEqual(index.normalize.cache_info().hits, 1)
+
+    def test_artifact_rebuilt_only_on_change(self):
+        load_alias_index(self.csv, self.artifact)
+        AliasIndexModule._loaded.clear()
+        with mock.patch.object(AliasIndex, "from_csv", side_effect=AssertionError("recompiled")):
+            self.assertEqual(load_alias_index(self.csv, self.artifact)["kamc"], "abc")
+            # A new mtime with the same content is settled by the hash
+            os.utime(self.csv, ns=(1, 1))
+            self.assertEqual(load_alias_index(self.csv, self.artifact)["kamc"], "abc")
+
+        with open(self.csv, "a", encoding="utf-8") as f:
+            f.write("espn,espn hd\n")
+        self.assertEqual(load_alias_index(self.csv, self.artifact)["espn hd"], "espn")
+
+    def test_no_pandas_import(self):
+        code = ("import sys, src.AliasIndex as a; a.load_alias_index(sys.argv[1], None); "
+                "print('pandas' in sys.modules)")
+        output = subprocess.run([sys.executable, "-c", code, self.csv], capture_output=True,
+                                text=True, check=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        self.assertEqual(output.stdout.strip(), "False")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import os
+import tempfile
+import unittest
+from src.AliasIndex import AliasIndex
+from src.ChannelMatcher import ChannelMatcher
+
+ALIASES = AliasIndex(
+    {"abc": "abc", "kamc": "abc", "acc network": "acc network", "fox sports 1": "fox sports 1",
+     "cbs sports net": "cbs sports net", "cbs sports network": "cbs sports net"},
+    {"abc": ["abc", "kamc"], "acc network": ["acc network"], "fox sports 1": ["fox sports 1"],
+     "cbs sports net": ["cbs sports net", "cbs sports network"]},
+)
+
+class TestChannelMatcher(unittest.TestCase):
+    def test_resolve(self):
+        matcher = ChannelMatcher(ALIASES, threshold=0.85)
+        self.assertEqual(matcher.resolve("abc (klbk - lubbock)", "Dish"), "abc")
+        self.assertEqual(matcher.resolve("acc network hd", "Fubo"), "acc network")
+        self.assertEqual(matcher.resolve("cbs sports-network", "Sling"), "cbs sports net")
+        # Similar names with different numbers are different channels
+        self.assertEqual(matcher.resolve("fox sports 2", "Hulu"), "fox sports 2")
+        self.assertEqual(matcher.unresolved()[0][0], "fox sports 2")
+        self.assertEqual(matcher.unresolved()[0][3], ["Hulu"])
+
+    def test_cache_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "matches.json")
+            matcher = ChannelMatcher(ALIASES)
+            matcher.resolve("acc network hd")
+            matcher.save(path)
+
+            self.assertEqual(ChannelMatcher(ALIASES).load(path), 1)
+            # Different aliases or threshold invalidate the saved matches
+            self.assertEqual(ChannelMatcher(ALIASES, threshold=0.5).load(path), 0)
+
+            report = os.path.join(tmp, "unresolved.csv")
+            matcher.resolve("espn classic", "Sling")
+            self.assertEqual(matcher.write_unresolved_report(report), 1)
+
+if __name__ == "__main__":
+    unittest.main()
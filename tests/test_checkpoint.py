@@ -0,0 +1,106 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import src.DishTV as DishTV
+import src.FuboTV as FuboTV
+from src.Checkpoint import Checkpoint
+from src.LineupResult import LineupResult
+from src.WebDriverUtils import retry_operation
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "checkpoints.sqlite")
+        # No real waiting between retries
+        patcher = mock.patch("src.WebDriverUtils.time.sleep")
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_retry_backs_off_with_jitter(self):
+        operation = mock.Mock(side_effect=[ValueError("1"), ValueError("2"), "ok"])
+        on_retry = mock.Mock()
+        result = retry_operation(operation, max_retries=3, delay=1.0, on_retry=on_retry)
+        self.assertEqual(result, "ok")
+        first, second = (call.args[0] for call in self.sleep.call_args_list)
+        self.assertTrue(1.0 <= first <= 1.5 and 2.0 <= second <= 3.0)
+        self.assertEqual([call.args[0] for call in on_retry.call_args_list], [1, 2])
+
+    def test_rerun_only_repeats_failed_plans(self):
+        """A plan that fails every attempt is left out; the next run resumes the others and
+        retries only it."""
+        plans = {"Top 120": "plan-120", "Top 200": "plan-200", "Top 250": "plan-250"}
+        loads = []
+
+        def capture_page(mode, plan_name, plan_url, zipcode):
+            loads.append(plan_name)
+            if plan_name == "Top 200" and len(loads) < 6:
+                raise TimeoutError("channel list never appeared")
+            return (f"<div class='cmp-singlepackageclu__channel'>"
+                    f"<p>{plan_url} - {plan_name}</p></div>")
+
+        with mock.patch.object(DishTV, "capture_dish_plan_page", side_effect=capture_page):
+            with Checkpoint("dish", "10001", 2, self.path) as checkpoint:
+                pages = DishTV.capture_dish_pages("headless", plans, "10001", max_workers=1,
+                                                  checkpoint=checkpoint)
+                lineup = DishTV.parse_dishtv({"plans": plans, "pages": pages})
+                checkpoint.finish(lineup)
+            self.assertEqual(lineup.plans, ["Top 120", "Top 250"])
+            self.assertFalse(lineup.complete)
+            self.assertEqual(lineup.provenance["Top 200"]["attempts"], 3)
+
+            with Checkpoint("dish", "10001", 2, self.path) as checkpoint:
+                pages = DishTV.capture_dish_pages("headless", plans, "10001", max_workers=1,
+                                                  checkpoint=checkpoint)
+                lineup = DishTV.parse_dishtv({"plans": plans, "pages": pages})
+                checkpoint.finish(lineup)
+
+        self.assertEqual(loads, ["Top 120", "Top 200", "Top 200", "Top 200", "Top 250", "Top 200"])
+        self.assertEqual(lineup.plans, list(plans))
+        self.assertTrue(lineup.complete)
+        self.assertEqual({step: record["source"] for step, record in lineup.provenance.items()},
+                         {"Top 120": "checkpoint", "Top 200": "scraped", "Top 250": "checkpoint"})
+        # A complete scrape clears its checkpoint
+        with Checkpoint("dish", "10001", 2, self.path) as checkpoint:
+            self.assertIsNone(checkpoint.get("Top 120"))
+
+    def test_fully_checkpointed_fubo_skips_the_page_load(self):
+        with Checkpoint("fubo", "10001", FuboTV.SCRAPER_VERSION, self.path) as checkpoint:
+            for plan in FuboTV.PLAN_CONTAINERS:
+                checkpoint.run(plan, lambda: f"<div><div class='{FuboTV.CHANNEL_CLASS}'>"
+                                             f"<img title='ESPN'></div></div>")
+
+        path = self.path
+        with mock.patch.object(FuboTV, "Checkpoint", lambda *args: Checkpoint(*args, path=path)), \
+                mock.patch.object(FuboTV, "load_page") as load_page, \
+                mock.patch.object(FuboTV, "save_snapshot"):
+            lineup = FuboTV.scrape_fubo_tv("headless", "10001")
+        load_page.assert_not_called()
+        self.assertEqual(lineup.plans, list(FuboTV.PLAN_CONTAINERS))
+        self.assertEqual(set(lineup.channels), {"ESPN"})
+        sources = {record["source"] for record in lineup.provenance.values()}
+        self.assertEqual(sources, {"checkpoint"})
+
+    def test_stale_and_other_version_steps_are_ignored(self):
+        with Checkpoint("fubo", "10001", 2, self.path) as checkpoint:
+            checkpoint.run("Pro", lambda: "<div></div>")
+        with Checkpoint("fubo", "10001", 3, self.path) as checkpoint:
+            self.assertIsNone(checkpoint.get("Pro"))
+        with Checkpoint("fubo", "10001", 2, self.path, max_age=0) as checkpoint:
+            self.assertIsNone(checkpoint.get("Pro"))
+
+    def test_provenance_survives_pickling(self):
+        lineup = LineupResult("fubo", ["Pro"])
+        lineup.add("ESPN", [True])
+        lineup.provenance = {"Pro": {"source": "scraped", "attempts": 2}}
+        copy = LineupResult.__new__(LineupResult)
+        copy.__setstate__(lineup.__getstate__())
+        self.assertEqual(copy.provenance, lineup.provenance)
+        # Results cached before provenance was kept
+        copy.__setstate__(lineup.__getstate__()[:5])
+        self.assertEqual(copy.provenance, {})
+        self.assertTrue(copy.complete)
+
+if __name__ == "__main__":
+    unittest.main()
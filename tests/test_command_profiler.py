@@ -0,0 +1,52 @@
+import unittest
+from unittest import mock
+from selenium.webdriver.remote.errorhandler import ErrorHandler
+from selenium.webdriver.remote.webdriver import WebDriver
+from src import CommandProfiler, WebDriverUtils
+
+class FakeConnection:
+    def execute(self, command, params):
+        return {"value": 1200}
+
+def fake_driver():
+    """A Selenium WebDriver without a browser behind it; every command returns 1200."""
+    driver = object.__new__(WebDriver)
+    driver.command_executor = FakeConnection()
+    driver.session_id = "session"
+    driver.error_handler = ErrorHandler()
+    return driver
+
+class TestCommandProfiler(unittest.TestCase):
+    def setUp(self):
+        CommandProfiler.collect()
+        self.addCleanup(CommandProfiler.collect)
+
+    def test_commands_attributed_to_calling_line(self):
+        """Commands sent through a WebDriverUtils helper are counted against the scraper line
+        calling it."""
+        driver = CommandProfiler.instrument(fake_driver())
+        for _ in range(3):
+            driver.execute_script("return 1;")
+        self.assertEqual(WebDriverUtils.get_page_load_time(driver), 1.2)
+
+        rows = CommandProfiler.summarize()
+        direct, via_helper = sorted(rows, key=lambda row: row["count"], reverse=True)
+        self.assertEqual(direct["count"], 3)
+        self.assertIn("test_command_profiler.py", direct["site"])
+        self.assertIsNone(direct["via"])
+        self.assertEqual(direct["commands"], {"w3cExecuteScript": 3})
+        self.assertIn("test_commands_attributed_to_calling_line", via_helper["site"])
+        self.assertIn("WebDriverUtils.py", via_helper["via"])
+        self.assertIn("get_page_load_time", via_helper["via"])
+
+    def test_merge_and_report(self):
+        CommandProfiler.merge({("DishTV.py:80 capture_plan", None, "findElements"): [4, 0.2]})
+        CommandProfiler.merge({("DishTV.py:80 capture_plan", None, "getElementText"): [6, 0.1]})
+        with mock.patch.object(CommandProfiler, "LOGGER"):
+            rows = CommandProfiler.report(top=5)
+        self.assertEqual(len(rows), 1)
+        self.assertEqual((rows[0]["count"], rows[0]["total_s"]), (10, 0.3))
+        self.assertEqual(list(rows[0]["commands"]), ["getElementText", "findElements"])
+
+if __name__ == "__main__":
+    unittest.main()
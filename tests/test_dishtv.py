@@ -0,0 +1,30 @@
+import threading
+import time
+import unittest
+from unittest import mock
+import src.DishTV as DishTV
+
+class TestDishPlanPages(unittest.TestCase):
+    def test_capture_dish_pages(self):
+        """Plan pages load concurrently, within the worker limit, and merge in plan order."""
+        plans = {f"Plan {i}": f"https://www.dish.com/plan-{i}/" for i in range(5)}
+        running, peak, lock = [0], [0], threading.Lock()
+
+        def capture_page(mode, plan_name, plan_url, zipcode):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.05 if plan_name == "Plan 0" else 0.01)  # First plan finishes last
+            with lock:
+                running[0] -= 1
+            return f"<div>{plan_name} {zipcode}</div>"
+
+        with mock.patch.object(DishTV, "capture_dish_plan_page", side_effect=capture_page):
+            pages = DishTV.capture_dish_pages("headless", plans, "10001", max_workers=2)
+
+        self.assertEqual(list(pages), list(plans))
+        self.assertEqual(pages["Plan 3"], "<div>Plan 3 10001</div>")
+        self.assertEqual(peak[0], 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import src.WebDriverUtils as WebDriverUtils
+from TV_Webscraping import reparse_snapshots
+from src.HtmlSnapshot import parse_html, parse_table_html
+from src.DirecTV import parse_directv
+from src.DirecTV_Stream import parse_directv_stream
+from src.DishTV import parse_dish_plans, parse_dishtv
+
+DIRECTV_HEADER = """
+<div id="ChannelLineup-PackagesHeader"><table><tr>
+  <td><p class="MuiTypography-root">CHANNELS</p></td>
+  <td><p class="MuiTypography-root">ENTERTAINMENT</p></td>
+  <td><p class="MuiTypography-root">CHOICE</p></td>
+</tr></table></div>
+"""
+
+DIRECTV_BODY = """
+<div id="tableBody">
+  <div class="mui-style-1ybie8h">
+    <div><p>ESPN</p><p>206</p></div>
+    <div><span><img src="check.svg"></span></div>
+    <div><span></span></div>
+  </div>
+  <div class="mui-style-1ybie8h">
+    <div><p>A&amp;E</p><p>265</p></div>
+    <div><span><img src="check.svg"></span></div>
+    <div><span><img src="check.svg"></span></div>
+  </div>
+  <div class="mui-style-1ybie8h"><div><p>Missing number</p></div></div>
+</div>
+"""
+
+DIRECTV_STREAM_HEADER = """
+<thead id="channels-table-head"><tr>
+  <th>Channel</th>
+  <th><span class="package-name">Entertainment</span></th>
+  <th><span class="package-name">Choice</span></th>
+</tr></thead>
+"""
+
+DIRECTV_STREAM_BODY = """
+<tbody id="nestedTableBody">
+  <tr class="MuiTableRow-root">
+    <td>
+      <img alt="logo"><span class="MuiTypography-root">  CNN </span>
+      <span class="MuiTypography-root">202</span>
+    </td>
+    <td></td>
+    <td><span>included</span></td>
+  </tr>
+</tbody>
+"""
+
+class TestHtmlSnapshot(unittest.TestCase):
+    def test_select(self):
+        """Selectors cover classes, attributes, descendant and child combinators."""
+        root = parse_html('<ul id="navList_TV Packages"><li><a href="/a" class="x y">A</a></li>'
+                          '</ul><a href="/b">B</a>')
+        self.assertEqual([a.get("href") for a in root.select("ul[id*='TV Packages'] a")], ["/a"])
+        self.assertEqual([a.text() for a in root.select("a.x.y, li > a")], ["A"])
+        self.assertEqual(len(root.select("a[href^='/']")), 2)
+
+    def test_text_matches_inner_text(self):
+        """Inline markup doesn't split a name; blocks and <br> do, as in WebElement.text."""
+        # Expected values are what Selenium's .text (innerText) returned for the same markup
+        cases = {
+            "<p>ESPN<sup>2</sup></p>": "ESPN2",
+            "<p><b>HBO</b>Max</p>": "HBOMax",
+            "<p>A&amp;E <span>HD</span></p>": "A&E HD",
+            "<div><p>ESPN</p><p>206</p></div>": "ESPN 206",
+            "<span>NBC<br>Sports</span>": "NBC Sports",
+            "<td>\n  <span> CNN </span><script>x()</script>\n</td>": "CNN",
+        }
+        for html, expected in cases.items():
+            self.assertEqual(parse_html(html).element_children()[0].text(), expected, html)
+
+    def test_parse_table_html(self):
+        """Rows come back in the same shape as the in-browser extraction."""
+        rows = parse_table_html(DIRECTV_BODY, ".mui-style-1ybie8h", cell_selector=":scope > div",
+                                info_selector="p", flag_selectors=("span", "img"))
+        self.assertEqual(rows[0]["info"], ["ESPN", "206"])
+        self.assertEqual(rows[0]["flags"], [True, False])
+        self.assertEqual(rows[1]["info"], ["A&E", "265"])
+
+    def test_parse_directv(self):
+        lineup = parse_directv({"header": DIRECTV_HEADER, "body": DIRECTV_BODY})
+        self.assertEqual(lineup.plans, ["ENTERTAINMENT", "CHOICE"])
+        self.assertEqual(lineup.to_dataframe().values.tolist(),
+                         [["ESPN", "206", "✔️", ""], ["A&E", "265", "✔️", "✔️"]])
+
+    def test_parse_directv_stream(self):
+        lineup = parse_directv_stream({"header": DIRECTV_STREAM_HEADER,
+                                       "body": DIRECTV_STREAM_BODY})
+        self.assertEqual(lineup.plans, ["Entertainment", "Choice"])
+        self.assertEqual(lineup.to_dataframe().values.tolist(), [["CNN", "202", "", "✔️"]])
+
+    def test_parse_dishtv(self):
+        plans = parse_dish_plans(
+            '<ul id="navList_TV Packages">'
+            '<li><a aria-label="America\'s Top 120" href="/top-120/">x</a></li>'
+            '<li><a href="https://www.dish.com/top-200/"> America\'s Top 200 </a></li></ul>',
+            "https://www.dish.com/",
+        )
+        self.assertEqual(plans, {
+            "America's Top 120": "https://www.dish.com/top-120/",
+            "America's Top 200": "https://www.dish.com/top-200/",
+        })
+        page = '<div class="cmp-singlepackageclu__channellist">{}</div>'
+        channel = '<div class="cmp-singlepackageclu__channel"><p>{}</p></div>'
+        snapshot = {"plans": plans, "pages": {
+            "America's Top 120": page.format(channel.format("140 - ESPN")),
+            "America's Top 200": page.format(channel.format("140 - ESPN")
+                                             + channel.format("ESPNews")),
+        }}
+        lineup = parse_dishtv(snapshot)
+        self.assertEqual(lineup.plans, list(plans))
+        self.assertEqual(lineup.channels, ["ESPN", "ESPNews"])
+        self.assertEqual(lineup.masks, [0b11, 0b10])
+
+class TestReparseSnapshots(unittest.TestCase):
+    def test_saved_snapshot_parses_offline(self):
+        """A snapshot written by a scraper gives the same lineup when parsed again from disk."""
+        snapshot = {"header": DIRECTV_HEADER, "body": DIRECTV_BODY}
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.object(WebDriverUtils, "SNAPSHOT_DIR", tmp):
+            path = WebDriverUtils.save_snapshot("directv_10001", snapshot)
+            results = reparse_snapshots([path])
+            with self.assertRaises(ValueError):
+                reparse_snapshots([os.path.join(tmp, "netflix_10001.json")])
+        lineup = results["10001"]["directv"]
+        self.assertEqual(lineup.to_dataframe().values.tolist(),
+                         parse_directv(snapshot).to_dataframe().values.tolist())
+
+if __name__ == "__main__":
+    unittest.main()
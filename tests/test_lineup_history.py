@@ -0,0 +1,52 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from src.LineupHistory import LineupHistory, main
+from src.LineupResult import LineupResult
+
+def lineup(provider, plans, rows):
+    result = LineupResult(provider, plans)
+    for channel, flags in rows:
+        result.add(channel, flags)
+    return result
+
+class TestLineupHistory(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "history.sqlite")
+        with LineupHistory(self.path) as history:
+            self.first = history.record_run({"10001": {
+                "sling": lineup("sling", ["Orange", "Blue"],
+                                [("ESPN", [True, False]), ("CNN", [False, True])]),
+                "hulu": lineup("hulu", [], [("ESPN", [])]),
+            }}, started_at="2026-10-01T00:00:00+00:00")
+            self.second = history.record_run({"10001": {
+                "sling": lineup("sling", ["Orange", "Blue"], [("ESPN", [True, True])]),
+                "hulu": LineupResult("hulu"),  # Failed scrape
+            }}, started_at="2026-10-08T00:00:00+00:00")
+
+    def test_changes(self):
+        """Plan changes show up; a provider that failed in one run isn't reported as dropping
+        everything."""
+        with LineupHistory(self.path) as history:
+            changes = list(history.changes(self.first, self.second))
+            self.assertEqual(changes, [
+                ("added", "10001", "sling", "Blue", "ESPN"),
+                ("removed", "10001", "sling", "Blue", "CNN"),
+            ])
+            self.assertEqual(list(history.changes(self.first, self.second, provider="hulu")), [])
+            self.assertEqual([listed for _, _, listed in history.timeline("sling", "CNN")],
+                             [True, False])
+
+    def test_cli_diff(self):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main(["--db", self.path, "diff"])
+        self.assertIn("- sling          10001  Blue", output.getvalue())
+        self.assertIn("2 changes between run 1 and run 2", output.getvalue())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import pickle
+import unittest
+from unittest import mock
+import TV_Webscraping
+from src.AliasIndex import AliasIndex
+from src.LineupResult import LineupResult
+
+class TestLineupResult(unittest.TestCase):
+    def test_bitmask_rows(self):
+        lineup = LineupResult("sling", ["Orange", "Blue"])
+        lineup.mark("ESPN", "Orange")
+        lineup.mark("CNN", "Blue")
+        lineup.mark("ESPN", "Blue")
+        self.assertEqual(lineup.channels, ["ESPN", "CNN"])
+        self.assertEqual(lineup.masks, [0b11, 0b10])
+        self.assertTrue(lineup.in_plan(lineup.row("CNN"), 1))
+        self.assertFalse(LineupResult("sling", ["Orange"]))
+
+    def test_pickle_round_trip(self):
+        lineup = LineupResult("directv", ["Choice"])
+        lineup.add("ESPN", [True], "206")
+        copy = pickle.loads(pickle.dumps(lineup))
+        self.assertEqual(copy, lineup)
+        self.assertIn("ESPN", copy)
+
+    def test_summary_matches_aliases(self):
+        """Channels are matched by canonical name, whatever spelling each provider uses."""
+        directv = LineupResult("directv", ["Choice"])
+        directv.add("ESPN", [True], "206")
+        sling = LineupResult("sling", ["Orange", "Blue"])
+        sling.add("espn", [True, False])
+        hulu = LineupResult("hulu")
+        hulu.add("ESPN ")
+        aliases = AliasIndex({"espn": "espn"}, {"espn": ["espn"]})
+
+        with mock.patch.object(TV_Webscraping, "get_channel_alias", return_value=aliases), \
+             mock.patch.object(TV_Webscraping, "report_unmatched_channels"), \
+             mock.patch.object(TV_Webscraping, "OutputWriter") as writer_class:
+            TV_Webscraping.generate_summary_excel({"directv": directv, "sling": sling, "hulu": hulu,
+                                                   "youtube": None})
+        summary = writer_class.return_value.write_sheet.call_args[0][1]
+
+        self.assertEqual(list(summary.columns),
+                         ["Channel", "DirecTV Channel Number", "DirecTV - Choice",
+                          "Sling - Orange", "Sling - Blue", "Hulu"])
+        self.assertEqual(summary.values.tolist(), [["espn", "206", "✔️", "✔️", "", "✔️"]])
+
+    def test_typed_summary(self):
+        """Without a mark, plan columns are booleans and channel numbers integers."""
+        directv = LineupResult("directv", ["Choice"])
+        directv.add("ESPN", [True], "206")
+        hulu = LineupResult("hulu")
+        hulu.add("CNN")
+        aliases = AliasIndex({}, {})
+        summary = TV_Webscraping.build_summary_frame({"directv": directv, "hulu": hulu}, aliases,
+                                                     mark=None)
+        self.assertEqual(str(summary["DirecTV Channel Number"].dtype), "Int64")
+        self.assertEqual(summary["DirecTV - Choice"].tolist(), [False, True])
+        self.assertEqual(summary["Hulu"].tolist(), [True, False])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import functools
+import json
+import os
+import threading
+import unittest
+import urllib.request
+from unittest import mock
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from src import DirecTV
+from src.DirecTV import capture_directv, parse_directv
+from src.WebDriverUtils import capture_json_responses, match_network_responses
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+class RecordingDriver:
+    """Stand-in for a driver with DevTools network logging.
+
+    Page loads are fetched from the local server and recorded as the performance
+    log entries Chrome would produce, so response bodies come from real HTTP responses.
+    """
+    def __init__(self):
+        self.session_id = f"session-{id(self)}"
+        self.log = []
+        self.bodies = {}
+
+    def get(self, url):
+        request_id = str(len(self.bodies) + 1)
+        with urllib.request.urlopen(url) as response:
+            self.bodies[request_id] = response.read().decode("utf-8")
+            mime_type = response.headers.get_content_type()
+            status = response.status
+        for method, params in (
+            ("Network.responseReceived", {"requestId": request_id, "type": "XHR",
+                                          "response": {"url": url, "status": status,
+                                                       "mimeType": mime_type}}),
+            ("Network.loadingFinished", {"requestId": request_id,
+                                         "encodedDataLength": len(self.bodies[request_id])}),
+        ):
+            message = json.dumps({"message": {"method": method, "params": params}})
+            self.log.append({"level": "INFO", "message": message})
+
+    def get_log(self, log_type):
+        entries, self.log = self.log, []
+        return entries
+
+    def execute_cdp_cmd(self, cmd, params):
+        assert cmd == "Network.getResponseBody"
+        return {"body": self.bodies[params["requestId"]], "base64Encoded": False}
+
+class TestNetworkCapture(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        handler = functools.partial(QuietHandler, directory=FIXTURES_DIR)
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_capture_json_responses(self):
+        """Only responses matching the provider pattern are decoded, across several reads."""
+        driver = RecordingDriver()
+        driver.get(f"{self.base_url}/lineup_api.json")
+        self.assertEqual(capture_json_responses(driver, r"/nothing\.json$"), [])
+
+        driver.get(f"{self.base_url}/lineup_api.json?page=2")
+        payloads = capture_json_responses(driver, r"/lineup_api\.json")
+        self.assertEqual(len(payloads), 2)
+        self.assertEqual(payloads[0]["status"], 200)
+        self.assertEqual([channel["name"] for channel in payloads[1]["body"]["channels"]],
+                         ["ESPN", "CNN"])
+
+    def test_directv_lineup_from_json(self):
+        """DirecTV builds its lineup from the recorded JSON without scrolling the table."""
+        driver = RecordingDriver()
+        driver.get(f"{self.base_url}/lineup_api.json")
+        driver.get(f"{self.base_url}/lineup_api.json?page=2")
+        with mock.patch.object(DirecTV, "click_element"), \
+                mock.patch.object(DirecTV, "set_zipcode"), \
+                mock.patch.object(DirecTV, "smooth_scroll_to_bottom") as scroll:
+            snapshot = capture_directv(driver, "79423", r"/lineup_api\.json")
+        scroll.assert_not_called()
+        self.assertNotIn("body", snapshot)
+
+        lineup = parse_directv(snapshot)
+        self.assertEqual(lineup.plans, ["Entertainment", "Choice"])
+        self.assertEqual(lineup.channels, ["ESPN", "CNN"])
+        self.assertEqual(lineup.numbers, ["206", "202"])
+        self.assertEqual([lineup.in_plan(0, 0), lineup.in_plan(0, 1)], [False, True])
+        self.assertEqual([lineup.in_plan(1, 0), lineup.in_plan(1, 1)], [True, True])
+
+    def test_match_network_responses(self):
+        events = [
+            {"method": "Network.responseReceived",
+             "params": {"requestId": "1", "response": {"url": "https://x/api/lineup"}}},
+            {"method": "Network.responseReceived",
+             "params": {"requestId": "2", "response": {"url": "https://x/logo.png"}}},
+        ]
+        responses = match_network_responses(events, r"/api/")
+        self.assertEqual([response["request_id"] for response in responses], ["1"])
+        self.assertFalse(responses[0]["finished"])
+
+if __name__ == "__main__":
+    unittest.main()
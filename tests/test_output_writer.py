@@ -0,0 +1,65 @@
+import json
+import os
+import tempfile
+import unittest
+import openpyxl
+import pandas as pd
+from src.LineupResult import LineupResult
+from src.OutputWriter import OutputWriter
+
+def lineup(provider, *channels):
+    result = LineupResult(provider)
+    for channel in channels:
+        result.add(channel)
+    return result
+
+class TestOutputWriter(unittest.TestCase):
+    def test_lineups_written_before_summary(self):
+        """Lineups handed over during the run land in the workbook ahead of the summary."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "Summary_TV_Channels")
+            writer = OutputWriter(path)
+            writer.write_lineup("Hulu Channels", lineup("hulu", "ESPN", "CNN"))
+            writer.write_lineup("Youtube Channels", LineupResult("youtube"))  # Failed scrape
+            self.assertTrue(writer.flush())
+            writer.write_sheet("TV Channels Summary", pd.DataFrame({"Channel": ["cnn", "espn"]}),
+                               active=True)
+            self.assertTrue(writer.close())
+
+            workbook = openpyxl.load_workbook(path + ".xlsx")
+            self.assertEqual(workbook.sheetnames, ["Hulu Channels", "TV Channels Summary"])
+            self.assertEqual(workbook.active.title, "TV Channels Summary")
+
+    def test_csv_files_and_failures(self):
+        """CSV output is one file per sheet, and a failed write is reported by flush()."""
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = OutputWriter(os.path.join(tmp, "Summary_TV_Channels"), "csv")
+            writer.write_lineup("Hulu Channels", lineup("hulu", "ESPN"))
+            writer.write_sheet("TV Channels Summary", pd.DataFrame({"Channel": ["espn"]}),
+                               file_name="Summary_TV_Channels")
+            self.assertTrue(writer.flush())
+            self.assertEqual(sorted(os.listdir(tmp)),
+                             ["Hulu_Channels.csv", "Summary_TV_Channels.csv"])
+
+            writer.write_sheet("Broken", pd.DataFrame({"Channel": ["espn"]}),
+                               file_name="missing/dir")
+            self.assertFalse(writer.flush())
+            self.assertFalse(writer.close())
+
+    def test_jsonl_is_typed(self):
+        """JSON Lines lineups have boolean plans and integer channel numbers, not check marks."""
+        directv = LineupResult("directv", ["Choice"])
+        directv.add("ESPN", [True], "206")
+        directv.add("Local", [False])
+        with tempfile.TemporaryDirectory() as tmp:
+            with OutputWriter(os.path.join(tmp, "Summary_TV_Channels"), "jsonl") as writer:
+                writer.write_lineup("DirecTV Channels", directv)
+            with open(os.path.join(tmp, "DirecTV_Channels.jsonl"), encoding="utf-8") as f:
+                rows = [json.loads(line) for line in f]
+        self.assertEqual(rows, [
+            {"Channel Name": "ESPN", "Channel Number": 206, "Choice": True},
+            {"Channel Name": "Local", "Channel Number": None, "Choice": False},
+        ])
+
+if __name__ == "__main__":
+    unittest.main()
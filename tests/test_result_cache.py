@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import TV_Webscraping
+from src.LineupResult import LineupResult
+from src.ResultCache import ResultCache
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "cache.sqlite")
+
+    def test_get_respects_age_and_version(self):
+        with ResultCache(self.path) as cache:
+            cache.put("hulu", "10001", 1, ["ESPN", "CNN"])
+            self.assertEqual(cache.get("hulu", "10001", 1, max_age=60), ["ESPN", "CNN"])
+            self.assertIsNone(cache.get("hulu", "10001", 2))
+            self.assertIsNone(cache.get("hulu", "90001", 1))
+            with mock.patch("src.ResultCache.time.time", return_value=cache.conn.execute(
+                    "SELECT scraped_at FROM results").fetchone()[0] + 120):
+                self.assertIsNone(cache.get("hulu", "10001", 1, max_age=60))
+                self.assertEqual(cache.get("hulu", "10001", 1), ["ESPN", "CNN"])
+
+    def test_scrape_or_load_only_scrapes_missing(self):
+        """Fresh providers come from the cache; only the rest reach the browsers, and good
+        results are stored."""
+        with ResultCache(self.path) as cache:
+            cache.put("hulu", "10001", TV_Webscraping.scraper_version("hulu"), ["ESPN"])
+
+        youtube = LineupResult("youtube")
+        youtube.add("CNN")
+        dish = LineupResult("dish", ["America's Top 120"])
+        dish.add("ESPN", [True])
+        dish.provenance = {"America's Top 120": {"source": "scraped"},
+                           "America's Top 200": {"source": "failed"}}
+        scraped = {("youtube", "10001"): youtube,
+                   ("sling", "10001"): LineupResult("sling", ["Orange"]),
+                   ("dish", "10001"): dish}
+
+        def parallel_scrape(jobs, on_result=None, **options):
+            for key in jobs:
+                on_result(key, scraped[key])
+            return {key: scraped[key] for key in jobs}
+
+        with mock.patch.object(TV_Webscraping, "ResultCache", lambda: ResultCache(self.path)), \
+             mock.patch.object(TV_Webscraping, "prewarm_drivers"), \
+             mock.patch.object(TV_Webscraping, "parallel_scrape",
+                               side_effect=parallel_scrape) as parallel:
+            results = TV_Webscraping.scrape_or_load("headless", list(scraped) + [("hulu", "10001")])
+
+        self.assertEqual(set(parallel.call_args[0][0]), set(scraped))
+        self.assertEqual(results[("hulu", "10001")], ["ESPN"])
+        with ResultCache(self.path) as cache:
+            version = TV_Webscraping.scraper_version("youtube")
+            self.assertEqual(cache.get("youtube", "10001", version), youtube)
+            # An empty lineup means the scrape failed; it isn't cached
+            self.assertIsNone(cache.get("sling", "10001", TV_Webscraping.scraper_version("sling")))
+            # Neither is a partial one, so the next run retries its failed plan
+            self.assertIsNone(cache.get("dish", "10001", TV_Webscraping.scraper_version("dish")))
+
+if __name__ == "__main__":
+    unittest.main()
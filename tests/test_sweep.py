@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import TV_Webscraping
+from src.LineupResult import LineupResult
+from TV_Webscraping import generate_sweep_summary, load_zipcodes
+
+def lineup(provider, *channels):
+    result = LineupResult(provider)
+    for channel in channels:
+        result.add(channel)
+    return result
+
+class TestSweep(unittest.TestCase):
+    def test_load_zipcodes(self):
+        """ZIP codes from the command line and a file are merged, de-duplicated and validated."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "zips.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("# east coast\n10001, 02108\n90001  # LA\n\n10001\n")
+            self.assertEqual(load_zipcodes(["60601"], path), ["60601", "10001", "02108", "90001"])
+        with self.assertRaises(ValueError):
+            load_zipcodes(["1234"])
+
+    def test_prewarm_follows_provider_settings(self):
+        """The first providers to run get a warm browser in the pool their scraper leases from."""
+        pools = {}
+
+        def provider_pool(mode, provider):
+            lean = provider == "sling"
+            return pools.setdefault(lean, mock.Mock(name=f"lean={lean}"))
+
+        with mock.patch.object(TV_Webscraping, "get_provider_pool", side_effect=provider_pool), \
+             mock.patch.object(TV_Webscraping, "ensure_driver_pool_size") as ensure_size:
+            TV_Webscraping.prewarm_drivers("headless", ["sling", "hulu", "sling", "fubo", "dish"],
+                                           "thread", 3)
+        ensure_size.assert_called_once_with(3)
+        pools[True].prewarm.assert_called_once_with(2)
+        pools[False].prewarm.assert_called_once_with(1)
+
+    def test_generate_sweep_summary(self):
+        """Channels in every ZIP are national, the rest are listed with their ZIP codes."""
+        results_by_zip = {
+            "10001": {"hulu": lineup("hulu", "ESPN", "NY1"), "youtube": lineup("youtube", "ESPN")},
+            "90001": {"hulu": lineup("hulu", "ESPN", "KTLA"), "youtube": LineupResult("youtube")},
+        }
+        with mock.patch.object(TV_Webscraping, "OutputWriter") as writer_class, \
+             mock.patch.object(TV_Webscraping, "report_unmatched_channels"):
+            generate_sweep_summary(results_by_zip)
+        writer = writer_class.return_value
+        self.assertEqual([call.args[0] for call in writer.write_lineup.call_args_list],
+                         ["Hulu 10001", "Youtube 10001", "Hulu 90001", "Youtube 90001"])
+        sheets = {call.args[0]: call.args[1] for call in writer.write_sheet.call_args_list}
+        writer.close.assert_called_once()
+
+        national = sheets["National Channels"]
+        self.assertEqual(list(national.columns), ["Channel", "Hulu", "Youtube"])
+        espn = national[national["Channel"] == "espn"].iloc[0]
+        self.assertEqual((espn["Hulu"], espn["Youtube"]), ("✔️", "✔️"))
+
+        regional = sheets["Regional Channels"]
+        self.assertEqual(sorted(regional["ZIP Codes"]), ["10001", "90001"])
+        self.assertTrue((regional["Provider"] == "Hulu").all())
+
+        coverage = sheets["Coverage"].set_index("Provider")
+        self.assertEqual(coverage.loc["Youtube", "ZIP Codes Scraped"], 1)
+
+if __name__ == "__main__":
+    unittest.main()
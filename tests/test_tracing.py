@@ -0,0 +1,49 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+from src import Tracing
+from src.Tracing import span, traced
+
+@traced("scrape", provider="sling", arg_tags={"zipcode": "zip"})
+def scrape(mode="headless", zipcode="79423"):
+    with span("load_page"):
+        pass
+
+class TestTracing(unittest.TestCase):
+    def setUp(self):
+        Tracing.collect()
+        patcher = mock.patch.object(Tracing, "_enabled", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(Tracing.collect)
+
+    def test_nested_spans_inherit_tags(self):
+        scrape("headless", zipcode="10001")
+        load_page, outer = Tracing.collect()
+        self.assertEqual((outer["name"], outer["args"]),
+                         ("scrape", {"provider": "sling", "zip": "10001"}))
+        self.assertEqual(load_page["args"], {"provider": "sling", "zip": "10001"})
+        self.assertLessEqual(outer["ts"], load_page["ts"])
+
+    def test_disabled_records_nothing(self):
+        with mock.patch.object(Tracing, "_enabled", False):
+            scrape()
+        self.assertEqual(Tracing.collect(), [])
+
+    def test_export_chrome_trace_and_summary(self):
+        scrape()
+        scrape()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Tracing.export(os.path.join(tmp, "trace.json"))
+            with open(path, encoding="utf-8") as f:
+                trace = json.load(f)
+            self.assertTrue(os.path.exists(os.path.join(tmp, "trace_summary.csv")))
+        self.assertEqual(len(trace["traceEvents"]), 4)
+        self.assertTrue(all(event["ph"] == "X" for event in trace["traceEvents"]))
+        rows = {row["span"]: row for row in Tracing.summarize()}
+        self.assertEqual(rows["scrape"]["count"], 2)
+
+if __name__ == "__main__":
+    unittest.main()
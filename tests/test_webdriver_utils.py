@@ -1,5 +1,66 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
 import unittest
-from src.WebDriverUtils import run_webdriver, setup_logger
+from unittest import mock
+import src.WebDriverUtils as WebDriverUtils
+from src.WebDriverUtils import DriverPool, parallel_scrape, run_webdriver, setup_logger
+
+def slow_scraper(mode, name):
+    time.sleep(0.2)
+    return [name]
+
+def fast_scraper(mode, name):
+    return [name]
+
+def failing_scraper(mode, name):
+    raise RuntimeError("layout changed")
+
+def crashing_scraper(mode, name):
+    os._exit(3)
+
+def hanging_scraper(mode, name):
+    time.sleep(60)
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.current_handle = handle
+
+class FakeDriver:
+    """Minimal stand-in for a Chrome WebDriver, used to test pooling without a browser."""
+    def __init__(self, fail_reset=False):
+        self.session_id = f"session-{id(self)}"
+        self.window_handles = ["main"]
+        self.current_handle = "main"
+        self.switch_to = FakeSwitchTo(self)
+        self.cookies_cleared = 0
+        self.url = None
+        self.quit_called = False
+        self.fail_reset = fail_reset
+
+    def close(self):
+        self.window_handles.remove(self.current_handle)
+
+    def execute_script(self, script, *args):
+        return None
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cookies_cleared += 1
+
+    def get(self, url):
+        if self.fail_reset and url == "about:blank":
+            raise RuntimeError("browser crashed")
+        self.url = url
+
+    def quit(self):
+        self.quit_called = True
 
 class TestWebDriverUtils(unittest.TestCase):
     def test_run_webdriver_headless(self):
@@ -19,5 +80,264 @@ class TestWebDriverUtils(unittest.TestCase):
         logger = setup_logger()
         self.assertEqual(logger.level, 10)  # DEBUG level
 
+class TestDriverPool(unittest.TestCase):
+    def setUp(self):
+        self.started = []
+
+    def factory(self, mode):
+        driver = FakeDriver()
+        self.started.append(driver)
+        return driver
+
+    def test_release_reuses_driver_and_resets_state(self):
+        """A released driver is reset and handed to the next lease."""
+        pool = DriverPool("headless", size=1, factory=self.factory)
+        driver = pool.lease()
+        driver.window_handles.append("popup")
+        driver.url = "https://example.com"
+        pool.release(driver)
+        self.assertIs(pool.lease(), driver)
+        self.assertEqual(driver.window_handles, ["main"])
+        self.assertEqual(driver.url, "about:blank")
+        self.assertEqual(driver.cookies_cleared, 1)
+        self.assertEqual(len(self.started), 1)
+
+    def test_prewarm_and_size_limit(self):
+        """Pre-warming starts drivers up to the pool size and leases block when exhausted."""
+        pool = DriverPool("headless", size=2, factory=self.factory)
+        self.assertEqual(pool.prewarm(5), 2)
+        pool.lease()
+        pool.lease()
+        self.assertEqual(len(self.started), 2)
+        with self.assertRaises(TimeoutError):
+            pool.lease(timeout=0.05)
+
+    def test_limit_shared_across_pools(self):
+        """Pools under one BrowserLimit never run more browsers than it allows together; an
+        idle browser of another pool is quit to make room."""
+        limit = WebDriverUtils.BrowserLimit(2)
+        plain = DriverPool("headless", size=2, factory=self.factory, limit=limit)
+        lean = DriverPool("headless", size=2, factory=self.factory, limit=limit)
+        self.assertEqual(plain.prewarm(2), 2)
+        self.assertEqual(lean.prewarm(1), 0)
+
+        first = plain.lease()
+        lean_driver = lean.lease()
+        self.assertEqual(len(self.started), 3)
+        self.assertEqual(sum(driver.quit_called for driver in self.started), 1)
+        self.assertFalse(first.quit_called)
+        with self.assertRaises(TimeoutError):
+            lean.lease(timeout=0.05)
+        plain.release(first)
+        lean.release(lean_driver)
+        with limit.condition:
+            self.assertEqual(limit.alive(), 2)
+
+    def test_failed_reset_discards_driver(self):
+        """Drivers that can't be reset are quit and replaced."""
+        pool = DriverPool("headless", size=1, factory=self.factory)
+        driver = pool.lease()
+        driver.fail_reset = True
+        pool.release(driver)
+        self.assertTrue(driver.quit_called)
+        self.assertIsNot(pool.lease(), driver)
+
+class TestParallelScrape(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(WebDriverUtils, "cleanup_chrome_drivers")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_results_keyed_by_job(self):
+        """A scraper finishing first can't take another provider's slot."""
+        finished = []
+        results = parallel_scrape({
+            "directv": (slow_scraper, "headless", "directv"),
+            "sling": (fast_scraper, "headless", "sling"),
+            "hulu": (failing_scraper, "headless", "hulu"),
+        }, max_workers=3, on_result=lambda key, result: finished.append(key))
+        self.assertEqual(results, {"directv": ["directv"], "sling": ["sling"], "hulu": None})
+        self.assertEqual(finished[-1], "directv")  # Handed over as each one finishes
+
+    def test_deadline_kills_only_the_overrunning_jobs_browser(self):
+        """A hung scraper's own chromedriver tree is killed and the run goes on without it."""
+        def factory(mode):
+            driver = FakeDriver()
+            # Stands in for chromedriver; the grandchild stands in for its Chrome
+            grandchild = ("import subprocess, sys; "
+                          "subprocess.run([sys.executable, '-c', 'import time; time.sleep(60)'])")
+            driver.service = mock.Mock(process=subprocess.Popen([sys.executable, "-c", grandchild]))
+            WebDriverUtils._active_drivers.add(driver)
+            return driver
+
+        pool = DriverPool("headless", size=2, factory=factory)
+        leased = {}
+
+        def scraper(mode, name):
+            driver = leased[name] = pool.lease()
+            try:
+                if name == "hung":
+                    # Every WebDriver call fails once the browser is gone
+                    while driver.service.process.poll() is None:
+                        time.sleep(0.05)
+                    raise ConnectionError("chromedriver went away")
+                return [name]
+            finally:
+                pool.release(driver)
+
+        with mock.patch.dict(WebDriverUtils._driver_pools, {"test": pool}, clear=True), \
+                mock.patch.object(WebDriverUtils, "DEADLINE_POLL", 0.05):
+            started = time.monotonic()
+            results = parallel_scrape({"hung": (scraper, "headless", "hung"),
+                                       "ok": (scraper, "headless", "ok")},
+                                      max_workers=2, timeout=0.3)
+            self.assertLess(time.monotonic() - started, 10)
+            self.assertEqual(results, {"hung": None, "ok": ["ok"]})
+            hung = leased["hung"].service.process
+            self.assertIsNotNone(hung.wait(timeout=5))
+            self.assertNotIn(leased["hung"], WebDriverUtils._active_drivers)
+            # The other job's driver went back to the pool, its browser untouched
+            self.assertIsNone(leased["ok"].service.process.poll())
+        WebDriverUtils.kill_process_tree(leased["ok"].service.process.pid)
+
+    def test_thread_workers_not_capped_by_pool_size(self):
+        """With more workers than DRIVER_POOL_SIZE, that many scrapers hold a browser at once."""
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def scraper(mode, name):
+            driver = WebDriverUtils.get_driver_pool(mode).lease()
+            try:
+                with lock:
+                    running.append(name)
+                    peak.append(len(running))
+                time.sleep(0.2)
+                with lock:
+                    running.remove(name)
+                return [name]
+            finally:
+                WebDriverUtils.release_driver(driver)
+
+        jobs = {f"job{i}": (scraper, "headless", f"job{i}") for i in range(6)}
+        with mock.patch.dict(WebDriverUtils._driver_pools, clear=True), \
+                mock.patch.object(WebDriverUtils, "_browser_limit",
+                                  WebDriverUtils.BrowserLimit(2)), \
+                mock.patch.object(WebDriverUtils, "run_webdriver",
+                                  lambda mode, **options: FakeDriver()):
+            results = parallel_scrape(jobs, max_workers=4, timeout=None)
+            self.assertEqual(WebDriverUtils.get_driver_pool("headless").size, 4)
+        self.assertEqual(results, {key: [key] for key in jobs})
+        self.assertEqual(max(peak), 4)
+
+    def test_process_executor_isolates_crashes(self):
+        """A scraper that kills its interpreter only loses its own result."""
+        results = parallel_scrape({
+            "fubo": (fast_scraper, "headless", "fubo"),
+            "dish": (crashing_scraper, "headless", "dish"),
+            "hulu": (failing_scraper, "headless", "hulu"),
+        }, max_workers=2, executor="process")
+        self.assertEqual(results, {"fubo": ["fubo"], "dish": None, "hulu": None})
+
+    def test_deadline_starts_once_the_job_has_a_browser(self):
+        """Jobs queued for a driver from a full pool don't use up their deadline waiting."""
+        pool = DriverPool("headless", size=1, factory=lambda mode: FakeDriver())
+
+        def scraper(mode, name):
+            driver = pool.lease()
+            try:
+                time.sleep(0.6)
+                return [name]
+            finally:
+                pool.release(driver)
+
+        with mock.patch.dict(WebDriverUtils._driver_pools, {"test": pool}, clear=True), \
+                mock.patch.object(WebDriverUtils, "DEADLINE_POLL", 0.05):
+            results = parallel_scrape({"first": (scraper, "headless", "first"),
+                                       "second": (scraper, "headless", "second")},
+                                      max_workers=2, timeout=1.0)
+        self.assertEqual(results, {"first": ["first"], "second": ["second"]})
+
+    def test_process_executor_deadline(self):
+        """A process job past its deadline is killed and the other jobs' results are kept."""
+        started = time.monotonic()
+        results = parallel_scrape({
+            "fubo": (fast_scraper, "headless", "fubo"),
+            "sling": (hanging_scraper, "headless", "sling"),
+        }, max_workers=2, executor="process", timeout=5)
+        self.assertEqual(results, {"fubo": ["fubo"], "sling": None})
+        self.assertLess(time.monotonic() - started, 30)
+
+class TestRelocateOnStale(unittest.TestCase):
+    def test_retries_only_the_stale_operation(self):
+        calls = []
+
+        def operation():
+            calls.append(len(calls))
+            if len(calls) < 2:
+                raise WebDriverUtils.StaleElementReferenceException("detached")
+            return "clicked"
+
+        self.assertEqual(WebDriverUtils.relocate_on_stale(operation), "clicked")
+        self.assertEqual(len(calls), 2)
+
+    def test_gives_up_after_attempts(self):
+        def operation():
+            raise WebDriverUtils.StaleElementReferenceException("detached")
+
+        with self.assertRaises(WebDriverUtils.StaleElementReferenceException):
+            WebDriverUtils.relocate_on_stale(operation, attempts=2)
+
+class TestLeanMode(unittest.TestCase):
+    def test_blocklist_per_provider(self):
+        """Lean mode follows the global switch unless a provider overrides it."""
+        providers = {"sling": {"allow": ["*.svg"]}, "hulu": {"enabled": False},
+                     "dish": {"enabled": True}}
+        with mock.patch.object(WebDriverUtils, "LEAN_BLOCKED_URLS", ["*.png", "*.svg"]), \
+                mock.patch.object(WebDriverUtils, "LEAN_PROVIDERS", providers), \
+                mock.patch.object(WebDriverUtils, "LEAN_MODE", True):
+            self.assertEqual(WebDriverUtils.get_lean_blocklist("directv"), ["*.png", "*.svg"])
+            self.assertEqual(WebDriverUtils.get_lean_blocklist("sling"), ["*.png"])
+            self.assertIsNone(WebDriverUtils.get_lean_blocklist("hulu"))
+        with mock.patch.object(WebDriverUtils, "LEAN_PROVIDERS", providers), \
+                mock.patch.object(WebDriverUtils, "LEAN_MODE", False):
+            self.assertIsNone(WebDriverUtils.get_lean_blocklist("directv"))
+            self.assertIsNotNone(WebDriverUtils.get_lean_blocklist("dish"))
+
+class TestResolveChromedriver(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.driver_path = os.path.join(self.tmpdir.name, "chromedriver")
+        open(self.driver_path, "w").close()
+        self.manifest = os.path.join(self.tmpdir.name, "manifest.json")
+        patches = [
+            mock.patch.object(WebDriverUtils, "DRIVER_MANIFEST", self.manifest),
+            mock.patch.object(WebDriverUtils, "CHROMEDRIVER_PATH", None),
+            mock.patch.object(WebDriverUtils, "_chromedriver_path", None),
+            mock.patch.object(WebDriverUtils, "get_chrome_version", return_value="120.0.1"),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def test_install_runs_once_and_writes_manifest(self):
+        """The driver is installed once per process and recorded in the manifest."""
+        with mock.patch.object(WebDriverUtils, "ChromeDriverManager") as manager:
+            manager.return_value.install.return_value = self.driver_path
+            self.assertEqual(WebDriverUtils.resolve_chromedriver(), self.driver_path)
+            self.assertEqual(WebDriverUtils.resolve_chromedriver(), self.driver_path)
+            self.assertEqual(manager.return_value.install.call_count, 1)
+        with open(self.manifest) as f:
+            self.assertEqual(json.load(f)["chrome_version"], "120.0.1")
+
+    def test_manifest_hit_skips_install(self):
+        """A manifest for the installed Chrome version is reused without webdriver-manager."""
+        with open(self.manifest, "w") as f:
+            json.dump({"driver_path": self.driver_path, "chrome_version": "120.0.1"}, f)
+        with mock.patch.object(WebDriverUtils, "ChromeDriverManager") as manager:
+            self.assertEqual(WebDriverUtils.resolve_chromedriver(), self.driver_path)
+            manager.assert_not_called()
+
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,38 @@
+import os
+import tempfile
+import unittest
+import openpyxl
+import pandas as pd
+from src.LineupResult import LineupResult
+from src.WorkbookWriter import WorkbookWriter
+
+class TestWorkbookWriter(unittest.TestCase):
+    def test_lineups_and_summary_in_one_workbook(self):
+        """Lineup sheets are rendered from the bitmasks, sorted, and sized to their longest
+        value."""
+        lineup = LineupResult("directv", ["Choice", "Ultimate"])
+        lineup.add("FOX Sports 1", [False, True], "219")
+        lineup.add("ESPN", [True, True], "206")
+        summary = pd.DataFrame({"Channel": ["espn", "fox sports 1"],
+                                "DirecTV - Choice": ["✔️", ""]})
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "Summary")
+            with WorkbookWriter(path) as writer:
+                self.assertEqual(writer.add_lineup("DirecTV Channels", lineup), 2)
+                writer.add_dataframe("TV Channels Summary", summary, active=True)
+            workbook = openpyxl.load_workbook(path + ".xlsx")
+            self.assertEqual(workbook.sheetnames, ["DirecTV Channels", "TV Channels Summary"])
+            self.assertEqual(workbook.active.title, "TV Channels Summary")
+
+            sheet = workbook["DirecTV Channels"]
+            self.assertEqual([list(row) for row in sheet.iter_rows(values_only=True)], [
+                ["Channel Name", "Channel Number", "Choice", "Ultimate"],
+                ["ESPN", "206", "✔️", "✔️"],
+                ["FOX Sports 1", "219", None, "✔️"],
+            ])
+            self.assertEqual(int(sheet.column_dimensions["A"].width), len("FOX Sports 1") + 2)
+            self.assertEqual(workbook["TV Channels Summary"]["B2"].value, "✔️")
+
+if __name__ == "__main__":
+    unittest.main()